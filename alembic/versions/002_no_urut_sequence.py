@@ -0,0 +1,54 @@
+"""Allocate no_urut from a sequence / counter
+
+Revision ID: 002_no_urut_sequence
+Revises: 001_initial
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_no_urut_sequence'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        # Sequence untuk no_urut, dimulai setelah data yang sudah ada
+        op.execute(sa.schema.CreateSequence(sa.Sequence('timbangan_no_urut_seq')))
+        op.execute(
+            "SELECT setval('timbangan_no_urut_seq', "
+            "COALESCE((SELECT MAX(no_urut) FROM timbangan), 0) + 1, false)"
+        )
+        op.execute("ALTER SEQUENCE timbangan_no_urut_seq OWNED BY timbangan.no_urut")
+        # Default untuk INSERT di luar aplikasi (psql, import)
+        op.alter_column(
+            'timbangan', 'no_urut',
+            server_default=sa.text("nextval('timbangan_no_urut_seq')")
+        )
+
+    # Counter satu baris untuk database tanpa SEQUENCE (SQLite)
+    op.create_table(
+        'timbangan_no_urut',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO timbangan_no_urut (id, value) "
+        "SELECT 1, COALESCE(MAX(no_urut), 0) FROM timbangan"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('timbangan_no_urut')
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('timbangan', 'no_urut', server_default=None)
+        op.execute(sa.schema.DropSequence(sa.Sequence('timbangan_no_urut_seq')))
@@ -0,0 +1,44 @@
+"""Create timbangan_harian rollup table
+
+Revision ID: 003_timbangan_harian
+Revises: 002_no_urut_sequence
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_timbangan_harian'
+down_revision = '002_no_urut_sequence'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rollup harian per nopol dan petugas (GET /api/timbangan/summary)
+    op.create_table(
+        'timbangan_harian',
+        sa.Column('tanggal', sa.Date(), nullable=False),
+        sa.Column('nopol', sa.String(20), nullable=False),
+        sa.Column('petugas', sa.String(100), nullable=False),
+        sa.Column('jumlah', sa.Integer(), nullable=False),
+        sa.Column('total_gross', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column('total_nett', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('tanggal', 'nopol', 'petugas')
+    )
+
+    # Isi dari data yang sudah ada
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "CAST(tanggalwaktu AS DATE)"
+    else:
+        day = "date(tanggalwaktu)"
+    op.execute(
+        "INSERT INTO timbangan_harian (tanggal, nopol, petugas, jumlah, total_gross, total_nett) "
+        f"SELECT {day}, nopol, petugas, COUNT(*), SUM(gross), SUM(nett) "
+        f"FROM timbangan GROUP BY {day}, nopol, petugas"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('timbangan_harian')
@@ -0,0 +1,93 @@
+"""
+Benchmark capture/replay dan parse_scale_line dari korpus capture
+
+Tanpa argumen, korpus sintetis dibuat dengan CaptureWriter (frame
+SGW-3015P dan lenient, dipotong acak seperti chunk serial nyata, dengan
+sedikit noise). Dengan argumen, file .scap hasil capture lapangan dipakai
+apa adanya sehingga benchmark sekaligus menjadi korpus regresi parser.
+
+Usage:
+    python benchmarks/bench_capture_replay.py [file.scap ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.capture import CaptureReader, CaptureWriter, replay
+from services.connect import ScaleConnection
+from services.emulator import format_lenient, format_sgw3015p
+from services.rx_buffer import RxBuffer
+
+FRAMES = 200_000
+
+
+def build_corpus(directory):
+    """Tulis korpus sintetis, kembalikan (paths, detik menulis, byte)"""
+    rng = random.Random(5)
+    stream = bytearray()
+    for i in range(FRAMES):
+        fmt = format_sgw3015p if i % 10 else format_lenient
+        stream += fmt(20_000 + rng.gauss(0, 15), rng.random() < 0.8, "GS" if i % 3 else "NT")
+        if rng.random() < 0.01:
+            stream += bytes(rng.randrange(256) for _ in range(rng.randint(1, 8)))
+
+    writer = CaptureWriter(directory, prefix="bench", rotate_s=0, max_bytes=4 * 1024 * 1024, keep=0)
+    ts = time.monotonic_ns()
+    offset = 0
+    start = time.perf_counter()
+    while offset < len(stream):
+        size = rng.randint(1, 64)
+        writer.write(bytes(stream[offset:offset + size]), ts)
+        offset += size
+        ts += 2_000_000
+    writer.close()
+    elapsed = time.perf_counter() - start
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    return paths, elapsed, len(stream)
+
+
+def main():
+    paths = sys.argv[1:]
+    with tempfile.TemporaryDirectory() as directory:
+        if not paths:
+            paths, elapsed, size = build_corpus(directory)
+            print(f"write  : {size / 1e6:.1f} MB in {len(paths)} file(s), {size / elapsed / 1e6:,.1f} MB/s")
+
+        # Raw mmap iteration
+        start = time.perf_counter()
+        chunks = size = 0
+        for path in paths:
+            with CaptureReader(path) as reader:
+                for _, data in reader:
+                    chunks += 1
+                    size += len(data)
+        elapsed = time.perf_counter() - start
+        print(f"read   : {chunks:,} chunks, {size / elapsed / 1e6:,.1f} MB/s (mmap)")
+
+        # Frames from the corpus through parse_scale_line
+        buffer = RxBuffer()
+        lines = []
+        for path in paths:
+            with CaptureReader(path) as reader:
+                for _, data in reader:
+                    lines.extend(buffer.feed(data))
+        start = time.perf_counter()
+        parsed = sum(1 for line in lines if ScaleConnection.parse_scale_line(line))
+        elapsed = time.perf_counter() - start
+        print(f"parse  : {len(lines):,} frames, {parsed:,} parsed, {len(lines) / elapsed:,.0f} frames/s (parse_scale_line)")
+
+        # Full pipeline replay at max speed
+        for filters in ("", "median:5,kalman:0.5:100:500"):
+            connection = ScaleConnection(handle_signals=False, enable_poll=False, filters=filters)
+            stats = replay(paths, connection)
+            print(f"replay : {stats['frames']:,} frames, {stats['readings']:,} readings, "
+                  f"{stats['frames'] / stats['seconds']:,.0f} frames/s (filters: {filters or 'none'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark penggabungan (coalescing) frame identik berturut-turut
+
+Satu jam data 50 Hz diumpankan ke ``ScaleConnection._process_chunk``
+dengan coalescing aktif dan nonaktif, untuk tiga skenario:
+
+    - idle   : timbangan kosong, ``ST,GS,0.00kg`` terus-menerus
+    - weigh  : 12 truk per jam (ramp naik, diam, turun), selebihnya idle
+    - noisy  : berat berubah 1 digit secara acak pada 2% frame saat diam
+
+Dilaporkan jumlah sampel riwayat, pembacaan yang dipublikasikan ke hub
+(= pesan stream/WebSocket dan kandidat penulisan DB), byte JSON stream
+dan waktu proses per frame.
+
+Usage:
+    python benchmarks/bench_coalesce.py [detik]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.connect import ScaleConnection
+from services.emulator import format_sgw3015p
+
+RATE_HZ = 50
+DIVISION = 5.0
+TRUCK = 24_000.0
+
+
+def trace_idle(rng, seconds):
+    return [0.0] * (seconds * RATE_HZ)
+
+
+def trace_weigh(rng, seconds):
+    values = []
+    period = 300 * RATE_HZ
+    for i in range(seconds * RATE_HZ):
+        t = (i % period) / RATE_HZ
+        if t < 5:
+            load = TRUCK * t / 5
+        elif t < 60:
+            load = TRUCK
+        elif t < 65:
+            load = TRUCK * (65 - t) / 5
+        else:
+            load = 0.0
+        values.append(round(load / DIVISION) * DIVISION)
+    return values
+
+
+def trace_noisy(rng, seconds):
+    return [DIVISION if rng.random() < 0.02 else 0.0 for _ in range(seconds * RATE_HZ)]
+
+
+TRACES = {"idle": trace_idle, "weigh": trace_weigh, "noisy": trace_noisy}
+
+
+def run(frames, coalesce):
+    connection = ScaleConnection(
+        handle_signals=False,
+        enable_poll=False,
+        history_size=len(frames),
+        coalesce=coalesce,
+    )
+    stream = {"messages": 0, "bytes": 0}
+    publish = connection.hub.publish
+
+    def on_publish(reading):
+        stream["messages"] += 1
+        stream["bytes"] += len(connection.hub.encode_bytes(reading))
+        publish(reading)
+
+    connection.hub.publish = on_publish
+    start = time.perf_counter()
+    for frame in frames:
+        connection._process_chunk(frame)
+    elapsed = time.perf_counter() - start
+    return len(connection.history), stream, elapsed
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    print(f"{seconds} s @ {RATE_HZ} Hz = {seconds * RATE_HZ:,} frames per scenario")
+    print(f"{'':8} {'coalesce':>8} {'history':>10} {'published':>10} {'stream KB':>10} {'us/frame':>9}")
+    for name, build in TRACES.items():
+        values = build(random.Random(1), seconds)
+        frames = [format_sgw3015p(value, True, "GS") for value in values]
+        results = {}
+        for coalesce in (False, True):
+            samples, stream, elapsed = run(frames, coalesce)
+            results[coalesce] = stream["messages"]
+            print(
+                f"{name:8} {'on' if coalesce else 'off':>8} {samples:>10,} {stream['messages']:>10,} "
+                f"{stream['bytes'] / 1024:>10,.0f} {elapsed / len(frames) * 1e6:>9.2f}"
+            )
+        print(f"{'':8} {'':>8} reduction x{results[False] / max(results[True], 1):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark requests/sec /api/scale/reading, /api/scale/status dan /api/scale/health
+
+Membandingkan handler lama (dict/model pydantic dibangun per request) dengan
+handler sekarang (JSON di-cache per packet/snapshot status + ETag/304). Request dikirim
+langsung sebagai panggilan ASGI (tanpa jaringan dan tanpa HTTP client)
+agar yang terukur hanya biaya sisi server.
+
+Usage:
+    python benchmarks/bench_conditional_get.py [jumlah_request]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+
+from typing import Optional
+
+from fastapi import FastAPI, Query
+
+from routes import scale as scale_routes
+from routes.scale import AggregatedStatusResponse, ScaleReadingResponse
+from services.connect import get_scale_connection
+from services.scale_manager import get_scale_manager
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(scale_routes.router)
+
+    # Handler versi sebelumnya sebagai baseline (signature sama, tanpa cache/ETag)
+    @app.get("/legacy/reading", response_model=Optional[ScaleReadingResponse])
+    async def legacy_reading(after: Optional[int] = Query(None, ge=0), timeout: int = Query(30000, ge=0)):
+        return ScaleReadingResponse(**get_scale_connection().get_last_reading().to_dict())
+
+    @app.get("/legacy/status", response_model=AggregatedStatusResponse)
+    async def legacy_status():
+        manager = get_scale_manager()
+        statuses = manager.get_status()
+        return AggregatedStatusResponse(**statuses[manager.default_id], scales=statuses)
+
+    @app.get("/legacy/health")
+    async def legacy_health():
+        status = get_scale_connection().status_snapshot.values.to_dict()
+        return {
+            "healthy": status["connected"],
+            "connected": status["connected"],
+            "port": status["port"],
+            "packet_count": status["packet_count"],
+            "last_reading_available": status["last_reading"] is not None,
+        }
+
+    return app
+
+
+async def call(app, path, headers):
+    """Satu request GET langsung ke aplikasi ASGI, kembalikan (status, headers)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    result = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = dict(message["headers"])
+
+    await app(scope, receive, send)
+    return result
+
+
+async def run(app, label, path, total, etag=None):
+    headers = [(b"if-none-match", etag)] if etag else []
+    start = time.perf_counter()
+    for _ in range(total):
+        result = await call(app, path, headers)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {total / elapsed:>10,.0f} req/s  (HTTP {result['status']})")
+    return result
+
+
+async def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    get_scale_connection()._process_chunk(b"ST,NT,1234.50kg\r\n")
+
+    app = build_app()
+    for name in ("reading", "status", "health"):
+        print(f"[{name}] {total:,} requests")
+        await run(app, "before (pydantic per request)", f"/legacy/{name}", total)
+        result = await run(app, "after (cached JSON)", f"/api/scale/{name}", total)
+        if b"etag" not in result["headers"]:
+            continue
+        await run(
+            app, "after (If-None-Match -> 304)", f"/api/scale/{name}", total,
+            etag=result["headers"][b"etag"],
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,177 @@
+"""
+Benchmark end-to-end: emulator pty -> ScaleConnection -> /api/scale/reading
+
+Emulator (services.emulator) menulis frame ke pty, aplikasi FastAPI
+dengan router scale dijalankan di uvicorn (thread terpisah), dan client
+HTTP melakukan long-poll ``/api/scale/reading?after=<packet>``. Setiap
+frame membawa nomor urut sebagai berat, sehingga latensi byte-ke-API
+dihitung dari waktu frame ditulis ke pty sampai response diterima client.
+Histogram per tahap dari ``scale.latency`` (yang juga dilayani
+/api/scale/latency) dicetak di akhir. Hanya Linux/macOS.
+
+Usage:
+    python benchmarks/bench_end_to_end.py --rate 50 --seconds 10
+    python benchmarks/bench_end_to_end.py --rate 20 --fragment 3 --garbage 0.2
+    python benchmarks/bench_end_to_end.py --rate 20 --disconnect-every 2
+    python benchmarks/bench_end_to_end.py --rate 0 --poll
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+
+from services.emulator import ScaleEmulator
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_app() -> FastAPI:
+    from routes import scale as scale_routes
+    from services.scale_manager import get_scale_manager
+
+    @asynccontextmanager
+    async def lifespan(app):
+        get_scale_manager().start_all()
+        yield
+        get_scale_manager().stop_all()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(scale_routes.router)
+    return app
+
+
+def percentile(values, pct):
+    return values[min(int(len(values) * pct), len(values) - 1)]
+
+
+async def client(base_url, seconds, sent_at, latencies, stats):
+    """Long-poll pembacaan baru dan catat latensi per response"""
+    after = 0
+    deadline = time.perf_counter() + seconds
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as http:
+        while time.perf_counter() < deadline:
+            try:
+                response = await http.get("/api/scale/reading", params={"after": after, "timeout": 2000})
+            except httpx.HTTPError:
+                stats["errors"] += 1
+                continue
+            received = time.perf_counter()
+            if response.status_code == 200:
+                reading = response.json()
+                after = reading["packet"]
+                stats["responses"] += 1
+                sent = sent_at.get(int(round(reading["weight"])))
+                # Garbage bytes can turn into readings of their own; skip those
+                if sent is not None and sent[1] == reading["raw"]:
+                    latencies.append(received - sent[0])
+                else:
+                    stats["corrupt"] += 1
+            elif response.status_code == 204:
+                stats["timeouts"] += 1
+            else:
+                stats["errors"] += 1
+                await asyncio.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rate", type=float, default=50.0, help="Continuous frames/s (0 = poll only)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--poll", action="store_true", help="Indicator answers SI\\r\\n polls")
+    parser.add_argument("--fragment", type=int, default=0)
+    parser.add_argument("--garbage", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0)
+    parser.add_argument("--baudrate", type=int, default=None, help="Pace output at this baud rate")
+    parser.add_argument("--transport", choices=("thread", "asyncio"), default="thread")
+    args = parser.parse_args()
+
+    sent_at = {}
+    link = os.path.join(tempfile.mkdtemp(prefix="vscale-"), "scale0")
+    emulator = ScaleEmulator(
+        rate_hz=args.rate,
+        respond_to=b"SI\r\n" if args.poll else None,
+        fragment=args.fragment,
+        garbage=args.garbage,
+        disconnect_every=args.disconnect_every,
+        baudrate=args.baudrate,
+        link=link,
+        seed=1,
+        weight_fn=float,
+        on_send=lambda seq, frame, t: sent_at.__setitem__(seq, (t, frame.strip().decode("ascii"))),
+    )
+    emulator.start()
+
+    os.environ.update({
+        "SCALE_PORT": link,
+        "SCALE_TRANSPORT": args.transport,
+        "SCALE_ENABLE_POLL": "true" if args.poll else "false",
+        "SCALE_RECONNECT_MS": "200",
+        "SCALE_STATE_FILE": "",
+        "SCALE_FILTERS": "",
+    })
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(build_app(), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    from services.connect import get_scale_connection
+    scale = get_scale_connection()
+    # Wait for probing (and, in poll mode, for the scheduler to learn the command)
+    while not scale.is_connected or (args.poll and scale.poll_scheduler.mode == "unknown"):
+        time.sleep(0.05)
+
+    latencies = []
+    stats = {"responses": 0, "timeouts": 0, "errors": 0, "corrupt": 0}
+    packets_before, frames_before = scale.packet_count, emulator.frames_sent
+    start = time.perf_counter()
+    asyncio.run(client(f"http://127.0.0.1:{port}", args.seconds, sent_at, latencies, stats))
+    elapsed = time.perf_counter() - start
+    packets = scale.packet_count - packets_before
+    frames = emulator.frames_sent - frames_before
+    reconnects, disconnects = scale.reconnect_count, emulator.disconnects
+    stages = scale.latency.snapshot()
+
+    server.should_exit = True
+    emulator.stop()
+    time.sleep(0.3)
+
+    latencies.sort()
+    print(f"scenario       : rate={args.rate:g} Hz poll={args.poll} fragment={args.fragment} "
+          f"garbage={args.garbage:g} disconnect_every={args.disconnect_every:g}s transport={args.transport}")
+    print(f"frames sent    : {frames:,} ({frames / elapsed:,.1f}/s)")
+    print(f"frames parsed  : {packets:,} ({packets / elapsed:,.1f}/s)")
+    print(f"reconnects     : {reconnects} (emulator disconnects {disconnects})")
+    print(f"API responses  : {stats['responses']:,} ({stats['timeouts']} long-poll timeouts, {stats['errors']} errors, "
+          f"{stats['corrupt']} not matching a sent frame)")
+    if latencies:
+        print(f"latency p50    : {percentile(latencies, 0.50) * 1000:.2f} ms")
+        print(f"latency p95    : {percentile(latencies, 0.95) * 1000:.2f} ms")
+        print(f"latency p99    : {percentile(latencies, 0.99) * 1000:.2f} ms")
+        print(f"latency max    : {latencies[-1] * 1000:.2f} ms")
+    for stage in ("receipt_to_parse", "parse_to_publish", "publish_to_response", "frame_interval"):
+        hist = stages[stage]
+        if hist["count"]:
+            print(f"{stage:<20}: p50 <= {hist['p50_ms']:g} ms, p99 <= {hist['p99_ms']:g} ms, "
+                  f"max {hist['max_ms']:.3f} ms (n={hist['count']:,})")
+    print(f"{'jitter':<20}: {stages['jitter_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
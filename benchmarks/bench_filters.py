@@ -0,0 +1,132 @@
+"""
+Benchmark pipeline filter berat: biaya per sampel dan waktu sampai stabil
+
+Trace berisik dibangkitkan secara deterministik (seed tetap) meniru
+kondisi jembatan timbang pada 50 Hz dengan resolusi indikator 5 kg:
+
+    - vibration : truk naik (ramp 2 s), osilasi teredam + noise + spike
+    - wind      : beban diam dengan hembusan angin frekuensi rendah
+    - spikes    : beban diam dengan spike sering (benturan, noise serial)
+
+Waktu sampai stabil diukur dengan StabilityDetector yang sama dengan
+aplikasi (toleransi 10 kg, jendela 1 s), dihitung dari awal trace.
+
+Usage:
+    python benchmarks/bench_filters.py [jumlah_sampel_per_stage]
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.connect import StabilityDetector
+from services.filters import FilterPipeline
+
+RATE_HZ = 50
+DIVISION = 5.0
+TRUE_WEIGHT = 24_000.0
+TOLERANCE = 10.0
+DURATION_MS = 1000
+MAX_STD = TOLERANCE / 4
+
+PIPELINES = [
+    "",
+    "median:5",
+    "moving_average:10",
+    "kalman:0.5:100:500",
+    "median:5,moving_average:10",
+    "median:5,kalman:0.5:100:500",
+]
+
+
+def quantize(value):
+    return round(value / DIVISION) * DIVISION
+
+
+def trace_vibration(rng, seconds=20):
+    samples = []
+    for i in range(seconds * RATE_HZ):
+        t = i / RATE_HZ
+        if t < 2:
+            load = TRUE_WEIGHT * t / 2
+        else:
+            settle = t - 2
+            load = TRUE_WEIGHT + 180 * math.exp(-settle / 2.5) * math.sin(2 * math.pi * 1.7 * settle)
+        value = load + rng.gauss(0, 6)
+        if rng.random() < 0.03:
+            value += rng.choice((-1, 1)) * rng.uniform(40, 120)
+        samples.append(quantize(value))
+    return samples
+
+
+def trace_wind(rng, seconds=20):
+    samples = []
+    for i in range(seconds * RATE_HZ):
+        t = i / RATE_HZ
+        gust = 9 * math.sin(2 * math.pi * 0.4 * t) + 5 * math.sin(2 * math.pi * 1.3 * t + 1)
+        samples.append(quantize(TRUE_WEIGHT + gust + rng.gauss(0, 5)))
+    return samples
+
+
+def trace_spikes(rng, seconds=20):
+    samples = []
+    for i in range(seconds * RATE_HZ):
+        value = TRUE_WEIGHT + rng.gauss(0, 3)
+        if rng.random() < 0.08:
+            value += rng.choice((-1, 1)) * rng.uniform(30, 200)
+        samples.append(quantize(value))
+    return samples
+
+
+def time_to_stable(samples, spec):
+    """Detik sampai settled pertama dan error berat saat itu (None jika tidak pernah)"""
+    pipeline = FilterPipeline.from_spec(spec)
+    detector = StabilityDetector(TOLERANCE, DURATION_MS, MAX_STD)
+    for i, raw in enumerate(samples):
+        weight = pipeline(raw) if pipeline else raw
+        if detector.update(i / RATE_HZ, weight):
+            return i / RATE_HZ, weight - TRUE_WEIGHT
+    return None, None
+
+
+def bench_cost(total):
+    print(f"Per-sample cost ({total:,} samples)")
+    rng = random.Random(7)
+    values = [TRUE_WEIGHT + rng.gauss(0, 20) for _ in range(total)]
+    for spec in PIPELINES[1:]:
+        pipeline = FilterPipeline.from_spec(spec)
+        start = time.perf_counter()
+        for value in values:
+            pipeline(value)
+        elapsed = time.perf_counter() - start
+        print(f"  {spec:<30} {elapsed / total * 1e9:>8,.0f} ns/sample")
+
+
+def bench_settle():
+    traces = {
+        "vibration": trace_vibration(random.Random(1)),
+        "wind": trace_wind(random.Random(2)),
+        "spikes": trace_spikes(random.Random(3)),
+    }
+    print(f"\nTime to stable (tolerance {TOLERANCE:g} kg, std {MAX_STD:g} kg, window {DURATION_MS} ms)")
+    print(f"  {'pipeline':<30}" + "".join(f"{name:>22}" for name in traces))
+    for spec in PIPELINES:
+        cells = []
+        for samples in traces.values():
+            seconds, error = time_to_stable(samples, spec)
+            cells.append("never" if seconds is None else f"{seconds:6.2f} s ({error:+6.1f} kg)")
+        print(f"  {spec or '(none)':<30}" + "".join(f"{cell:>22}" for cell in cells))
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bench_cost(total)
+    bench_settle()
+
+
+if __name__ == "__main__":
+    main()
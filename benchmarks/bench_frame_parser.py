@@ -0,0 +1,141 @@
+"""
+Micro-benchmark: FrameParser (bytes) vs parser regex lama
+
+    - strict / mixed : nilai berulang (timbangan diam), cache frame kena
+    - unique*        : setiap frame unik, cache frame tidak pernah kena
+    - cold           : state machine dijalankan untuk setiap frame
+
+Usage:
+    python benchmarks/bench_frame_parser.py [jumlah_frame]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.frame_parser import FrameParser
+
+
+def legacy_parse_scale_line(line):
+    """Salinan ScaleConnection.parse_scale_line versi regex (baseline)"""
+    cleaned = line.strip()
+    strict = re.match(
+        r"^([A-Z]{2}),([A-Z]{2}),([+-]?\d+(?:\.\d+)?)\.?(kg|Kg|KG|g|G|lb|LB)$",
+        cleaned
+    )
+    if strict:
+        stability, mode, value_raw, unit_raw = strict.groups()
+        return {
+            "raw": cleaned,
+            "stability": stability,
+            "mode": mode,
+            "value": float(value_raw),
+            "unit": unit_raw.lower(),
+            "stable": stability == "ST"
+        }
+
+    ascii_only = re.sub(r"[^A-Za-z0-9+.\-]", "", cleaned)
+    value_match = re.search(r"([+-]?\d+(?:\.\d+)?)", ascii_only)
+    if not value_match:
+        return None
+    upper = ascii_only.upper()
+    stability = "ST" if "ST" in upper else ("US" if "US" in upper else None)
+    mode = "NT" if "NT" in upper else ("GS" if "GS" in upper else None)
+    if "KG" in upper:
+        unit = "kg"
+    elif "LB" in upper:
+        unit = "lb"
+    elif "G" in upper:
+        unit = "g"
+    else:
+        unit = "kg"
+    return {
+        "raw": cleaned,
+        "stability": stability,
+        "mode": mode,
+        "value": float(value_match.group(1)),
+        "unit": unit,
+        "stable": stability == "ST"
+    }
+
+
+SAMPLES = {
+    # Timbangan diam / naik-turun pelan: nilai berulang
+    "strict": [f"ST,NT,{i * 0.5:.2f}kg" for i in range(1000)],
+    "mixed": [
+        f"ST,GS,{i:.2f}kg" if i % 4 else f"  US NT  +{i}.5 KG  " for i in range(1000)
+    ],
+}
+
+
+def run(label, func, lines, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            func(line)
+    elapsed = time.perf_counter() - start
+    rate = len(lines) * repeat / elapsed
+    print(f"  {label:<10} {rate:>14,.0f} frames/s")
+    return rate
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    parser = FrameParser()
+
+    for name, lines in SAMPLES.items():
+        repeat = max(1, total // len(lines))
+        encoded = [line.encode("ascii") for line in lines]
+
+        # Sanity check: hasil harus identik dengan parser lama
+        for line, raw in zip(lines, encoded):
+            expected = legacy_parse_scale_line(line)
+            parsed = parser.parse(raw)
+            assert (parsed._asdict() if parsed else None) == expected, line
+
+        print(f"[{name}] {len(lines) * repeat:,} frames")
+        legacy = run("regex", legacy_parse_scale_line, lines, repeat)
+        fast = run("bytes", parser.parse, encoded, repeat)
+        print(f"  speedup    {fast / legacy:>14.2f}x")
+
+    # Cache frame tidak pernah kena: setiap frame unik. Tabel bentuk
+    # SGW-3015P tetap hangat (satu bentuk per jumlah digit), seperti saat
+    # berat naik-turun di lapangan.
+    unique = {
+        "unique": [f"US,GS,{i * 0.01:.2f}kg" for i in range(total)],
+        "unique-mixed": [
+            f"ST,GS,{i * 0.01:.2f}kg" if i % 4 else f"  US NT  +{i}.5 KG  " for i in range(total)
+        ],
+    }
+    for name, lines in unique.items():
+        encoded = [line.encode("ascii") for line in lines]
+        miss = FrameParser(cache_size=0)
+        for line, raw in zip(lines, encoded):
+            parsed = miss.parse(raw)
+            assert (parsed._asdict() if parsed else None) == legacy_parse_scale_line(line), line
+        print(f"[{name}] {total:,} frames (cache miss)")
+        legacy = run("regex", legacy_parse_scale_line, lines, 1)
+        fast = run("bytes", miss.parse, encoded, 1)
+        print(f"  speedup    {fast / legacy:>14.2f}x")
+        print(f"  shapes     {len(miss.dialects[0]._plans):>14,}")
+
+    # Terburuk: tabel bentuk dikosongkan setiap frame sehingga state machine
+    # berjalan untuk setiap frame (tidak terjadi pada indikator normal)
+    cold = FrameParser(cache_size=0)
+    plans = cold.dialects[0]._plans
+
+    def parse_cold(frame):
+        plans.clear()
+        return cold.parse(frame)
+
+    lines = unique["unique"]
+    print(f"[cold] {total:,} frames (cache miss, state machine per frame)")
+    legacy = run("regex", legacy_parse_scale_line, lines, 1)
+    fast = run("bytes", parse_cold, [line.encode("ascii") for line in lines], 1)
+    print(f"  speedup    {fast / legacy:>14.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark ReadingHistory: biaya append dan memori selama streaming panjang
+
+Mensimulasikan satu hari streaming 50 Hz (4.32 juta sampel) ke ring
+buffer, lalu membandingkan memori dengan list of dict yang menyimpan
+sampel sebanyak kapasitas yang sama. Memori ring buffer harus tetap
+sama sejak buffer penuh pertama kali.
+
+Usage:
+    python benchmarks/bench_history.py [kapasitas] [jam_streaming]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.history import ReadingHistory
+
+RATE_HZ = 50
+
+
+def main():
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    hours = float(sys.argv[2]) if len(sys.argv) > 2 else 24
+    total = int(hours * 3600 * RATE_HZ)
+
+    tracemalloc.start()
+    history = ReadingHistory(capacity)
+    t0 = 1_700_000_000.0
+    checkpoints = {capacity, total // 4, total // 2, total}
+
+    print(f"capacity {capacity:,} samples, {hours:g} h @ {RATE_HZ} Hz = {total:,} samples")
+    start = time.perf_counter()
+    for i in range(1, total + 1):
+        history.append(t0 + i / RATE_HZ, i, 1000.0 + (i % 7), "ST" if i % 5 else "US", "GS")
+        if i in checkpoints:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"  after {i:>12,} samples: {current / 1024:>10,.1f} KiB traced")
+    elapsed = time.perf_counter() - start
+    print(f"  append: {elapsed / total * 1e9:,.0f} ns/sample")
+
+    start = time.perf_counter()
+    result = history.query(max_points=500)
+    print(f"  query full buffer -> {result['count']} points: {(time.perf_counter() - start) * 1000:.1f} ms")
+    tracemalloc.stop()
+
+    # Baseline: list of dict untuk jumlah sampel yang sama
+    tracemalloc.start()
+    rows = [
+        {"ts": t0 + i / RATE_HZ, "packet": i, "weight": 1000.0 + (i % 7), "stability": "ST", "mode": "GS"}
+        for i in range(capacity)
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  list of dict ({len(rows):,} samples): {current / 1024:>10,.1f} KiB traced")
+
+
+if __name__ == "__main__":
+    main()
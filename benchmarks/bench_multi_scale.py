@@ -0,0 +1,114 @@
+"""
+Benchmark ScaleManager dengan banyak port simulasi (pseudo-terminal)
+
+Setiap timbangan simulasi adalah pasangan pty: sisi master ditulis frame
+SGW-3015P oleh benchmark, sisi slave dibuka oleh ScaleConnection seperti
+port serial biasa. Hanya Linux/macOS.
+
+Usage:
+    python benchmarks/bench_multi_scale.py [jumlah_port] [hz_per_port] [detik] [thread|asyncio]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import tty
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.connect import create_scale_connection
+from services.scale_manager import ScaleManager
+
+
+def open_simulated_port():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    os.set_blocking(master, False)
+    return master, slave, os.ttyname(slave)
+
+
+async def feed(master, hz, duration, stats):
+    """Tulis frame ke sisi master dengan laju tetap"""
+    interval = 1 / hz
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        try:
+            os.write(master, f"ST,GS,{i % 10000 * 0.5:.2f}kg\r\n".encode("ascii"))
+            stats["sent"] += 1
+        except BlockingIOError:
+            stats["dropped"] += 1
+        i += 1
+        await asyncio.sleep(interval)
+
+
+async def measure_loop_lag(duration, samples):
+    """Ukur keterlambatan event loop (indikasi loop tersumbat)"""
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        samples.append(time.perf_counter() - start - 0.01)
+
+
+async def main():
+    ports = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    hz = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    transport = sys.argv[4] if len(sys.argv) > 4 else "asyncio"
+
+    manager = ScaleManager()
+    masters = []
+    for n in range(ports):
+        master, slave, path = open_simulated_port()
+        masters.append((master, slave))
+        manager.add(create_scale_connection(
+            transport=transport,
+            scale_id=f"sim{n}",
+            port=path,
+            baudrate=115200,
+            enable_poll=False,
+            # Nothing is written before the clock starts, so probing would
+            # never find a frame; open the configured port directly
+            probe_ms=0,
+            handle_signals=False,
+        ))
+
+    manager.start_all()
+    # Start the clock only once every port is open (as bench_end_to_end.py)
+    deadline = time.perf_counter() + 10
+    while not all(scale.is_connected for scale in manager.scales.values()):
+        if time.perf_counter() > deadline:
+            break
+        await asyncio.sleep(0.05)
+    connected = sum(scale.is_connected for scale in manager.scales.values())
+
+    stats = {"sent": 0, "dropped": 0}
+    lag = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        measure_loop_lag(duration, lag),
+        *(feed(master, hz, duration, stats) for master, _ in masters),
+    )
+    await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - start
+
+    received = sum(scale.packet_count for scale in manager.scales.values())
+    manager.stop_all()
+    for master, slave in masters:
+        os.close(master)
+        os.close(slave)
+
+    lag.sort()
+    print(f"transport      : {transport}")
+    print(f"ports          : {ports} ({connected} connected), {hz:g} Hz each")
+    print(f"frames sent    : {stats['sent']:,} (dropped {stats['dropped']:,})")
+    print(f"frames parsed  : {received:,} ({received / elapsed:,.0f} frames/s)")
+    print(f"loop lag p50   : {lag[len(lag) // 2] * 1000:.2f} ms")
+    print(f"loop lag p99   : {lag[int(len(lag) * 0.99)] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark memori dan alokasi pembacaan: dict lama vs Reading (NamedTuple)
+
+Versi lama membuat dict 9 key plus string ISO ``datetime.utcnow()`` untuk
+setiap frame, walaupun tidak ada client yang memintanya. Reading hanya
+menyimpan nilai mentah; ISO/dict/JSON dibuat saat diminta.
+
+Skenario 50 Hz: satu jam frame (180.000 pembacaan) dengan satu client
+yang mengambil JSON 1x per detik.
+
+Usage:
+    python benchmarks/bench_reading.py [detik_streaming]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.frame_parser import FrameParser
+from services.reading import Reading
+
+RATE_HZ = 50
+RETAINED = 10_000
+
+
+def legacy_reading(packet, parsed, settled, weight):
+    """Bentuk pembacaan versi sebelumnya (baseline)"""
+    return {
+        "ts": datetime.utcnow().isoformat(),
+        "type": "weight",
+        "packet": packet,
+        "stability": parsed.stability,
+        "mode": parsed.mode,
+        "stable": parsed.stable,
+        "settled": settled,
+        "weight": weight,
+        "unit": parsed.unit,
+        "raw": parsed.raw,
+    }
+
+
+def compact_reading(packet, parsed, settled, weight):
+    """Sama seperti ScaleConnection._process_chunk"""
+    now = time.time()
+    rx_ns = time.monotonic_ns()
+    return Reading(
+        ts=now, packet=packet, stability=parsed.stability, mode=parsed.mode, stable=parsed.stable,
+        settled=settled, weight=weight, unit=parsed.unit, raw=parsed.raw, last_ts=now,
+        rx_ns=rx_ns, pub_ns=rx_ns,
+    )
+
+
+def legacy_json(reading):
+    return json.dumps(reading).encode("utf-8")
+
+
+def compact_json(reading):
+    return reading.to_json()
+
+
+def retained_size(build, parsed):
+    """Byte dan jumlah blok memori per pembacaan yang disimpan"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    readings = [build(i, parsed, False, parsed.value) for i in range(RETAINED)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del readings
+    return size / RETAINED, blocks / RETAINED
+
+
+def stream(build, encode, frames, parsed):
+    """Simulasi stream 50 Hz: buat setiap pembacaan, client ambil JSON 1x/detik"""
+    start = time.perf_counter()
+    last = None
+    for i in range(frames):
+        last = build(i, parsed, False, parsed.value)
+        if i % RATE_HZ == 0:
+            encode(last)
+    return time.perf_counter() - start
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    frames = seconds * RATE_HZ
+    parsed = FrameParser().parse(b"ST,GS,  24150.00kg")
+
+    print(f"{frames:,} readings ({seconds:,} s @ {RATE_HZ} Hz), JSON requested once per second")
+    print(f"  {'':<18}{'bytes/reading':>14}{'blocks/reading':>16}{'us/reading':>12}{'CPU per hour':>14}")
+    for label, build, encode in (
+        ("dict (before)", legacy_reading, legacy_json),
+        ("Reading (after)", compact_reading, compact_json),
+    ):
+        size, blocks = retained_size(build, parsed)
+        elapsed = stream(build, encode, frames, parsed)
+        per_hour = elapsed / seconds * 3600
+        print(f"  {label:<18}{size:>14,.0f}{blocks:>16.1f}{elapsed / frames * 1e6:>12.2f}{per_hour:>13.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Throughput benchmark: RxBuffer vs buffer str lama di _read_loop
+
+Skenario:
+    - clean       : frame utuh per chunk
+    - fragmented  : frame dipotong menjadi chunk 1-3 byte
+    - garbage     : noise acak di antara frame (chunk 64 byte)
+    - burst       : noise panjang (~3 KB) tanpa delimiter, chunk 8 byte
+
+Usage:
+    python benchmarks/bench_rx_buffer.py [jumlah_frame]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rx_buffer import RxBuffer
+
+
+class LegacyBuffer:
+    """Salinan logika buffer str dari _read_loop sebelumnya (baseline)"""
+
+    def __init__(self):
+        self.rx_buffer = ""
+
+    def feed(self, chunk):
+        self.rx_buffer += bytes([b & 0x7F for b in chunk]).decode("ascii", errors="ignore")
+        parts = self.rx_buffer.splitlines(keepends=False)
+        if not self.rx_buffer.endswith("\n"):
+            self.rx_buffer = parts.pop() if parts else ""
+        return [line for line in parts if line.strip()]
+
+
+def make_stream(frames, garbage=False, burst=0):
+    rng = random.Random(42)
+    out = bytearray()
+    for i in range(frames):
+        if garbage:
+            # Noise dengan bit 8 aktif
+            out += bytes(rng.randrange(0x80, 0x100) for _ in range(rng.randrange(20, 200)))
+        if burst and i % 50 == 0:
+            # Noise tanpa delimiter (setelah mask 7-bit tetap bukan pemisah baris)
+            out += bytes(rng.choice(b"#$%&ABC\xc1\xd2") for _ in range(burst))
+        out += f"ST,NT,{i % 5000 * 0.5:.2f}kg\r\n".encode("ascii")
+    return bytes(out)
+
+
+def chunked(data, sizes):
+    pos = 0
+    chunks = []
+    while pos < len(data):
+        size = sizes()
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def check_chunks(stream, chunks):
+    """Pastikan RxBuffer menghasilkan frame yang sama dengan splitlines() atas seluruh stream
+
+    Buffer lama tidak dipakai sebagai referensi: jika chunk berakhir tepat di
+    ``\\n`` buffernya tidak dikosongkan sehingga frame terkirim dua kali.
+    """
+    text = bytes(b & 0x7F for b in stream).decode("ascii")
+    expected = [line.encode("ascii") for line in text.splitlines() if line.strip()]
+    fast = RxBuffer()
+    actual = []
+    for chunk in chunks:
+        actual += fast.feed(chunk)
+    assert actual == expected
+
+
+def run(label, buffer_cls, chunks):
+    buffer = buffer_cls()
+    frames = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        frames += len(buffer.feed(chunk))
+    elapsed = time.perf_counter() - start
+    size = sum(len(c) for c in chunks)
+    print(f"  {label:<8} {frames:>8,} frames  {size / elapsed / 1e6:>8.2f} MB/s  {frames / elapsed:>12,.0f} frames/s")
+    return elapsed
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(7)
+
+    scenarios = {
+        "clean": (make_stream(total), lambda: 15),
+        "fragmented": (make_stream(total), lambda: rng.randrange(1, 4)),
+        "garbage": (make_stream(total, garbage=True), lambda: 64),
+        "burst": (make_stream(total, burst=3000), lambda: 8),
+    }
+
+    for name, (stream, sizes) in scenarios.items():
+        chunks = chunked(stream, sizes)
+        check_chunks(stream, chunks)
+        print(f"[{name}] {len(stream):,} bytes in {len(chunks):,} chunks")
+        legacy = run("legacy", LegacyBuffer, chunks)
+        fast = run("rxbuffer", RxBuffer, chunks)
+        print(f"  speedup  {legacy / fast:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark pembacaan state timbangan lewat shared memory (seqlock)
+
+Writer di thread terpisah mengumpankan frame 50 Hz (atau secepat mungkin
+dengan ``--flood``) ke ``ScaleConnection`` yang riwayatnya berada di
+shared memory, persis seperti ``services.acquisition``. Reader mengukur
+biaya ``ScaleSegment.snapshot`` (status + pembacaan terakhir) dan
+``SharedReadingHistory.query`` dari proses yang sama, dibandingkan
+dengan akses langsung ke ``ReadingHistory`` biasa.
+
+Usage:
+    python benchmarks/bench_shared_state.py [iterasi] [--flood]
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.connect import ScaleConnection
+from services.emulator import format_sgw3015p
+from services.shared_state import ScaleSegment, SharedReadingHistory
+
+RATE_HZ = 50
+HISTORY = 3600
+
+
+def feed(connection, stop, flood):
+    i = 0
+    while not stop.is_set():
+        connection._process_chunk(format_sgw3015p(float(i // 25 % 100) * 5, True, "GS"))
+        i += 1
+        if not flood:
+            time.sleep(1 / RATE_HZ)
+
+
+def timed(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    iterations = int(args[0]) if args else 20_000
+    flood = "--flood" in sys.argv
+
+    local = ScaleConnection(handle_signals=False, enable_poll=False, history_size=HISTORY)
+    shared = ScaleConnection(handle_signals=False, enable_poll=False, history_size=HISTORY)
+    segment = ScaleSegment.create(f"bench-{os.getpid()}", HISTORY, shared.instance_tag)
+    shared.history = SharedReadingHistory(segment)
+    shared.on_chunk = segment.publish
+    reader = ScaleSegment.attach(segment.name)
+    reader_history = SharedReadingHistory(reader)
+
+    for i in range(HISTORY):
+        frame = format_sgw3015p(float(i) * 5, True, "GS")
+        local._process_chunk(frame)
+        shared._process_chunk(frame)
+
+    stop = threading.Event()
+    writer = threading.Thread(target=feed, args=(shared, stop, flood), daemon=True)
+    writer.start()
+    try:
+        print(f"writer: {'flood' if flood else f'{RATE_HZ} Hz'}, history {HISTORY}, {iterations:,} iterations")
+        print(f"{'':34} {'us/op':>9}")
+        rows = (
+            ("last_reading (in-process)", lambda: local.last_reading, iterations),
+            ("snapshot (shared memory)", reader.snapshot, iterations),
+            ("query last=100 (in-process)", lambda: local.history.query(last=100), iterations // 10),
+            ("query last=100 (shared memory)", lambda: reader_history.query(last=100), iterations // 10),
+            ("query all, 200 pts (in-process)", lambda: local.history.query(max_points=200), iterations // 100),
+            ("query all, 200 pts (shared memory)", lambda: reader_history.query(max_points=200), iterations // 100),
+        )
+        for name, fn, count in rows:
+            print(f"{name:34} {timed(fn, max(count, 1)):>9.2f}")
+        print(f"writer frames: {shared.packet_count:,}")
+    finally:
+        stop.set()
+        writer.join()
+        shared.on_chunk = None
+        reader_history.release()
+        reader.close()
+        shared.history.release()
+        segment.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark bulk insert tiket timbangan: 1k / 10k / 100k baris
+
+Membandingkan:
+
+    - orm        : satu objek ORM per tiket (add + flush), satu commit
+    - bulk       : services.timbangan.validate_bulk + bulk_create_timbangan
+                   (multi-row INSERT ... RETURNING, atau COPY di PostgreSQL)
+    - POST /bulk : endpoint lengkap lewat ASGI in-process (parse JSON,
+                   validasi, insert, serialisasi response)
+
+Default memakai SQLite sementara; set DATABASE_URL untuk PostgreSQL.
+
+Usage:
+    python benchmarks/bench_timbangan_bulk.py [--sizes 1000,10000,100000] [--orm-max 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import func, select
+
+ROW = {"nopol": "B 1234 CD", "sopir": "Budi", "gross": 24000.5, "nett": 16000.25, "petugas": "Ani", "rate": 150.0}
+
+
+def build_app() -> FastAPI:
+    from routes import timbangan as timbangan_routes
+
+    app = FastAPI()
+    app.include_router(timbangan_routes.router)
+    return app
+
+
+async def run_orm(rows):
+    from database import AsyncSessionLocal
+    from models import Timbangan
+    from schemas import TimbanganCreate
+    from services.timbangan import _to_columns, allocate_no_urut
+
+    async with AsyncSessionLocal() as db:
+        for row in rows:
+            values = _to_columns(TimbanganCreate(**row).model_dump(exclude_none=True))
+            [no_urut] = await allocate_no_urut(db)
+            db.add(Timbangan(no_urut=no_urut, **values))
+            await db.flush()
+        await db.commit()
+
+
+async def run_bulk(rows):
+    from database import AsyncSessionLocal
+    from services.timbangan import bulk_create_timbangan, validate_bulk
+
+    valid, _ = validate_bulk(rows)
+    async with AsyncSessionLocal() as db:
+        method, keys = await bulk_create_timbangan(db, [ticket for _, ticket in valid])
+    assert len(keys) == len(rows)
+    return method
+
+
+async def run_http(http, rows):
+    response = await http.post("/api/timbangan/bulk", json=rows)
+    assert response.status_code == 201, response.text[:200]
+    return response.json()["method"]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--orm-max", type=int, default=10000, help="Lewati baseline ORM di atas jumlah ini")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    from database import AsyncSessionLocal, async_engine, init_db
+    from models import Timbangan
+
+    init_db()
+    transport = httpx.ASGITransport(app=build_app())
+    print(os.environ["DATABASE_URL"])
+    print(f"{'rows':>8} {'variant':<11} {'method':<7} {'seconds':>8} {'rows/s':>10}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as http:
+        for size in sizes:
+            rows = [{**ROW, "catatan": f"ticket {i}"} for i in range(size)]
+            variants = [("bulk", run_bulk), ("POST /bulk", lambda rows: run_http(http, rows))]
+            if size <= args.orm_max:
+                variants.insert(0, ("orm", run_orm))
+            for name, fn in variants:
+                start = time.perf_counter()
+                method = await fn(rows)
+                elapsed = time.perf_counter() - start
+                print(f"{size:>8,} {name:<11} {method or '-':<7} {elapsed:>8.3f} {size / elapsed:>10,.0f}")
+
+    async with AsyncSessionLocal() as db:
+        print(f"total rows: {await db.scalar(select(func.count()).select_from(Timbangan)):,}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
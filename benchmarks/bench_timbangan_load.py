@@ -0,0 +1,182 @@
+"""
+Load test: CRUD tiket timbangan vs responsivitas /api/scale/reading
+
+Aplikasi (router scale + timbangan) dijalankan di uvicorn (thread
+terpisah). Probe meminta ``/api/scale/reading`` setiap beberapa ms dan
+mencatat latensinya, sementara sejumlah client membuat, membaca dan
+mendaftar tiket tanpa jeda. Tiga fase:
+
+    - idle     : tanpa trafik tiket
+    - async    : /api/timbangan (AsyncSession, event loop tidak terblokir)
+    - blocking : handler lama, Session sync di dalam ``async def``
+
+Default memakai SQLite sementara; set DATABASE_URL untuk PostgreSQL.
+
+Usage:
+    python benchmarks/bench_timbangan_load.py [--seconds 5] [--clients 16] [--seed 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx
+import uvicorn
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from sqlalchemy import func, insert, select
+
+PROBE_INTERVAL_S = 0.005
+
+TICKET = {"nopol": "B 1234 CD", "sopir": "Budi", "gross": 24000.0, "nett": 16000.0, "petugas": "Ani"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_app() -> FastAPI:
+    from database import SessionLocal
+    from models import Timbangan
+    from routes import scale as scale_routes
+    from routes import timbangan as timbangan_routes
+    from schemas import TimbanganCreate, TimbanganResponse
+
+    app = FastAPI()
+    app.include_router(scale_routes.router)
+    app.include_router(timbangan_routes.router)
+
+    # Baseline: Session sync dipanggil langsung dari async def (memblokir loop)
+    @app.post("/legacy/timbangan", response_model=TimbanganResponse, status_code=201)
+    async def legacy_create(data: TimbanganCreate):
+        with SessionLocal() as db:
+            no_urut = (db.scalar(select(func.max(Timbangan.no_urut))) or 0) + 1
+            ticket = Timbangan(no_urut=no_urut, **data.model_dump(exclude_none=True))
+            db.add(ticket)
+            db.commit()
+            db.refresh(ticket)
+            return ticket
+
+    @app.get("/legacy/timbangan")
+    async def legacy_list():
+        with SessionLocal() as db:
+            total = db.scalar(select(func.count()).select_from(Timbangan))
+            rows = db.scalars(select(Timbangan).order_by(Timbangan.tanggalwaktu.desc()).limit(50)).all()
+            return {"total": total, "data": [row.to_dict() for row in rows]}
+
+    return app
+
+
+def seed(rows: int):
+    """Isi tabel agar daftar/count punya pekerjaan nyata"""
+    from database import engine, init_db
+    from models import Timbangan
+
+    init_db()
+    start = datetime.utcnow() - timedelta(days=365)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Timbangan))
+        batch = []
+        for i in range(existing, rows):
+            batch.append({
+                **TICKET,
+                "no_urut": i + 1,
+                "tanggalwaktu": start + timedelta(minutes=i),
+                "created_at": start,
+                "updated_at": start,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Timbangan), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Timbangan), batch)
+
+
+def percentile(values, pct):
+    return values[min(int(len(values) * pct), len(values) - 1)]
+
+
+async def probe(http, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await http.get("/api/scale/reading")
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(PROBE_INTERVAL_S)
+
+
+async def ticket_client(http, stop, prefix, stats):
+    while not stop.is_set():
+        try:
+            response = await http.post(prefix, json=TICKET)
+            if response.status_code == 201 and prefix == "/api/timbangan":
+                await http.get(f"{prefix}/{response.json()['uuid']}")
+            await http.get(prefix, params={"page_size": 50})
+            stats["ok" if response.status_code == 201 else "errors"] += 1
+        except httpx.HTTPError:
+            stats["errors"] += 1
+
+
+async def phase(base_url, name, prefix, seconds, clients):
+    stop = asyncio.Event()
+    latencies = []
+    stats = {"ok": 0, "errors": 0}
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as http:
+        tasks = [asyncio.create_task(probe(http, stop, latencies))]
+        if prefix:
+            tasks += [asyncio.create_task(ticket_client(http, stop, prefix, stats)) for _ in range(clients)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"{name:9} {stats['ok'] / seconds:>9.0f} {stats['errors']:>7} {len(ms):>7} "
+        f"{percentile(ms, 0.5):>8.2f} {percentile(ms, 0.99):>8.2f} {ms[-1]:>8.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=20000)
+    args = parser.parse_args()
+
+    from services.connect import get_scale_connection
+
+    seed(args.seed)
+    get_scale_connection()._process_chunk(b"ST,GS,1234.50kg\r\n")
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(build_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"{os.environ['DATABASE_URL']}, {args.seed:,} rows, {args.clients} clients, {args.seconds:g} s per phase")
+    print(f"{'':9} {'tickets/s':>9} {'errors':>7} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    try:
+        for name, prefix in (("idle", None), ("async", "/api/timbangan"), ("blocking", "/legacy/timbangan")):
+            asyncio.run(phase(base_url, name, prefix, args.seconds, args.clients))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
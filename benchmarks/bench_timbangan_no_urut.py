@@ -0,0 +1,137 @@
+"""
+Stress test alokasi no_urut: banyak gate membuat tiket bersamaan
+
+Sejumlah client (masing-masing AsyncSession sendiri) membuat tiket tanpa
+jeda selama beberapa detik. Dua varian:
+
+    - max+1     : cara lama, SELECT MAX(no_urut) + 1 lalu INSERT; bentrok
+                  di unique index diulang (dihitung sebagai retry)
+    - allocator : services.timbangan.create_timbangan (sequence PostgreSQL
+                  / counter SQLite)
+
+Setelah setiap fase dicek: no_urut duplikat (harus 0), gap, dan jumlah
+request yang gagal.
+
+Default memakai SQLite sementara; set DATABASE_URL untuk PostgreSQL
+(jalankan ``alembic upgrade head`` atau init_db dulu), dan
+NO_URUT_BLOCK_SIZE untuk mencoba cache blok per proses.
+
+Usage:
+    python benchmarks/bench_timbangan_no_urut.py [--seconds 5] [--clients 16]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+TICKET = {"nopol": "B 1234 CD", "sopir": "Budi", "gross": 24000.0, "nett": 16000.0, "petugas": "Ani"}
+
+
+async def create_max_plus_one(db, data, stats):
+    """Baseline: alokasi MAX + 1 seperti sebelum sequence"""
+    from models import Timbangan
+    from services.timbangan import _to_columns
+
+    values = _to_columns(data.model_dump(exclude_none=True))
+    while True:
+        no_urut = (await db.scalar(select(func.max(Timbangan.no_urut))) or 0) + 1
+        db.add(Timbangan(no_urut=no_urut, **values))
+        try:
+            await db.commit()
+            return
+        except IntegrityError:
+            await db.rollback()
+            stats["retries"] += 1
+
+
+async def create_allocator(db, data, stats):
+    from services.timbangan import create_timbangan
+
+    await create_timbangan(db, data)
+
+
+async def client(create, stop, stats):
+    from database import AsyncSessionLocal
+    from schemas import TimbanganCreate
+
+    data = TimbanganCreate(**TICKET)
+    while not stop.is_set():
+        async with AsyncSessionLocal() as db:
+            try:
+                await create(db, data, stats)
+                stats["ok"] += 1
+            except DBAPIError:
+                stats["errors"] += 1
+
+
+async def phase(name, create, seconds, clients):
+    from database import AsyncSessionLocal
+    from models import Timbangan
+
+    async with AsyncSessionLocal() as db:
+        before = await db.scalar(select(func.coalesce(func.max(Timbangan.no_urut), 0)))
+
+    stop = asyncio.Event()
+    stats = {"ok": 0, "retries": 0, "errors": 0}
+    tasks = [asyncio.create_task(client(create, stop, stats)) for _ in range(clients)]
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    async with AsyncSessionLocal() as db:
+        rows, distinct, low, high = (await db.execute(
+            select(
+                func.count(),
+                func.count(func.distinct(Timbangan.no_urut)),
+                func.min(Timbangan.no_urut),
+                func.max(Timbangan.no_urut),
+            ).where(Timbangan.no_urut > before)
+        )).one()
+    gaps = (high - low + 1 - distinct) if rows else 0
+    print(
+        f"{name:10} {stats['ok'] / elapsed:>9.0f} {stats['retries']:>8} {stats['errors']:>7} "
+        f"{rows - distinct:>10} {gaps:>6}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    from config import settings
+    from database import AsyncSessionLocal, async_engine, init_db
+    from models import Timbangan
+
+    init_db()
+    print(
+        f"{os.environ['DATABASE_URL']}, {args.clients} clients, {args.seconds:g} s per phase, "
+        f"NO_URUT_BLOCK_SIZE={settings.no_urut_block_size}"
+    )
+    print(f"{'':10} {'tickets/s':>9} {'retries':>8} {'errors':>7} {'duplicates':>10} {'gaps':>6}")
+    for name, create in (("max+1", create_max_plus_one), ("allocator", create_allocator)):
+        await phase(name, create, args.seconds, args.clients)
+        # Fresh pool per phase: SQLite connections that hit "database is locked"
+        # in the max+1 phase must not carry their state into the next one
+        await async_engine.dispose()
+
+    async with AsyncSessionLocal() as db:
+        print(f"total rows: {await db.scalar(select(func.count()).select_from(Timbangan)):,}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Benchmark pagination daftar tiket: OFFSET + COUNT(*) vs keyset (cursor)
+
+Mengisi tabel timbangan lalu mengukur, untuk beberapa kedalaman halaman:
+
+    - offset : services.timbangan.list_timbangan (COUNT(*) + OFFSET/LIMIT)
+    - cursor : services.timbangan.list_timbangan_cursor dengan cursor yang
+               menunjuk ke kedalaman yang sama
+
+dan biaya total: COUNT(*) vs estimate_timbangan_count.
+
+Default memakai SQLite sementara; set DATABASE_URL untuk PostgreSQL
+(jalankan ANALYZE timbangan dulu agar perkiraan planner akurat).
+
+Usage:
+    python benchmarks/bench_timbangan_pagination.py [--rows 200000] [--page-size 50] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import uuid as uuid_lib
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+
+TICKET = {"nopol": "B 1234 CD", "sopir": "Budi", "gross": 24000.0, "nett": 16000.0, "petugas": "Ani"}
+
+
+def seed(rows: int):
+    from database import engine, init_db
+    from models import Timbangan
+
+    init_db()
+    start = datetime.utcnow() - timedelta(days=365)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Timbangan))
+        batch = []
+        for i in range(existing, rows):
+            batch.append({
+                **TICKET,
+                "uuid": uuid_lib.uuid4(),
+                "no_urut": i + 1,
+                # Several tickets per second, so the uuid tie-breaker is exercised
+                "tanggalwaktu": start + timedelta(seconds=i // 4),
+                "created_at": start,
+                "updated_at": start,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Timbangan), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Timbangan), batch)
+
+
+async def timed(fn, repeat: int) -> float:
+    """Rata-rata ms per panggilan"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from database import AsyncSessionLocal, async_engine
+    from models import Timbangan
+    from services import timbangan as service
+
+    seed(args.rows)
+    print(f"{os.environ['DATABASE_URL']}, {args.rows:,} rows, page_size {args.page_size}")
+    print(f"{'page':>8} {'offset ms':>10} {'cursor ms':>10}")
+
+    async with AsyncSessionLocal() as db:
+        pages = [1, 10, 100, 1000, args.rows // args.page_size]
+        for page in pages:
+            offset = (page - 1) * args.page_size
+            cursor = None
+            if offset:
+                # Cursor dari baris terakhir halaman sebelumnya (setup, tidak diukur)
+                previous = await db.scalar(
+                    select(Timbangan)
+                    .order_by(Timbangan.tanggalwaktu.desc(), Timbangan.uuid.desc())
+                    .offset(offset - 1)
+                    .limit(1)
+                )
+                cursor = service.encode_cursor("next", previous)
+
+            offset_ms = await timed(lambda: service.list_timbangan(db, page, args.page_size), args.repeat)
+            cursor_ms = await timed(lambda: service.list_timbangan_cursor(db, args.page_size, cursor), args.repeat)
+            print(f"{page:>8,} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+        count_ms = await timed(lambda: db.scalar(select(func.count()).select_from(Timbangan)), args.repeat)
+        estimate_ms = await timed(lambda: service.estimate_timbangan_count(db), args.repeat)
+        estimate = await service.estimate_timbangan_count(db)
+        print(f"COUNT(*) {count_ms:.2f} ms, estimate {estimate_ms:.2f} ms ({estimate:,} rows)")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
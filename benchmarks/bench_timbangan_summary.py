@@ -0,0 +1,117 @@
+"""
+Benchmark summary tiket: scan tabel timbangan vs rollup timbangan_harian
+
+Tabel diisi bertahap sampai setiap ukuran di ``--sizes`` (tiket tersebar
+dua tahun, 50 nopol x 5 petugas), lalu untuk beberapa rentang waktu
+(batas tidak di tengah malam) diukur:
+
+    - scan   : COUNT/SUM langsung di tabel timbangan
+    - rollup : services.timbangan.summarize_timbangan (rollup harian +
+               sisa hari di tepi rentang)
+
+Default memakai SQLite sementara; set DATABASE_URL untuk PostgreSQL.
+
+Usage:
+    python benchmarks/bench_timbangan_summary.py [--sizes 50000,500000] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCALE_AUTO_START", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import uuid as uuid_lib
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+
+START = datetime(2024, 1, 1)
+SPAN_MINUTES = 2 * 365 * 24 * 60
+RANGES = [
+    ("1 day", timedelta(hours=7), timedelta(days=1)),
+    ("30 days", timedelta(days=100, hours=7), timedelta(days=30)),
+    ("365 days", timedelta(days=200, hours=7), timedelta(days=365)),
+]
+
+
+def seed(rows: int):
+    """Isi tabel timbangan sampai ``rows`` baris (tanpa rollup)"""
+    from database import engine, init_db
+    from models import Timbangan
+
+    init_db()
+    rng = random.Random(rows)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Timbangan))
+        batch = []
+        for i in range(existing, rows):
+            batch.append({
+                "uuid": uuid_lib.uuid4(),
+                "no_urut": i + 1,
+                "nopol": f"B {rng.randrange(50):04d} CD",
+                "sopir": "Budi",
+                "petugas": f"Petugas {rng.randrange(5)}",
+                "gross": round(rng.uniform(5000, 40000), 2),
+                "nett": round(rng.uniform(2000, 30000), 2),
+                "tanggalwaktu": START + timedelta(minutes=rng.randrange(SPAN_MINUTES)),
+                "created_at": START,
+                "updated_at": START,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Timbangan), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Timbangan), batch)
+
+
+async def timed(fn, repeat: int):
+    """(rata-rata ms per panggilan, hasil terakhir)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="50000,500000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from database import AsyncSessionLocal, async_engine
+    from models import Timbangan
+    from services import timbangan as service
+
+    print(os.environ["DATABASE_URL"])
+    print(f"{'rows':>9} {'range':<9} {'scan ms':>9} {'rollup ms':>10} {'tickets':>8}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        seed(size)
+        async with AsyncSessionLocal() as db:
+            await service.rebuild_rollup(db)
+            for name, offset, length in RANGES:
+                date_from = START + offset
+                date_to = date_from + length
+
+                async def scan():
+                    return (await db.execute(
+                        select(func.count(), func.sum(Timbangan.gross), func.sum(Timbangan.nett))
+                        .where(Timbangan.tanggalwaktu >= date_from, Timbangan.tanggalwaktu < date_to)
+                    )).one()
+
+                scan_ms, expected = await timed(scan, args.repeat)
+                rollup_ms, (count, _, _) = await timed(
+                    lambda: service.summarize_timbangan(db, date_from, date_to), args.repeat
+                )
+                assert count == expected[0], (count, expected)
+                print(f"{size:>9,} {name:<9} {scan_ms:>9.2f} {rollup_ms:>10.2f} {count:>8,}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
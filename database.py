@@ -2,24 +2,101 @@
 Database configuration dan session management
 """
 
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import AsyncGenerator, Generator
 from config import settings
+from services.metrics import REGISTRY, MetricFamily
 import logging
 
 logger = logging.getLogger(__name__)
 
+POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_seconds",
+    "Waktu menunggu koneksi dari pool SQLAlchemy (termasuk pre-ping/koneksi baru)",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool yang mencatat lama checkout ke db_pool_checkout_seconds"""
+
+    engine_label = "sync"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """Versi asyncio dari TimedQueuePool (untuk create_async_engine)"""
+
+    engine_label = "async"
+
+
+# SQLAlchemy names the pool logger after the pool class module; keep it as
+# quiet as the built-in sqlalchemy.pool logger
+for _pool_class in (TimedQueuePool, TimedAsyncQueuePool):
+    logging.getLogger(f"{__name__}.{_pool_class.__name__}").setLevel(logging.WARNING)
+
+
+def async_database_url(url: str) -> str:
+    """URL driver asyncio untuk DATABASE_URL (asyncpg / aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
+
+
 # Create engine
 engine = create_engine(
     settings.database_url,
     echo=settings.sqlalchemy_echo,
+    poolclass=TimedQueuePool,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+)
+
+
+# Engine asyncio untuk route async (CRUD timbangan); get_db tetap untuk kode sync
+async_engine = create_async_engine(
+    settings.database_async_url or async_database_url(settings.database_url),
+    echo=settings.sqlalchemy_echo,
+    poolclass=TimedAsyncQueuePool,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
 )
 
+
+def collect_pool_metrics():
+    """Gauge isi pool (engine sync dan async) untuk /metrics"""
+    pools = (("sync", engine.pool), ("async", async_engine.sync_engine.pool))
+    return [
+        MetricFamily("db_pool_size", "gauge", "Kapasitas pool (tanpa overflow)",
+                     [("", {"engine": label}, pool.size()) for label, pool in pools]),
+        MetricFamily("db_pool_checked_out", "gauge", "Koneksi yang sedang dipakai",
+                     [("", {"engine": label}, pool.checkedout()) for label, pool in pools]),
+        MetricFamily("db_pool_overflow", "gauge", "Koneksi overflow saat ini",
+                     [("", {"engine": label}, max(pool.overflow(), 0)) for label, pool in pools]),
+    ]
+
+
+REGISTRY.register_collector(collect_pool_metrics)
+
 # Create session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -27,6 +104,13 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    # Objects stay readable after commit without an extra (async) refresh
+    expire_on_commit=False,
+)
+
 # Declarative base untuk models
 Base = declarative_base()
 
@@ -46,6 +130,18 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency untuk session database async (tidak memblokir event loop)
+    
+    Usage:
+        async def my_endpoint(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Inisialisasi database - ciptakan semua tables
@@ -56,8 +152,9 @@ def init_db():
     logger.info("✓ Database tables created")
 
 
-def close_db():
-    """Close database connection"""
+async def close_db():
+    """Close database connections (engine sync dan async)"""
     engine.dispose()
+    await async_engine.dispose()
     logger.info("✓ Database connection closed")
 
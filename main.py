@@ -1,12 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 import logging
 from contextlib import asynccontextmanager
 from config import settings
-from routes import scale
-from services.connect import get_scale_connection
+from routes import scale, metrics, timbangan
+from services.scale_manager import get_scale_manager
+from services.status import encode_json
 from database import engine, init_db, close_db
 from models import Base
+from services.metrics import MetricsMiddleware
 
 # Setup logging
 logging.basicConfig(
@@ -39,19 +41,19 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ Database initialization error: {e}")
     
     # Inisialisasi dan mulai koneksi timbangan jika auto_start enabled
+    scale_manager = get_scale_manager()
     if settings.scale_auto_start:
-        logger.info(f"⚖️  Menemukan timbangan di port {settings.scale_port}...")
-        scale_connection = get_scale_connection()
-        scale_connection.start()
+        ports = ", ".join(scale.base_config["port"] for scale in scale_manager.scales.values())
+        logger.info(f"⚖️  Menemukan timbangan di port {ports}...")
+        scale_manager.start_all()
         logger.info("✓ Koneksi timbangan dimulai")
     
     yield
     
     # Shutdown event
     logger.info("🛑 Menghentikan aplikasi...")
-    scale_connection = get_scale_connection()
-    scale_connection.stop()
-    close_db()
+    scale_manager.stop_all()
+    await close_db()
     logger.info("✓ Aplikasi dihentikan")
 
 
@@ -65,11 +67,17 @@ app = FastAPI(
 )
 
 
+# Latensi request per route untuk /metrics
+app.add_middleware(MetricsMiddleware)
+
+
 # =========================
 # Include Routes
 # =========================
 
 app.include_router(scale.router)
+app.include_router(timbangan.router)
+app.include_router(metrics.router)
 
 
 # =========================
@@ -86,7 +94,9 @@ async def read_root():
             "api_docs": "/docs",
             "redoc": "/redoc",
             "openapi": "/openapi.json",
-            "scale_api": "/api/scale"
+            "metrics": "/metrics",
+            "scale_api": "/api/scale",
+            "timbangan_api": "/api/timbangan"
         },
         "scale": {
             "model": "SGW-3015P",
@@ -96,21 +106,31 @@ async def read_root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint - status aplikasi dan timbangan"""
-    scale_connection = get_scale_connection()
-    scale_status = scale_connection.get_status()
+    manager = get_scale_manager()
+    snapshots = tuple(connection.status_snapshot for connection in manager.scales.values())
     
-    return {
-        "status": "healthy",
-        "app_name": settings.app_name,
-        "debug": settings.debug,
-        "scale": {
-            "connected": scale_status["connected"],
-            "port": scale_status["port"],
-            "packet_count": scale_status["packet_count"]
-        }
-    }
+    def render():
+        # Dari snapshot yang sama dengan ETag, bukan field koneksi yang sedang berubah
+        statuses = {scale_id: snapshot.status for scale_id, snapshot in zip(manager.scales, snapshots)}
+        default = statuses[manager.default_id]
+        return encode_json({
+            "status": "healthy",
+            "app_name": settings.app_name,
+            "debug": settings.debug,
+            "scale": {
+                "connected": default["connected"],
+                "port": default["port"],
+                "packet_count": default["packet_count"]
+            },
+            "scales": {
+                scale_id: status["connected"]
+                for scale_id, status in statuses.items()
+            }
+        })
+    
+    return scale.cached_snapshot_response(request, "health", snapshots, render)
 
 
 @app.get("/config")
@@ -149,6 +169,8 @@ async def get_config():
             "poll_ms": settings.scale_poll_ms,
             "enable_poll": settings.scale_enable_poll,
             "auto_start": settings.scale_auto_start,
+            "transport": settings.scale_transport,
+            "scales": [cfg.model_dump() for cfg in settings.scales],
         },
         "logging": {
             "level": settings.log_level,
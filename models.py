@@ -4,13 +4,15 @@ Database models untuk aplikasi timbangan
 
 from decimal import Decimal
 from typing import Optional
-from sqlalchemy import String, Integer, DateTime, Text, Numeric
+from sqlalchemy import String, Integer, Date, DateTime, Text, Numeric, Sequence, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
 import uuid as uuid_lib
-from datetime import datetime
+from datetime import date, datetime
 from database import Base
 
+# Sequence no_urut (PostgreSQL)
+NO_URUT_SEQUENCE = "timbangan_no_urut_seq"
+
 
 class Timbangan(Base):
     """
@@ -22,7 +24,8 @@ class Timbangan(Base):
     
     # Primary Key
     uuid: Mapped[uuid_lib.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        # Native UUID di PostgreSQL, CHAR(32) di SQLite
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid_lib.uuid4,
         doc="Unique identifier"
@@ -31,15 +34,19 @@ class Timbangan(Base):
     # Sequence
     no_urut: Mapped[int] = mapped_column(
         Integer,
+        # Dipakai di PostgreSQL; SQLite memakai TimbanganNoUrut
+        Sequence(NO_URUT_SEQUENCE),
         nullable=False,
-        autoincrement=True,
-        doc="Nomor urut pembacaan (auto increment)"
+        unique=True,
+        index=True,
+        doc="Nomor urut pembacaan (dialokasikan services.timbangan.allocate_no_urut)"
     )
     
     # Vehicle info
     nopol: Mapped[str] = mapped_column(
         String(20),
         nullable=False,
+        index=True,
         doc="Nomer plat nomor kendaraan"
     )
     
@@ -74,6 +81,7 @@ class Timbangan(Base):
         DateTime,
         default=datetime.utcnow,
         nullable=False,
+        index=True,
         doc="Waktu pencatatan pembacaan"
     )
     
@@ -89,6 +97,7 @@ class Timbangan(Base):
         DateTime,
         default=datetime.utcnow,
         nullable=False,
+        index=True,
         doc="Waktu record dibuat di database"
     )
     
@@ -125,3 +134,34 @@ class Timbangan(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class TimbanganNoUrut(Base):
+    """
+    Counter no_urut untuk database tanpa SEQUENCE (SQLite)
+
+    Satu baris (id = 1) berisi no_urut terakhir yang dialokasikan; dinaikkan
+    (upsert) di transaksi yang sama dengan INSERT tiket.
+    """
+    __tablename__ = "timbangan_no_urut"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class TimbanganHarian(Base):
+    """
+    Rollup harian tiket per nopol dan petugas (untuk summary)
+
+    Diperbarui di transaksi yang sama dengan insert/update/delete tiket
+    (services.timbangan), sehingga selalu cocok dengan isi tabel timbangan.
+    """
+    __tablename__ = "timbangan_harian"
+    
+    tanggal: Mapped[date] = mapped_column(Date, primary_key=True, doc="Tanggal dari tanggalwaktu")
+    nopol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    petugas: Mapped[str] = mapped_column(String(100), primary_key=True)
+    
+    jumlah: Mapped[int] = mapped_column(Integer, nullable=False, doc="Jumlah tiket")
+    total_gross: Mapped[Decimal] = mapped_column(Numeric(precision=16, scale=2), nullable=False)
+    total_nett: Mapped[Decimal] = mapped_column(Numeric(precision=16, scale=2), nullable=False)
@@ -0,0 +1,28 @@
+"""
+Route /metrics dalam format teks Prometheus
+"""
+
+from fastapi import APIRouter, Response
+from services.metrics import CONTENT_TYPE, REGISTRY
+from services.scale_manager import get_scale_manager
+
+router = APIRouter(tags=["Metrics"])
+
+
+def collect_scale_metrics():
+    return get_scale_manager().collect_metrics()
+
+
+REGISTRY.register_collector(collect_scale_metrics)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Metrics untuk scrape Prometheus
+    
+    Berisi frame/pembacaan, kegagalan parse per alasan, reconnect dan durasi
+    _try_connect, histogram latensi akuisisi per timbangan, latensi request
+    HTTP per route, serta waktu checkout dan isi pool database.
+    """
+    return Response(content=REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE})
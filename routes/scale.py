@@ -2,14 +2,32 @@
 Routes untuk koneksi dan pembacaan timbangan SGW-3015P via Serial Port
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from services.connect import get_scale_connection
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from services.connect import ScaleConnection, get_scale_connection
+from services.scale_manager import get_scale_manager
+from services.pubsub import POLICIES, POLICY_DROP_OLDEST
+from services.reading import Reading
+from services.status import StatusSnapshot, body_etag, encode_json, same_snapshots
+
+logger = logging.getLogger(__name__)
 
 # Inisialisasi router
 router = APIRouter(prefix="/api/scale", tags=["Scale/Timbangan"])
 
+# Interval keep-alive stream saat tidak ada pembacaan baru (detik)
+STREAM_KEEPALIVE_S = 15
+
+# Batas atas timeout long-poll /reading?after= dan /capture-stable (ms)
+LONG_POLL_MAX_MS = 120000
+
 
 # =========================
 # Pydantic Models
@@ -23,21 +41,81 @@ class ScaleReadingResponse(BaseModel):
     stability: Optional[str] = None
     mode: Optional[str] = None
     stable: bool
+    settled: bool = False
     weight: float
     unit: str
     raw: str
+    repeat: int = 1
+    last_ts: Optional[str] = None
+
+
+class PollStatusResponse(BaseModel):
+    """Mode polling yang dipelajari scheduler"""
+    mode: str
+    command: Optional[str] = None
+    latency_ms: Optional[float] = None
+    interval_ms: Optional[int] = None
+    polls_sent: int = 0
 
 
 class ConnectionStatusResponse(BaseModel):
     """Model response untuk status koneksi"""
+    scale_id: Optional[str] = None
     connected: bool
     port: str
     baudrate: int
     active_config: Optional[Dict[str, Any]] = None
+    config_verified: bool = False
+    reconnect_count: int = 0
     packet_count: int
+    run_count: int = 0
+    raw_rate_hz: float = 0.0
+    poll: Optional[PollStatusResponse] = None
     last_reading: Optional[ScaleReadingResponse] = None
 
 
+class AggregatedStatusResponse(ConnectionStatusResponse):
+    """Status timbangan default plus status semua timbangan per scale_id"""
+    scales: Dict[str, ConnectionStatusResponse] = {}
+
+
+class ReadingHistoryResponse(BaseModel):
+    """Riwayat pembacaan dalam bentuk kolom (indeks yang sama = sampel yang sama)"""
+    scale_id: str
+    count: int
+    samples: int
+    ts: List[float]
+    last_ts: List[float]
+    packet: List[int]
+    repeat: List[int]
+    weight: List[float]
+    stability: List[Optional[str]]
+    mode: List[Optional[str]]
+
+
+class LatencyHistogramResponse(BaseModel):
+    """Ringkasan histogram satu tahap latensi (ms)"""
+    count: int
+    mean_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    buckets_ms: Dict[str, int]
+
+
+class LatencyResponse(BaseModel):
+    """Latensi jalur akuisisi sejak ``since`` (epoch detik)"""
+    scale_id: str
+    since: float
+    receipt_to_parse: LatencyHistogramResponse
+    parse_to_publish: LatencyHistogramResponse
+    publish_to_response: LatencyHistogramResponse
+    publish_to_stream: LatencyHistogramResponse
+    frame_interval: LatencyHistogramResponse
+    jitter_ms: float
+
+
 class AvailablePortResponse(BaseModel):
     """Model untuk port yang tersedia"""
     port: str
@@ -45,12 +123,138 @@ class AvailablePortResponse(BaseModel):
     hwid: str
 
 
+# =========================
+# Helpers
+# =========================
+
+def get_scale_or_404(scale_id: str) -> ScaleConnection:
+    """Ambil koneksi timbangan berdasarkan scale_id atau raise 404"""
+    scale = get_scale_manager().get(scale_id)
+    if scale is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Timbangan '{scale_id}' tidak terdaftar"
+        )
+    return scale
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Cek header If-None-Match terhadap ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def conditional_json(request: Request, etag: str, render: Callable[[], bytes]) -> Response:
+    """
+    Response JSON dengan ETag
+    
+    Jika client sudah memegang versi yang sama (If-None-Match), kembalikan
+    304 tanpa body; ``render`` hanya dipanggil jika body memang dibutuhkan.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=render(), media_type="application/json", headers=headers)
+
+
+def reading_etag(scale: ScaleConnection, reading: Reading) -> str:
+    # Weak: a run that only grew (repeat/last_ts) is the same reading
+    return f'W/"{scale.instance_tag}-{reading.packet}"'
+
+
+# Cache JSON gabungan beberapa snapshot per endpoint: key -> (snapshots, etag, body)
+_snapshot_cache: Dict[str, Tuple[Tuple[StatusSnapshot, ...], str, bytes]] = {}
+
+
+def cached_snapshot_response(
+    request: Request,
+    cache_key: str,
+    snapshots: Tuple[StatusSnapshot, ...],
+    render: Callable[[], bytes],
+) -> Response:
+    """
+    Response JSON dengan ETag yang disusun dari beberapa StatusSnapshot
+
+    ``render`` hanya dipanggil jika salah satu snapshot sudah diganti;
+    selama tidak ada perubahan, request hanya membandingkan referensi.
+    """
+    cached = _snapshot_cache.get(cache_key)
+    if cached is None or not same_snapshots(cached[0], snapshots):
+        body = render()
+        cached = (snapshots, body_etag(body), body)
+        _snapshot_cache[cache_key] = cached
+    _, etag, body = cached
+    return conditional_json(request, etag, lambda: body)
+
+
+def resolve_scale(scale_id: Optional[str]) -> ScaleConnection:
+    """Timbangan berdasarkan scale_id, atau timbangan default jika None"""
+    return get_scale_connection() if scale_id is None else get_scale_or_404(scale_id)
+
+
+async def build_reading_response(
+    request: Request,
+    scale: ScaleConnection,
+    after: Optional[int] = None,
+    timeout_ms: int = 0,
+) -> Response:
+    """
+    Pembacaan terakhir sebuah timbangan atau raise 404
+    
+    Jika ``after`` diisi, tunggu (long-poll) sampai ada pembacaan dengan
+    packet > after; 204 No Content jika timeout habis.
+    
+    Body JSON diambil dari cache hub (dibuat sekali per pembacaan) dan
+    ETag (weak) diturunkan dari nomor packet, sehingga client yang mengirim
+    If-None-Match untuk pembacaan yang sama mendapat 304 tanpa body, juga
+    saat frame identik hanya menambah ``repeat`` pembacaan tersebut.
+    """
+    if after is not None:
+        reading = await scale.wait_for_reading(after, timeout_ms / 1000)
+        if reading is None:
+            return Response(status_code=204)
+    else:
+        reading = scale.get_last_reading()
+    
+    if reading is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Belum ada pembacaan. Pastikan timbangan terhubung."
+        )
+    
+    response = conditional_json(
+        request,
+        reading_etag(scale, reading),
+        lambda: scale.hub.encode_bytes(reading)
+    )
+    scale.latency.publish_to_response.record(time.monotonic_ns() - reading.pub_ns)
+    return response
+
+
+async def build_capture_response(scale: ScaleConnection, timeout_ms: int) -> Response:
+    """Tunggu pembacaan settled pertama atau raise 408 jika timeout"""
+    reading = await scale.wait_for_settled(timeout_ms / 1000)
+    if reading is None:
+        raise HTTPException(
+            status_code=408,
+            detail=f"Berat belum stabil dalam {timeout_ms} ms"
+        )
+    response = Response(content=scale.hub.encode_bytes(reading), media_type="application/json")
+    scale.latency.publish_to_response.record(time.monotonic_ns() - reading.pub_ns)
+    return response
+
+
 # =========================
 # Endpoints
 # =========================
 
-@router.get("/status", response_model=ConnectionStatusResponse)
-async def get_status():
+@router.get("/status", response_model=AggregatedStatusResponse)
+async def get_status(request: Request):
     """
     Dapatkan status koneksi timbangan
     
@@ -61,15 +265,36 @@ async def get_status():
         - active_config: Konfigurasi yang sedang aktif
         - packet_count: Jumlah paket yang diterima
         - last_reading: Pembacaan terakhir
+        - scales: Status semua timbangan per scale_id
+    
+    Field di level atas adalah milik timbangan default. Mendukung
+    If-None-Match (ETag berubah hanya jika status salah satu timbangan berubah).
+    
+    Body disusun dari JSON snapshot yang sudah jadi; tidak ada validasi
+    pydantic per request.
     """
-    scale = get_scale_connection()
-    status = scale.get_status()
+    manager = get_scale_manager()
+    scales = manager.scales
+    snapshots = tuple(scale.status_snapshot for scale in scales.values())
+    
+    def render():
+        default = scales[manager.default_id].status_snapshot.body
+        parts = [encode_json(scale_id) + b":" + snapshot.body for scale_id, snapshot in zip(scales, snapshots)]
+        return default[:-1] + b',"scales":{' + b",".join(parts) + b"}}"
     
-    return ConnectionStatusResponse(**status)
+    return cached_snapshot_response(request, "status", snapshots, render)
 
 
-@router.get("/reading", response_model=Optional[ScaleReadingResponse])
-async def get_reading():
+@router.get(
+    "/reading",
+    response_model=Optional[ScaleReadingResponse],
+    responses={204: {"description": "Timeout long-poll, tidak ada pembacaan baru"}}
+)
+async def get_reading(
+    request: Request,
+    after: Optional[int] = Query(None, ge=0, description="Long-poll: tunggu pembacaan dengan packet > after"),
+    timeout: int = Query(30000, ge=0, le=LONG_POLL_MAX_MS, description="Batas waktu long-poll (ms)"),
+):
     """
     Dapatkan pembacaan timbangan terbaru
     
@@ -78,17 +303,32 @@ async def get_reading():
         - unit: Satuan (kg, g, lb)
         - stable: Apakah pembacaan stabil
         - ts: Timestamp pembacaan
-    """
-    scale = get_scale_connection()
-    reading = scale.get_last_reading()
     
-    if reading is None:
-        raise HTTPException(
-            status_code=404,
-            detail="Belum ada pembacaan. Pastikan timbangan terhubung."
-        )
+    Long-poll: ``?after=<packet>&timeout=<ms>`` menunggu sampai ada
+    pembacaan yang lebih baru dari packet tersebut (204 jika timeout).
+    """
+    return await build_reading_response(request, get_scale_connection(), after, timeout)
+
+
+@router.post(
+    "/capture-stable",
+    response_model=ScaleReadingResponse,
+    responses={408: {"description": "Berat tidak stabil sebelum timeout"}}
+)
+async def capture_stable(
+    scale_id: Optional[str] = None,
+    timeout: int = Query(10000, ge=0, le=LONG_POLL_MAX_MS, description="Batas waktu menunggu stabil (ms)"),
+):
+    """
+    Tangkap berat stabil pertama
     
-    return ScaleReadingResponse(**reading)
+    Mengembalikan pembacaan segera setelah detektor stabilitas menyatakan
+    berat stabil (semua sampel dalam SCALE_STABLE_DURATION_MS terakhir
+    berada dalam SCALE_STABLE_TOLERANCE dari rata-ratanya), tanpa
+    menunggu flag ST indikator. Jika saat ini sudah stabil, pembacaan
+    terakhir langsung dikembalikan. 408 jika timeout habis.
+    """
+    return await build_capture_response(resolve_scale(scale_id), timeout)
 
 
 @router.post("/start")
@@ -150,32 +390,256 @@ async def scale_health():
     """
     Health check untuk timbangan
     
-    Returns status koneksi dan informasi dasar
+    Returns status koneksi dan informasi dasar (JSON snapshot yang sudah jadi)
     """
-    scale = get_scale_connection()
-    status = scale.get_status()
-    
-    return {
-        "healthy": status["connected"],
-        "connected": status["connected"],
-        "port": status["port"],
-        "packet_count": status["packet_count"],
-        "last_reading_available": status["last_reading"] is not None
-    }
+    return Response(content=get_scale_connection().status_snapshot.health_body, media_type="application/json")
 
 
 # =========================
-# WebSocket untuk streaming readings (optional)
+# Streaming Readings (SSE & WebSocket)
 # =========================
 
+def check_policy(policy: str):
+    """Raise 422 jika policy antrian tidak dikenal"""
+    if policy not in POLICIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"policy harus salah satu dari: {', '.join(POLICIES)}"
+        )
+
+
+def subscribe_readings(
+    scale: ScaleConnection,
+    stable_only: bool,
+    on_change: bool,
+    policy: str,
+    queue_size: int,
+):
+    """Buat subscription ke hub pembacaan timbangan"""
+    check_policy(policy)
+    return scale.hub.subscribe(
+        maxsize=queue_size,
+        policy=policy,
+        stable_only=stable_only,
+        on_change=on_change,
+    )
+
+
 @router.get("/readings/stream")
-async def stream_readings():
+async def stream_readings(
+    request: Request,
+    scale_id: Optional[str] = None,
+    stable_only: bool = False,
+    on_change: bool = False,
+    policy: str = POLICY_DROP_OLDEST,
+    queue_size: int = Query(32, ge=1, le=1024),
+):
+    """
+    Stream pembacaan timbangan via Server-Sent Events
+    
+    Query:
+        - scale_id: Timbangan yang di-stream (default: timbangan default)
+        - stable_only: Hanya kirim pembacaan stabil
+        - on_change: Hanya kirim jika berat/flag berubah
+        - policy: drop_oldest (buang terlama saat antrian penuh) atau latest (hanya terbaru)
+        - queue_size: Kapasitas antrian per client
+    
+    Setiap event berisi JSON yang sama dengan /api/scale/reading.
+    """
+    scale = resolve_scale(scale_id)
+    check_policy(policy)
+    
+    async def event_source():
+        # Subscribe only once the response is streaming, so a client that
+        # never starts the body leaves no subscription behind
+        with subscribe_readings(scale, stable_only, on_change, policy, queue_size) as subscription:
+            while not await request.is_disconnected():
+                try:
+                    reading = await asyncio.wait_for(subscription.get(), STREAM_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"id: %d\nevent: reading\ndata: %s\n\n" % (reading.packet, scale.hub.encode_bytes(reading))
+                scale.latency.publish_to_stream.record(time.monotonic_ns() - reading.pub_ns)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/readings/ws")
+async def websocket_readings(
+    websocket: WebSocket,
+    scale_id: Optional[str] = None,
+    stable_only: bool = False,
+    on_change: bool = False,
+    policy: str = POLICY_DROP_OLDEST,
+    queue_size: int = Query(32, ge=1, le=1024),
+):
+    """
+    Stream pembacaan timbangan via WebSocket
+    
+    Query parameter sama dengan /api/scale/readings/stream. Setiap pesan
+    adalah JSON pembacaan.
+    """
+    scale = get_scale_manager().get(scale_id) if scale_id else get_scale_connection()
+    if scale is None or policy not in POLICIES:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    with subscribe_readings(scale, stable_only, on_change, policy, queue_size) as subscription:
+        async def pump():
+            while True:
+                reading = await subscription.get()
+                await websocket.send_text(scale.hub.encode(reading))
+                scale.latency.publish_to_stream.record(time.monotonic_ns() - reading.pub_ns)
+        
+        # Pesan dari client diabaikan; receive() hanya untuk mendeteksi disconnect
+        sender = asyncio.create_task(pump())
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            sender.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                try:
+                    await sender
+                except Exception as e:
+                    logger.error(f"WebSocket send error: {e}")
+
+
+# =========================
+# Latency
+# =========================
+
+@router.get("/latency", response_model=LatencyResponse)
+async def get_latency(scale_id: Optional[str] = None):
     """
-    Endpoint untuk informasi tentang streaming readings
+    Histogram latensi jalur akuisisi sebuah timbangan
     
-    Note: Untuk implementasi WebSocket, lihat implementasi terpisah
+    Semua tahap diukur dengan ``time.monotonic_ns()`` yang diambil saat
+    chunk serial diterima:
+        - receipt_to_parse: chunk diterima -> frame selesai di-parse
+        - parse_to_publish: frame di-parse -> pembacaan dipublikasikan ke hub
+        - publish_to_response: pembacaan tersedia -> response /reading dibuat
+          (untuk GET biasa = umur data yang dilayani)
+        - publish_to_stream: pembacaan tersedia -> terkirim via SSE/WebSocket
+        - frame_interval: jarak antar frame, plus ``jitter_ms`` (RFC 3550)
+    
+    Bucket dalam ms (batas atas, tidak kumulatif); persentil adalah batas
+    atas bucket yang memuatnya.
     """
+    scale = resolve_scale(scale_id)
+    return {"scale_id": scale.scale_id, **scale.latency.snapshot()}
+
+
+# =========================
+# Reading History
+# =========================
+
+@router.get("/readings/history", response_model=ReadingHistoryResponse)
+async def get_reading_history(
+    scale_id: Optional[str] = None,
+    last: Optional[int] = Query(None, ge=1, description="Hanya N sampel terakhir"),
+    seconds: Optional[float] = Query(None, gt=0, description="Jendela waktu: N detik terakhir"),
+    since: Optional[float] = Query(None, description="Awal jendela waktu (epoch detik)"),
+    until: Optional[float] = Query(None, description="Akhir jendela waktu (epoch detik, eksklusif)"),
+    max_points: Optional[int] = Query(None, ge=1, le=10000, description="Downsample ke paling banyak N titik"),
+):
+    """
+    Riwayat pembacaan dari ring buffer timbangan
+    
+    Query:
+        - scale_id: Timbangan (default: timbangan default)
+        - last: N sampel terakhir (setelah filter waktu)
+        - seconds / since / until: Jendela waktu
+        - max_points: Downsampling; berat dirata-rata per bucket
+    
+    Data dikembalikan per kolom (ts, last_ts, packet, repeat, weight,
+    stability, mode) agar ringkas untuk grafik. Frame identik berturut-turut
+    tersimpan sebagai satu sampel (``repeat`` frame, ``ts``..``last_ts``).
+    ``samples`` adalah jumlah sampel sebelum downsampling. Kapasitas riwayat diatur dengan SCALE_HISTORY_SIZE.
+    """
+    scale = resolve_scale(scale_id)
+    if seconds is not None:
+        since = max(since or 0.0, time.time() - seconds)
+    
+    history = scale.history.query(last=last, since=since, until=until, max_points=max_points)
+    body = json.dumps({"scale_id": scale.scale_id, **history}, separators=(",", ":"))
+    return Response(content=body, media_type="application/json")
+
+
+# =========================
+# Per-Scale Endpoints
+# =========================
+# Didaftarkan paling akhir agar path statis (/readings/..., /ports, ...)
+# tidak tertangkap oleh /{scale_id}/...
+
+@router.get("/{scale_id}/status", response_model=ConnectionStatusResponse)
+async def get_scale_status(request: Request, scale_id: str):
+    """Dapatkan status koneksi satu timbangan (mendukung If-None-Match)"""
+    snapshot = get_scale_or_404(scale_id).status_snapshot
+    return conditional_json(request, snapshot.etag, lambda: snapshot.body)
+
+
+@router.get(
+    "/{scale_id}/reading",
+    response_model=Optional[ScaleReadingResponse],
+    responses={204: {"description": "Timeout long-poll, tidak ada pembacaan baru"}}
+)
+async def get_scale_reading(
+    request: Request,
+    scale_id: str,
+    after: Optional[int] = Query(None, ge=0, description="Long-poll: tunggu pembacaan dengan packet > after"),
+    timeout: int = Query(30000, ge=0, le=LONG_POLL_MAX_MS, description="Batas waktu long-poll (ms)"),
+):
+    """Dapatkan pembacaan terbaru satu timbangan (mendukung long-poll ``after``)"""
+    return await build_reading_response(request, get_scale_or_404(scale_id), after, timeout)
+
+
+@router.post(
+    "/{scale_id}/capture-stable",
+    response_model=ScaleReadingResponse,
+    responses={408: {"description": "Berat tidak stabil sebelum timeout"}}
+)
+async def capture_scale_stable(
+    scale_id: str,
+    timeout: int = Query(10000, ge=0, le=LONG_POLL_MAX_MS, description="Batas waktu menunggu stabil (ms)"),
+):
+    """Tangkap berat stabil pertama dari satu timbangan"""
+    return await build_capture_response(get_scale_or_404(scale_id), timeout)
+
+
+@router.get("/{scale_id}/latency", response_model=LatencyResponse)
+async def get_scale_latency(scale_id: str):
+    """Histogram latensi jalur akuisisi untuk satu timbangan"""
+    scale = get_scale_or_404(scale_id)
+    return {"scale_id": scale.scale_id, **scale.latency.snapshot()}
+
+
+@router.post("/{scale_id}/start")
+async def start_scale_connection(scale_id: str):
+    """Mulai koneksi ke satu timbangan"""
+    scale = get_scale_or_404(scale_id)
+    scale.start()
+    
+    return {
+        "message": f"Koneksi timbangan {scale_id} dimulai",
+        "status": scale.get_status()
+    }
+
+
+@router.post("/{scale_id}/stop")
+async def stop_scale_connection(scale_id: str):
+    """Hentikan koneksi ke satu timbangan"""
+    scale = get_scale_or_404(scale_id)
+    scale.stop()
+    
     return {
-        "message": "Endpoint ini dapat dikembangkan untuk WebSocket streaming",
-        "alternative": "Gunakan polling dengan /api/scale/reading"
+        "message": f"Koneksi timbangan {scale_id} dihentikan"
     }
@@ -0,0 +1,244 @@
+"""
+Routes CRUD data tiket timbangan (SQLAlchemy async)
+"""
+
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from models import Timbangan
+from schemas import (
+    TimbanganBulkResponse,
+    TimbanganCreate,
+    TimbanganCursorResponse,
+    TimbanganListResponse,
+    TimbanganResponse,
+    TimbanganSummary,
+    TimbanganUpdate,
+    to_naive_utc,
+)
+from services import timbangan as service
+
+# Inisialisasi router
+router = APIRouter(prefix="/api/timbangan", tags=["Timbangan"])
+
+# Batas atas page_size untuk daftar tiket
+PAGE_SIZE_MAX = 500
+
+# Batas jumlah baris per request POST /bulk
+BULK_MAX_ROWS = 100_000
+
+
+# =========================
+# Helpers
+# =========================
+
+async def get_timbangan_or_404(uuid: UUID, db: AsyncSession) -> Timbangan:
+    """Ambil tiket berdasarkan uuid atau raise 404"""
+    ticket = await service.get_timbangan(db, uuid)
+    if ticket is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Data timbangan '{uuid}' tidak ditemukan"
+        )
+    return ticket
+
+
+def naive_utc_bounds(date_from: Optional[datetime], date_to: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Batas filter tanggalwaktu sebagai UTC tanpa zona waktu, seperti nilai yang disimpan"""
+    try:
+        return to_naive_utc(date_from), to_naive_utc(date_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# =========================
+# Endpoints
+# =========================
+
+@router.post("", response_model=TimbanganResponse, status_code=201)
+async def create_timbangan(data: TimbanganCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Tambah data pembacaan timbangan baru
+
+    ``no_urut`` diisi otomatis; ``tanggalwaktu`` default waktu sekarang.
+    """
+    return await service.create_timbangan(db, data)
+
+
+@router.post(
+    "/bulk",
+    response_model=TimbanganBulkResponse,
+    status_code=201,
+    responses={422: {"description": "Tidak ada baris valid, atau atomic=true dan ada baris yang ditolak"}},
+)
+async def bulk_create_timbangan(
+    rows: List[Any] = Body(..., description="Daftar TimbanganCreate (antrian tiket dari gate offline)"),
+    atomic: bool = Query(False, description="Tolak semua baris jika ada satu saja yang tidak valid"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Tambah banyak data timbangan sekaligus dalam satu transaksi
+
+    Semua baris divalidasi dulu; baris yang tidak valid dilaporkan di
+    ``errors`` (dengan ``index`` posisinya di request) dan sisanya tetap
+    disimpan, kecuali ``atomic=true``. Baris valid disimpan dengan
+    multi-row ``INSERT ... RETURNING`` atau ``COPY`` (PostgreSQL, batch
+    besar). ``data`` berisi uuid dan no_urut setiap baris tersimpan.
+    """
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maksimal {BULK_MAX_ROWS} baris per request"
+        )
+    valid, errors = service.validate_bulk(rows)
+    method, keys = None, []
+    if valid and not (atomic and errors):
+        method, keys = await service.bulk_create_timbangan(db, [ticket for _, ticket in valid])
+
+    # Serialised directly: validating 100k response items would cost more than the insert
+    body = {
+        "inserted": len(keys),
+        "failed": len(errors),
+        "method": method,
+        "data": [
+            {"index": index, "uuid": str(uuid), "no_urut": no_urut}
+            for (index, _), (uuid, no_urut) in zip(valid, keys)
+        ],
+        "errors": errors,
+    }
+    status_code = 201 if keys or not errors else 422
+    return Response(content=json.dumps(body, separators=(",", ":")), media_type="application/json", status_code=status_code)
+
+
+@router.get("", response_model=TimbanganListResponse)
+async def list_timbangan(
+    page: int = Query(1, ge=1, description="Halaman (mulai dari 1)"),
+    page_size: int = Query(50, ge=1, le=PAGE_SIZE_MAX, description="Jumlah data per halaman"),
+    nopol: Optional[str] = Query(None, description="Filter nomor polisi"),
+    date_from: Optional[datetime] = Query(None, description="tanggalwaktu >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="tanggalwaktu < date_to"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Daftar data timbangan, terbaru dulu
+
+    Memakai OFFSET + COUNT(*) yang makin lambat untuk tabel besar dan
+    halaman dalam; untuk scroll/sinkronisasi gunakan ``/api/timbangan/cursor``.
+
+    Returns:
+        - total: Jumlah data yang cocok dengan filter
+        - page, page_size, total_pages: Informasi halaman
+        - data: Data di halaman ini
+    """
+    date_from, date_to = naive_utc_bounds(date_from, date_to)
+    total, rows = await service.list_timbangan(db, page, page_size, nopol, date_from, date_to)
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size,
+        "data": rows,
+    }
+
+
+@router.get("/cursor", response_model=TimbanganCursorResponse)
+async def list_timbangan_cursor(
+    cursor: Optional[str] = Query(None, description="next_cursor / prev_cursor dari response sebelumnya; kosong = halaman pertama"),
+    limit: int = Query(50, ge=1, le=PAGE_SIZE_MAX, description="Jumlah data per halaman"),
+    nopol: Optional[str] = Query(None, description="Filter nomor polisi"),
+    date_from: Optional[datetime] = Query(None, description="tanggalwaktu >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="tanggalwaktu < date_to"),
+    estimate: bool = Query(False, description="Sertakan estimated_total dari statistik database"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Daftar data timbangan dengan keyset (cursor) pagination, terbaru dulu
+
+    Tanpa OFFSET dan COUNT(*): setiap halaman, sedalam apa pun, dibaca
+    langsung dari index tanggalwaktu. Kirim filter yang sama bersama cursor.
+
+    Returns:
+        - data: Data di halaman ini
+        - next_cursor / prev_cursor: Cursor halaman lebih lama / lebih baru (null jika tidak ada)
+        - estimated_total: Perkiraan total (hanya jika estimate=true; null jika tidak tersedia)
+    """
+    date_from, date_to = naive_utc_bounds(date_from, date_to)
+    try:
+        rows, next_cursor, prev_cursor = await service.list_timbangan_cursor(
+            db, limit, cursor, nopol, date_from, date_to
+        )
+    except service.InvalidCursor:
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+    estimated_total = None
+    if estimate:
+        estimated_total = await service.estimate_timbangan_count(db, nopol, date_from, date_to)
+    return {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "estimated_total": estimated_total,
+        "data": rows,
+    }
+
+
+@router.get("/summary", response_model=TimbanganSummary)
+async def get_timbangan_summary(
+    date_from: datetime = Query(..., description="tanggalwaktu >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="tanggalwaktu < date_to (default: sekarang)"),
+    nopol: Optional[str] = Query(None, description="Filter nomor polisi"),
+    petugas: Optional[str] = Query(None, description="Filter petugas"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Statistik pembacaan dalam rentang waktu
+
+    Dihitung dari rollup harian (timbangan_harian) ditambah sisa hari di
+    tepi rentang, sehingga waktu respon tidak bergantung pada ukuran tabel.
+
+    Returns:
+        - total_records: Jumlah tiket
+        - total_gross, total_nett: Jumlah berat (kg)
+        - average_gross, average_nett: Rata-rata berat per tiket (kg)
+    """
+    date_from, date_to = naive_utc_bounds(date_from, date_to)
+    if date_to is None:
+        date_to = datetime.utcnow()
+    if date_from >= date_to:
+        raise HTTPException(status_code=400, detail="date_from harus sebelum date_to")
+    count, gross, nett = await service.summarize_timbangan(db, date_from, date_to, nopol, petugas)
+    return {
+        "total_records": count,
+        "total_gross": float(gross),
+        "total_nett": float(nett),
+        "average_gross": float(gross / count) if count else 0.0,
+        "average_nett": float(nett / count) if count else 0.0,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+
+@router.get("/{uuid}", response_model=TimbanganResponse)
+async def get_timbangan(uuid: UUID, db: AsyncSession = Depends(get_async_db)):
+    """Detail satu data timbangan"""
+    return await get_timbangan_or_404(uuid, db)
+
+
+@router.put("/{uuid}", response_model=TimbanganResponse)
+async def update_timbangan(uuid: UUID, data: TimbanganUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update data timbangan (hanya field yang dikirim yang diubah)"""
+    ticket = await get_timbangan_or_404(uuid, db)
+    return await service.update_timbangan(db, ticket, data)
+
+
+@router.delete("/{uuid}", status_code=204)
+async def delete_timbangan(uuid: UUID, db: AsyncSession = Depends(get_async_db)):
+    """Hapus data timbangan"""
+    ticket = await get_timbangan_or_404(uuid, db)
+    await service.delete_timbangan(db, ticket)
+    return Response(status_code=204)
@@ -2,38 +2,70 @@
 Pydantic schemas untuk Timbangan API
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
 from uuid import UUID
 
+# Batas kolom Numeric(10, 2) di tabel timbangan
+NUMERIC_MAX = 100_000_000
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Datetime dengan zona waktu -> UTC tanpa zona waktu
+
+    Kolom tanggalwaktu adalah ``timestamp without time zone`` berisi UTC
+    (asyncpg menolak nilai aware). Nilai naive dianggap sudah UTC.
+    Raise ValueError jika hasil konversi di luar rentang datetime.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    try:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    except OverflowError as exc:
+        raise ValueError("datetime di luar rentang setelah dikonversi ke UTC") from exc
+
 
 class TimbanganBase(BaseModel):
     """Base schema dengan semua field yang diperlukan"""
     nopol: str = Field(..., min_length=1, max_length=20, description="Nomor plat nomor kendaraan")
     sopir: str = Field(..., min_length=1, max_length=100, description="Nama sopir/pengemudi")
-    gross: float = Field(..., gt=0, description="Berat kotor (gross) dalam kg")
-    nett: float = Field(..., gt=0, description="Berat bersih (nett) dalam kg")
+    gross: float = Field(..., gt=0, lt=NUMERIC_MAX, description="Berat kotor (gross) dalam kg")
+    nett: float = Field(..., gt=0, lt=NUMERIC_MAX, description="Berat bersih (nett) dalam kg")
     petugas: str = Field(..., min_length=1, max_length=100, description="Nama petugas yang mencatat")
-    rate: Optional[float] = Field(None, ge=0, description="Tarif/harga per unit peso")
+    rate: Optional[float] = Field(None, ge=0, lt=NUMERIC_MAX, description="Tarif/harga per unit peso")
     catatan: Optional[str] = Field(None, description="Catatan tambahan")
 
 
 class TimbanganCreate(TimbanganBase):
     """Schema untuk create timbangan"""
-    tanggalwaktu: Optional[datetime] = Field(None, description="Waktu pencatatan pembacaan (opsional, default sekarang)")
+    tanggalwaktu: Optional[datetime] = Field(None, description="Waktu pencatatan pembacaan (opsional, default sekarang; disimpan sebagai UTC)")
+
+    @field_validator("tanggalwaktu")
+    @classmethod
+    def _tanggalwaktu_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return to_naive_utc(value)
 
 
 class TimbanganUpdate(BaseModel):
     """Schema untuk update timbangan"""
     nopol: Optional[str] = Field(None, max_length=20)
     sopir: Optional[str] = Field(None, max_length=100)
-    gross: Optional[float] = Field(None, gt=0)
-    nett: Optional[float] = Field(None, gt=0)
-    rate: Optional[float] = Field(None, ge=0)
+    gross: Optional[float] = Field(None, gt=0, lt=NUMERIC_MAX)
+    nett: Optional[float] = Field(None, gt=0, lt=NUMERIC_MAX)
+    rate: Optional[float] = Field(None, ge=0, lt=NUMERIC_MAX)
     petugas: Optional[str] = Field(None, max_length=100)
     catatan: Optional[str] = None
 
+    # Kolom NOT NULL: boleh tidak dikirim, tetapi tidak boleh null
+    @field_validator("nopol", "sopir", "gross", "nett", "petugas")
+    @classmethod
+    def _not_null(cls, value):
+        if value is None:
+            raise ValueError("tidak boleh null")
+        return value
+
 
 class TimbanganResponse(TimbanganBase):
     """Schema untuk response timbangan (dari database)"""
@@ -56,6 +88,37 @@ class TimbanganListResponse(BaseModel):
     data: list[TimbanganResponse]
 
 
+class TimbanganCursorResponse(BaseModel):
+    """Schema untuk list timbangan dengan keyset (cursor) pagination"""
+    limit: int = Field(..., description="Jumlah records maksimal per halaman")
+    next_cursor: Optional[str] = Field(None, description="Cursor halaman berikutnya (lebih lama); null jika sudah habis")
+    prev_cursor: Optional[str] = Field(None, description="Cursor halaman sebelumnya (lebih baru); null di halaman pertama")
+    estimated_total: Optional[int] = Field(None, description="Perkiraan total records dari statistik planner (hanya jika estimate=true)")
+    data: list[TimbanganResponse]
+
+
+class TimbanganBulkItem(BaseModel):
+    """Baris bulk yang tersimpan (index = posisi di request)"""
+    index: int
+    uuid: UUID
+    no_urut: int
+
+
+class TimbanganBulkError(BaseModel):
+    """Baris bulk yang ditolak beserta error validasinya"""
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class TimbanganBulkResponse(BaseModel):
+    """Hasil bulk insert: baris tersimpan dan error per baris"""
+    inserted: int = Field(..., description="Jumlah baris tersimpan")
+    failed: int = Field(..., description="Jumlah baris ditolak")
+    method: Optional[str] = Field(None, description="insert (multi-row INSERT ... RETURNING) atau copy (PostgreSQL COPY)")
+    data: List[TimbanganBulkItem]
+    errors: List[TimbanganBulkError]
+
+
 class TimbanganSummary(BaseModel):
     """Schema untuk summary statistik timbangan"""
     total_records: int
@@ -0,0 +1,83 @@
+"""
+Proses akuisisi: satu-satunya pemilik port serial untuk uvicorn multi-worker
+
+Membuat koneksi timbangan dari Settings (SCALE_* / SCALES) seperti mode
+biasa, lalu menulis status, pembacaan terakhir dan riwayat setiap
+timbangan ke shared memory (services.shared_state). Worker uvicorn dengan
+``SCALE_ACQUISITION=shared`` membaca segmen tersebut.
+
+Usage:
+    python -m services.acquisition
+    SCALE_ACQUISITION=shared uvicorn main:app --workers 4
+"""
+
+import asyncio
+import signal
+import threading
+import logging
+from typing import List, Tuple
+
+from services.scale_manager import ScaleManager, build_scale_manager
+from services.shared_state import ScaleSegment, SharedReadingHistory, segment_name
+
+logger = logging.getLogger(__name__)
+
+# Status tanpa frame baru (connect/disconnect, reconnect) disinkronkan berkala
+STATUS_SYNC_S = 0.1
+
+
+def attach_shared_state(manager: ScaleManager, prefix: str) -> List[Tuple[ScaleSegment, SharedReadingHistory]]:
+    """Pindahkan riwayat setiap koneksi ke shared memory dan publikasikan setiap chunk"""
+    attached = []
+    for scale_id, connection in manager.scales.items():
+        segment = ScaleSegment.create(
+            segment_name(prefix, scale_id),
+            connection.history.capacity,
+            connection.instance_tag,
+        )
+        history = SharedReadingHistory(segment)
+        connection.history = history
+        connection.on_chunk = segment.publish
+        segment.publish(connection)
+        attached.append((segment, history))
+        logger.info(f"Publishing scale '{scale_id}' to shared memory {segment.name}")
+    return attached
+
+
+def run(settings) -> None:
+    """Jalankan akuisisi sampai SIGINT/SIGTERM"""
+    manager = build_scale_manager(settings, acquisition="inprocess")
+    attached = attach_shared_state(manager, settings.scale_shm_prefix)
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    async def main():
+        # The asyncio transport needs a running loop; thread transport ignores it
+        manager.start_all()
+        connections = list(zip(manager.scales.values(), attached))
+        while not stop.is_set():
+            for connection, (segment, _) in connections:
+                segment.publish(connection)
+            await asyncio.sleep(STATUS_SYNC_S)
+        manager.stop_all()
+
+    try:
+        asyncio.run(main())
+    finally:
+        for connection in manager.scales.values():
+            connection.on_chunk = None
+        for segment, history in attached:
+            history.release()
+            segment.close()
+        logger.info("Acquisition stopped")
+
+
+if __name__ == "__main__":
+    from config import settings
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    run(settings)
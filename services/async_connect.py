@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+import logging
+from typing import Optional
+
+from services.connect import ScaleConnection
+
+logger = logging.getLogger(__name__)
+
+# Status refresh while the port is quiet (raw rate decay, poll mode)
+STATUS_REFRESH_S = 1.0
+
+
+class AsyncScaleConnection(ScaleConnection):
+    """
+    Koneksi timbangan berbasis asyncio
+
+    File descriptor serial didaftarkan ke event loop dengan
+    ``loop.add_reader``, sedangkan polling dan reconnect berjalan sebagai
+    task di loop yang sama dengan route FastAPI. Tidak ada thread tambahan
+    dan data diproses segera saat tersedia (tanpa read timeout).
+    Hanya untuk POSIX; Windows memakai transport thread.
+    """
+
+    # Non-blocking port; reads are driven by fd readiness
+    read_timeout: Optional[float] = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connection_task: Optional[asyncio.Task] = None
+        self._reader_fd: Optional[int] = None
+        self._disconnected: Optional[asyncio.Future] = None
+
+    # =========================
+    # Event Loop Callbacks
+    # =========================
+
+    def _on_readable(self):
+        """Drain the serial fd when the event loop reports it readable"""
+        received_ns = time.monotonic_ns()
+        try:
+            chunk = os.read(self._reader_fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_lost(e)
+            return
+
+        if not chunk:
+            self._on_lost(EOFError("serial port closed"))
+            return
+
+        if self.capture:
+            self.capture.write(chunk, received_ns)
+        try:
+            self._process_chunk(chunk, received_ns)
+        except Exception as e:
+            logger.error(f"Read error: {e}")
+
+    def _on_lost(self, exc: BaseException):
+        """Mark connection lost and wake up the connection task"""
+        logger.error(f"Read error: {exc}")
+        self.is_connected = False
+        self._publish_status()
+        if self._disconnected and not self._disconnected.done():
+            self._disconnected.set_result(None)
+
+    def _remove_reader(self):
+        if self._reader_fd is not None and self.loop is not None:
+            self.loop.remove_reader(self._reader_fd)
+            self._reader_fd = None
+
+    # =========================
+    # Tasks
+    # =========================
+
+    async def _poll_task(self):
+        """Send poll commands as decided by the poll scheduler"""
+        scheduler = self.poll_scheduler
+        scheduler.reset(time.monotonic())
+        while not self.is_shutting_down and self.ser and self.ser.is_open:
+            cmd, wait = scheduler.next_poll(time.monotonic())
+            if cmd is not None:
+                try:
+                    self.ser.write(cmd)
+                    logger.debug("Sent poll command %r (%s)", cmd, scheduler.mode)
+                except Exception as e:
+                    logger.error(f"Poll error: {e}")
+                    break
+            await asyncio.sleep(wait)
+
+    async def _connect_task(self):
+        """Main connection task - reconnect automatically"""
+        while not self.is_shutting_down:
+            # Probing blocks on serial reads; keep it off the event loop
+            if await self.loop.run_in_executor(None, self._try_connect):
+                self.rx_buffer.clear()
+                self.filters.reset()
+                self.stability_detector.reset()
+                self.latency.new_session()
+                self._run_open = False
+                self._disconnected = self.loop.create_future()
+                self._reader_fd = self.ser.fileno()
+                self.loop.add_reader(self._reader_fd, self._on_readable)
+
+                poll_task = None
+                if self.enable_poll:
+                    poll_task = self.loop.create_task(self._poll_task())
+                try:
+                    while not self._disconnected.done():
+                        await asyncio.wait({self._disconnected}, timeout=STATUS_REFRESH_S)
+                        self._publish_status()
+                finally:
+                    self._remove_reader()
+                    if poll_task:
+                        poll_task.cancel()
+                    if self.ser and self.ser.is_open:
+                        self.ser.close()
+
+            if not self.is_shutting_down:
+                delay = self._reconnect_delay()
+                logger.info(f"Reconnect in {delay * 1000:.0f}ms...")
+                await asyncio.sleep(delay)
+
+    def _shutdown(self, sig=None, frame=None):
+        """Shutdown handler"""
+        self._remove_reader()
+        if self._disconnected and not self._disconnected.done():
+            self._disconnected.set_result(None)
+        if self.connection_task and not self.connection_task.done():
+            self.connection_task.cancel()
+        if self.capture:
+            self.capture.close()
+        super()._shutdown(sig, frame)
+
+    # =========================
+    # Public Interface
+    # =========================
+
+    def start(self):
+        """Start connection task on the running event loop"""
+        if self.connection_task is None or self.connection_task.done():
+            self.is_shutting_down = False
+            self.loop = asyncio.get_running_loop()
+            self.connection_task = self.loop.create_task(self._connect_task())
+            logger.info("Scale connection task started")
+
+    def stop(self):
+        """Stop connection"""
+        self._shutdown()
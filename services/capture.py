@@ -0,0 +1,283 @@
+"""
+Capture data serial mentah dan replay berbasis mmap
+
+Setiap chunk yang diterima dari port serial ditulis apa adanya ke log
+biner ringkas bersama timestamp monotonic saat diterima. File dirotasi
+secara berkala (waktu dan ukuran) dan hanya N file terakhir yang
+disimpan. Replay memetakan file dengan mmap dan mengumpankan chunk yang
+sama ke parser + pipeline ScaleConnection, secara real time atau
+secepat mungkin (korpus regresi dan benchmark parser).
+
+Format file::
+
+    header : magic "SCALECAP" | version u16 | reserved u16 | wall_ns u64 | mono_ns u64
+    record : mono_ns u64 | length u32 | data[length]
+
+Usage:
+    python -m services.capture info captures/default-20240101-000000.scap
+    python -m services.capture replay captures/*.scap [--speed 1] [--print]
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import struct
+import sys
+import time
+import logging
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from services.pubsub import ReadingHub
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SCALECAP"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQQ")
+RECORD = struct.Struct("<QI")
+SUFFIX = ".scap"
+
+
+class CaptureWriter:
+    """
+    Penulis log capture dengan rotasi
+
+    Args:
+        directory: Folder tujuan file capture
+        prefix: Awalan nama file (biasanya scale_id)
+        rotate_s: Buat file baru setiap N detik (0 = tidak berdasarkan waktu)
+        max_bytes: Buat file baru jika ukuran melebihi N byte (0 = tanpa batas)
+        keep: Jumlah file terakhir yang disimpan (0 = simpan semua)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "default",
+        rotate_s: int = 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+        keep: int = 24,
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.rotate_ns = rotate_s * 1_000_000_000
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.path: Optional[str] = None
+        self._file = None
+        self._opened_ns = 0
+        self._flushed_ns = 0
+        self._size = 0
+
+    def _open(self, now_ns: int):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}-{stamp}{SUFFIX}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{counter}{SUFFIX}")
+            counter += 1
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, time.time_ns(), now_ns))
+        self.path = path
+        self._opened_ns = self._flushed_ns = now_ns
+        self._size = HEADER.size
+        logger.info(f"Capturing raw serial data to {path}")
+        self._prune()
+
+    def _prune(self):
+        if self.keep <= 0:
+            return
+        files = sorted(
+            glob.glob(os.path.join(self.directory, f"{glob.escape(self.prefix)}-*{SUFFIX}")),
+            key=os.path.getmtime,
+        )
+        for old in files[:-self.keep]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                logger.warning(f"Cannot remove old capture {old}: {e}")
+
+    def write(self, chunk: bytes, now_ns: int):
+        """Tambahkan satu chunk dengan timestamp monotonic (ns) saat diterima"""
+        if self._file is None:
+            self._open(now_ns)
+        elif (
+            (self.rotate_ns and now_ns - self._opened_ns >= self.rotate_ns)
+            or (self.max_bytes and self._size >= self.max_bytes)
+        ):
+            self.close()
+            self._open(now_ns)
+
+        self._file.write(RECORD.pack(now_ns, len(chunk)))
+        self._file.write(chunk)
+        self._size += RECORD.size + len(chunk)
+        # Bound what a crash can lose without flushing every chunk
+        if now_ns - self._flushed_ns >= 1_000_000_000:
+            self._file.flush()
+            self._flushed_ns = now_ns
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CaptureReader:
+    """Baca file capture lewat mmap tanpa menyalin seluruh file ke memori"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Not a scale capture file: {path}")
+        magic, version, _, self.wall_ns, self.mono_ns = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a scale capture file: {path}")
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        """Yield (mono_ns, data) per chunk langsung dari mmap"""
+        buf = self._mmap
+        offset = HEADER.size
+        end = len(buf)
+        unpack_from = RECORD.unpack_from
+        while offset + RECORD.size <= end:
+            ts, length = unpack_from(buf, offset)
+            if offset + RECORD.size + length > end:
+                break
+            offset += RECORD.size
+            yield ts, buf[offset:offset + length]
+            offset += length
+        # Anything left over is a record cut off by a crash
+        self.truncated = offset != end
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ReplayHub(ReadingHub):
+    """Reading hub that also counts readings and hands them to a callback"""
+
+    def __init__(self, on_reading=None):
+        super().__init__()
+        self.on_reading = on_reading
+        self.published = 0
+
+    def publish(self, reading):
+        self.published += 1
+        if self.on_reading is not None:
+            self.on_reading(reading)
+        super().publish(reading)
+
+
+def replay(
+    paths: List[str],
+    connection=None,
+    speed: float = 0.0,
+    on_reading=None,
+) -> dict:
+    """
+    Umpankan file capture ke ``connection._process_chunk``
+
+    Setiap chunk membawa timestamp saat diterima aslinya, sehingga ``ts``
+    pembacaan dan deteksi stabil sama seperti saat capture berapa pun
+    kecepatan replay. ``speed`` 0 = secepat mungkin, 1 = real time, 2 =
+    dua kali lebih cepat.
+    ``on_reading`` dipanggil dengan setiap pembacaan yang dihasilkan.
+    Kembalikan statistik (chunks, bytes, frames, readings, detik).
+    """
+    if connection is None:
+        from services.connect import ScaleConnection
+        connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=1)
+    hub = connection.hub = _ReplayHub(on_reading)
+
+    stats = {"files": 0, "chunks": 0, "bytes": 0, "frames": 0, "readings": 0, "truncated": 0}
+    start = time.perf_counter()
+    packets_before = connection.packet_count
+    for path in paths:
+        with CaptureReader(path) as reader:
+            stats["files"] += 1
+            first_ns = None
+            replay_start = time.perf_counter()
+            connection.rx_buffer.clear()
+            for ts, data in reader:
+                if speed > 0:
+                    if first_ns is None:
+                        first_ns = ts
+                    delay = (ts - first_ns) / 1e9 / speed - (time.perf_counter() - replay_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                # Recorded receive time: stability windows, run timestamps
+                # and frame intervals follow the capture, not the replay speed
+                connection._process_chunk(data, ts, (reader.wall_ns + ts - reader.mono_ns) / 1e9)
+                stats["chunks"] += 1
+                stats["bytes"] += len(data)
+            stats["truncated"] += reader.truncated
+    stats["frames"] = connection.packet_count - packets_before
+    stats["readings"] = hub.published
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay raw scale captures")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info = sub.add_parser("info", help="Show capture file summary")
+    info.add_argument("paths", nargs="+")
+
+    play = sub.add_parser("replay", help="Feed captures through the parser and filter pipeline")
+    play.add_argument("paths", nargs="+")
+    play.add_argument("--speed", type=float, default=0.0, help="0 = max speed, 1 = real time")
+    play.add_argument("--dialects", default="sgw3015p,lenient")
+    play.add_argument("--filters", default="")
+    play.add_argument("--print", action="store_true", help="Print every reading as JSON")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        for path in args.paths:
+            with CaptureReader(path) as reader:
+                chunks = size = 0
+                first = last = None
+                for ts, data in reader:
+                    chunks += 1
+                    size += len(data)
+                    first = ts if first is None else first
+                    last = ts
+                started = datetime.fromtimestamp(reader.wall_ns / 1e9).isoformat()
+                span = (last - first) / 1e9 if chunks else 0.0
+                print(f"{path}: started {started}, {chunks} chunks, {size} bytes, {span:.1f} s"
+                      f"{' (truncated)' if reader.truncated else ''}")
+        return
+
+    from services.connect import ScaleConnection
+    connection = ScaleConnection(
+        handle_signals=False,
+        enable_poll=False,
+        dialects=args.dialects,
+        filters=args.filters,
+    )
+    on_reading = (lambda reading: print(connection.hub.encode(reading))) if args.print else None
+    stats = replay(args.paths, connection, speed=args.speed, on_reading=on_reading)
+    seconds = stats["seconds"] or 1e-9
+    print(
+        f"{stats['files']} file(s), {stats['chunks']:,} chunks, {stats['bytes']:,} bytes, "
+        f"{stats['frames']:,} frames, {stats['readings']:,} readings in {seconds:.3f} s "
+        f"({stats['frames'] / seconds:,.0f} frames/s, {stats['bytes'] / seconds / 1e6:.2f} MB/s)"
+        f"{', truncated records: ' + str(stats['truncated']) if stats['truncated'] else ''}",
+        file=sys.stderr if args.print else sys.stdout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,132 @@
 import serial
 import sys
+import asyncio
 import time
 import json
 import signal
 import threading
-from datetime import datetime
-from typing import Optional, Dict, Any
-import re
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Union
 import logging
 
+from services.frame_parser import FrameParser
+from services.rx_buffer import RxBuffer, SEVEN_BIT_MASK
+from services.pubsub import ReadingHub
+from services.port_state import SERIAL_FIELDS, load_port_config, save_port_config
+from services.poll_scheduler import PollScheduler
+from services.history import ReadingHistory
+from services.filters import FilterPipeline
+from services.capture import CaptureWriter
+from services.reading import Reading
+from services.latency import AcquisitionLatency, LatencyHistogram
+from services.status import ScaleStatus, StatusSnapshot
+
 logger = logging.getLogger(__name__)
 
+_default_parser = FrameParser()
+
+# Histogram buckets for _try_connect (probing can take several seconds)
+CONNECT_BOUNDS_US = (
+    10_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 30_000_000, 60_000_000,
+)
+
+
+class StabilityDetector:
+    """
+    Deteksi berat stabil dari jendela waktu bergulir
+    
+    Berat dinyatakan stabil (``settled``) jika sampel dalam ``duration_ms``
+    terakhir semuanya berada dalam ``tolerance`` dari rata-rata jendela dan
+    standar deviasinya tidak lebih dari ``max_std`` (0 = tanpa batas std):
+    lonjakan tunggal ditangkap max deviation, noise merata oleh std.
+    Rata-rata dan varians dihitung inkremental (Welford dengan
+    penambahan/penghapusan), min/max dengan deque monoton, sehingga
+    biaya per sampel O(1) amortized berapa pun ukuran jendela.
+    Tidak bergantung pada flag ST/US indikator yang sering berkedip.
+    """
+    
+    def __init__(self, tolerance: float = 5.0, duration_ms: int = 1000, max_std: float = 2.5):
+        self.tolerance = tolerance
+        self.duration = duration_ms / 1000
+        self.max_std = max_std
+        self.reset()
+    
+    def reset(self):
+        self._window = deque()   # (t, weight)
+        self._max = deque()      # decreasing weights
+        self._min = deque()      # increasing weights
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.settled = False
+    
+    def _remove_oldest(self):
+        t, x = self._window.popleft()
+        n = len(self._window)
+        if n == 0:
+            self._mean = self._m2 = 0.0
+        else:
+            delta = x - self._mean
+            self._mean -= delta / n
+            self._m2 = max(self._m2 - delta * (x - self._mean), 0.0)
+        if self._max[0] == x:
+            self._max.popleft()
+        if self._min[0] == x:
+            self._min.popleft()
+    
+    def update(self, t: float, x: float) -> bool:
+        """Add a sample (t in monotonic seconds) and return the settled state"""
+        window = self._window
+        window.append((t, x))
+        delta = x - self._mean
+        self._mean += delta / len(window)
+        self._m2 += delta * (x - self._mean)
+        while self._max and self._max[-1] < x:
+            self._max.pop()
+        self._max.append(x)
+        while self._min and self._min[-1] > x:
+            self._min.pop()
+        self._min.append(x)
+        
+        # Keep exactly one sample at or before the window start so the
+        # window is known to cover the full duration
+        cutoff = t - self.duration
+        while len(window) > 1 and window[1][0] <= cutoff:
+            self._remove_oldest()
+        
+        self.settled = (
+            window[0][0] <= cutoff
+            and self.max_deviation <= self.tolerance
+            and (not self.max_std or self.stddev <= self.max_std)
+        )
+        return self.settled
+    
+    @property
+    def mean(self) -> float:
+        return self._mean
+    
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the window samples"""
+        n = len(self._window)
+        return (self._m2 / n) ** 0.5 if n else 0.0
+    
+    @property
+    def max_deviation(self) -> float:
+        """Largest distance of a window sample from the window mean"""
+        if not self._window:
+            return 0.0
+        return max(self._max[0] - self._mean, self._mean - self._min[0])
+
 
 class ScaleConnection:
     """
     Koneksi ke timbangan SGW-3015P via serial port
     """
     
+    # Blocking read timeout (seconds) used by the thread transport
+    read_timeout: Optional[float] = 1
+    
     def __init__(
         self,
         port: str = "COM3",
@@ -27,7 +137,27 @@ class ScaleConnection:
         reconnect_ms: int = 3000,
         poll_ms: int = 1000,
         enable_poll: bool = True,
+        dialects: str = "sgw3015p,lenient",
+        scale_id: str = "default",
+        handle_signals: bool = True,
+        probe_ms: int = 1500,
+        reconnect_max_ms: int = 30000,
+        state_file: str = "",
+        poll_min_ms: int = 100,
+        history_size: int = 30000,
+        stable_tolerance: float = 5.0,
+        stable_duration_ms: int = 1000,
+        stable_max_std: float = 2.5,
+        filters: str = "",
+        capture_dir: str = "",
+        capture_rotate_s: int = 3600,
+        capture_max_mb: int = 64,
+        capture_keep: int = 24,
+        coalesce: bool = True,
     ):
+        self.scale_id = scale_id
+        # Distinguishes packet numbers of this instance from a previous run (ETag)
+        self.instance_tag = f"{scale_id}-{time.time_ns():x}"
         self.base_config = {
             "port": port,
             "baudrate": baudrate,
@@ -37,25 +167,71 @@ class ScaleConnection:
         }
         
         self.reconnect_ms = reconnect_ms
+        self.reconnect_max_ms = max(reconnect_ms, reconnect_max_ms)
+        self.probe_ms = probe_ms
+        self.state_file = state_file
         self.poll_ms = poll_ms
         self.enable_poll = enable_poll
         self.poll_commands = [b"\r", b"\n", b"SI\r\n", b"S\r\n"]
+        self.poll_scheduler = PollScheduler(self.poll_commands, poll_ms=poll_ms, min_poll_ms=poll_min_ms)
+        self.frame_parser = FrameParser.from_spec(dialects)
+        self.filters = FilterPipeline.from_spec(filters)
+        # Collapse identical consecutive frames into one reading (repeat/last_ts)
+        self.coalesce = coalesce
         
         self.ser = None
         self.packet_count = 0
         self.active_config = None
-        self.rx_buffer = ""
+        self.config_verified = False
+        self.reconnect_count = 0
+        # Parse failures by reason (FrameParser.failure_reason) and _try_connect duration
+        self.parse_failures: Dict[str, int] = {}
+        self.connect_time = {
+            "ok": LatencyHistogram(CONNECT_BOUNDS_US),
+            "failed": LatencyHistogram(CONNECT_BOUNDS_US),
+        }
+        self._backoff_ms = reconnect_ms
+        self._session_start_packet = 0
+        self.rx_buffer = RxBuffer()
         self.is_shutting_down = False
         self.is_connected = False
-        self.last_reading: Optional[Dict[str, Any]] = None
+        self.last_reading: Optional[Reading] = None
+        self.run_count = 0
+        self._run_open = False
+        self._raw_rate = 0.0
+        # Rate window in the clock of the frames: process monotonic when
+        # live, the recorded receive clock during replay
+        self._rate_live = True
+        self._rate_mark = time.monotonic()
+        self._rate_last = self._rate_mark
+        self._rate_packets = 0
+        self.hub = ReadingHub()
+        self.history = ReadingHistory(history_size)
+        self.latency = AcquisitionLatency()
+        self.stability_detector = StabilityDetector(stable_tolerance, stable_duration_ms, stable_max_std)
+        # Optional raw serial capture (replay with: python -m services.capture replay)
+        self.capture: Optional[CaptureWriter] = None
+        if capture_dir:
+            self.capture = CaptureWriter(
+                capture_dir,
+                prefix=scale_id,
+                rotate_s=capture_rotate_s,
+                max_bytes=capture_max_mb * 1024 * 1024,
+                keep=capture_keep,
+            )
         self.connection_thread = None
+        # Called after every processed chunk (e.g. shared memory publisher)
+        self.on_chunk: Optional[Callable[["ScaleConnection"], None]] = None
+        # Immutable status for readers; replaced (never mutated) by _publish_status.
+        # Reentrant: the SIGINT/SIGTERM handler publishes on whatever thread it interrupts
+        self._status_lock = threading.RLock()
+        self._status_version = 0
+        self.status_snapshot: StatusSnapshot
+        self._publish_status()
         
-        signal.signal(signal.SIGINT, self._shutdown)
-        signal.signal(signal.SIGTERM, self._shutdown)
-
-
-        signal.signal(signal.SIGINT, self._shutdown)
-        signal.signal(signal.SIGTERM, self._shutdown)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._shutdown)
+            signal.signal(signal.SIGTERM, self._shutdown)
     
     # =========================
     # Helpers
@@ -64,59 +240,15 @@ class ScaleConnection:
     @staticmethod
     def normalize_serial_chunk(chunk: bytes) -> str:
         """Normalize serial chunk - clear non-ASCII bits"""
-        return bytes([b & 0x7F for b in chunk]).decode("ascii", errors="ignore")
+        return chunk.translate(SEVEN_BIT_MASK).decode("ascii")
     
     @staticmethod
-    def parse_scale_line(line: str) -> Optional[Dict[str, Any]]:
+    def parse_scale_line(line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
         """Parse timbangan reading from serial line"""
-        cleaned = line.strip()
-        
-        # Strict format: ST/US, NT/GS, value, unit (e.g., "ST,NT,1234.56kg")
-        strict = re.match(
-            r"^([A-Z]{2}),([A-Z]{2}),([+-]?\d+(?:\.\d+)?)\.?(kg|Kg|KG|g|G|lb|LB)$",
-            cleaned
-        )
-        if strict:
-            stability, mode, value_raw, unit_raw = strict.groups()
-            value = float(value_raw)
-            return {
-                "raw": cleaned,
-                "stability": stability,
-                "mode": mode,
-                "value": value,
-                "unit": unit_raw.lower(),
-                "stable": stability == "ST"
-            }
-        
-        # Lenient parsing - extract numbers and units
-        ascii_only = re.sub(r"[^A-Za-z0-9+.\-]", "", cleaned)
-        value_match = re.search(r"([+-]?\d+(?:\.\d+)?)", ascii_only)
-        if not value_match:
-            return None
-        
-        value = float(value_match.group(1))
-        upper = ascii_only.upper()
-        
-        stability = "ST" if "ST" in upper else ("US" if "US" in upper else None)
-        mode = "NT" if "NT" in upper else ("GS" if "GS" in upper else None)
-        
-        if "KG" in upper:
-            unit = "kg"
-        elif "LB" in upper:
-            unit = "lb"
-        elif "G" in upper:
-            unit = "g"
-        else:
-            unit = "kg"
-        
-        return {
-            "raw": cleaned,
-            "stability": stability,
-            "mode": mode,
-            "value": value,
-            "unit": unit,
-            "stable": stability == "ST"
-        }
+        if isinstance(line, str):
+            line = line.encode("ascii", errors="ignore")
+        parsed = _default_parser.parse(line)
+        return parsed._asdict() if parsed else None
     
     @staticmethod
     def build_candidates(base: Dict[str, Any]) -> list:
@@ -146,40 +278,133 @@ class ScaleConnection:
     # =========================
     
     def _poll_loop(self):
-        """Send polling commands periodically"""
-        index = 0
+        """Send poll commands as decided by the poll scheduler"""
+        scheduler = self.poll_scheduler
+        scheduler.reset(time.monotonic())
         while not self.is_shutting_down and self.ser and self.ser.is_open:
-            cmd = self.poll_commands[index % len(self.poll_commands)]
-            index += 1
-            try:
-                self.ser.write(cmd)
-                logger.debug(f"Sent poll command {index % len(self.poll_commands)}")
-            except Exception as e:
-                logger.error(f"Poll error: {e}")
-                break
-            time.sleep(self.poll_ms / 1000)
+            cmd, wait = scheduler.next_poll(time.monotonic())
+            if cmd is not None:
+                try:
+                    self.ser.write(cmd)
+                    logger.debug("Sent poll command %r (%s)", cmd, scheduler.mode)
+                except Exception as e:
+                    logger.error(f"Poll error: {e}")
+                    break
+            time.sleep(wait)
     
     # =========================
     # Connection Logic
     # =========================
     
+    def _open_serial(self, cfg: Dict[str, Any], timeout: Optional[float] = None) -> serial.Serial:
+        """Open serial port with the given config"""
+        return serial.Serial(
+            port=cfg["port"],
+            baudrate=cfg["baudrate"],
+            bytesize=cfg["bytesize"],
+            stopbits=cfg["stopbits"],
+            parity=cfg["parity"],
+            timeout=self.read_timeout if timeout is None else timeout
+        )
+    
+    def _probe(self, cfg: Dict[str, Any]) -> float:
+        """Listen on a candidate config and score it by parse success rate
+        
+        Only frames accepted by a strict dialect count (FrameParser.verifies):
+        the lenient fallback also "parses" line noise from a wrong baud rate
+        or parity. Returns verified_frames / frames (0.0 when nothing
+        verifiable arrived). Raises if the port cannot be opened.
+        """
+        rx_buffer = RxBuffer()
+        frames = parsed = 0
+        deadline = time.monotonic() + self.probe_ms / 1000
+        
+        ser = self._open_serial(cfg, timeout=0.05)
+        try:
+            if self.enable_poll:
+                # Request/response indicators only talk when polled
+                for cmd in self.poll_commands:
+                    ser.write(cmd)
+            while time.monotonic() < deadline and not self.is_shutting_down:
+                for line in rx_buffer.feed(ser.read(256)):
+                    frames += 1
+                    parsed += self.frame_parser.verifies(line)
+                if parsed >= 3 and parsed == frames:
+                    # Clean frames already; no need to wait for the full window
+                    break
+        finally:
+            ser.close()
+        
+        score = parsed / frames if frames else 0.0
+        logger.info(f"Probe {cfg['port']} @ {cfg['baudrate']} {cfg['bytesize']}{cfg['parity']}{cfg['stopbits']}: "
+                    f"{parsed}/{frames} frames verified")
+        return score
+    
+    def _ordered_candidates(self) -> list:
+        """Serial config candidates, last verified config (state file) first"""
+        candidates = self.build_candidates(self.base_config)
+        cached = load_port_config(self.state_file, self.base_config["port"])
+        if cached is None:
+            return candidates
+        
+        def key(c):
+            return tuple(c[field] for field in SERIAL_FIELDS)
+        
+        return [cached] + [c for c in candidates if key(c) != key(cached)]
+    
+    def _select_config(self, candidates: list) -> Optional[Dict[str, Any]]:
+        """Pick the candidate with the best probe score
+        
+        Stops at the first candidate whose frames all parse. If none produce
+        parseable frames (e.g. silent indicator), falls back to the first
+        candidate that could be opened.
+        """
+        best_cfg, best_score = None, 0.0
+        first_open = None
+        
+        for cfg in candidates:
+            if self.is_shutting_down:
+                return None
+            try:
+                score = self._probe(cfg)
+            except Exception as e:
+                logger.debug(f"Failed to connect with {cfg}: {e}")
+                continue
+            
+            first_open = first_open or cfg
+            if score > best_score:
+                best_cfg, best_score = cfg, score
+            if score >= 1.0:
+                break
+        
+        self.config_verified = best_cfg is not None
+        if best_cfg is not None:
+            save_port_config(self.state_file, best_cfg)
+            return best_cfg
+        return first_open
+    
     def _try_connect(self) -> bool:
         """Try connecting with different configurations"""
-        candidates = self.build_candidates(self.base_config)
+        started = time.monotonic_ns()
+        connected = self._connect_candidates()
+        self.connect_time["ok" if connected else "failed"].record(time.monotonic_ns() - started)
+        self._publish_status()
+        return connected
+    
+    def _connect_candidates(self) -> bool:
+        """Probe (if enabled) and open the first working configuration"""
+        candidates = self._ordered_candidates()
+        if self.probe_ms > 0:
+            selected = self._select_config(candidates)
+            candidates = [selected] if selected else []
         
         for cfg in candidates:
             try:
                 logger.info(f"Connecting to {cfg['port']} @ {cfg['baudrate']} baud...")
-                self.ser = serial.Serial(
-                    port=cfg["port"],
-                    baudrate=cfg["baudrate"],
-                    bytesize=cfg["bytesize"],
-                    stopbits=cfg["stopbits"],
-                    parity=cfg["parity"],
-                    timeout=1
-                )
+                self.ser = self._open_serial(cfg)
                 self.active_config = cfg
                 self.is_connected = True
+                self._session_start_packet = self.packet_count
                 logger.info(f"✓ Connected: {cfg['port']} @ {cfg['baudrate']} baud")
                 return True
             except Exception as e:
@@ -188,48 +413,166 @@ class ScaleConnection:
         self.is_connected = False
         return False
     
+    def _reconnect_delay(self) -> float:
+        """Exponential backoff (seconds) before the next connection attempt
+        
+        Resets to reconnect_ms once a session has delivered frames, so a
+        single cable glitch reconnects quickly while a dead port backs off.
+        """
+        if self.packet_count > self._session_start_packet:
+            self._backoff_ms = self.reconnect_ms
+            self._session_start_packet = self.packet_count
+        delay_ms = self._backoff_ms
+        self._backoff_ms = min(self._backoff_ms * 2, self.reconnect_max_ms)
+        self.reconnect_count += 1
+        self._publish_status()
+        return delay_ms / 1000
+    
+    def _process_chunk(
+        self,
+        chunk: bytes,
+        received_ns: Optional[int] = None,
+        received_wall: Optional[float] = None,
+    ):
+        """Feed raw serial bytes through the rx buffer and parse complete frames
+        
+        ``received_ns`` is ``time.monotonic_ns()`` taken when the chunk came
+        off the port; reading timestamps and latencies are measured from it.
+        Replay passes the recorded ``received_ns`` together with the recorded
+        wall clock ``received_wall`` (epoch seconds); receipt latency is then
+        not recorded since the recorded clock is not this process's.
+        """
+        mono_ns = time.monotonic_ns()
+        if received_ns is None:
+            received_ns = mono_ns
+        # Wall clock at receipt, not after parsing
+        if received_wall is None:
+            now = time.time() - (mono_ns - received_ns) / 1e9
+        else:
+            now = received_wall
+        live = received_wall is None
+        received = received_ns / 1e9
+        latency = self.latency
+        packets_before = self.packet_count
+        parsed_any = False
+        for line in self.rx_buffer.feed(chunk):
+            self.packet_count += 1
+            parsed = self.frame_parser.parse(line)
+            
+            if not parsed:
+                reason = self.frame_parser.failure_reason(line)
+                self.parse_failures[reason] = self.parse_failures.get(reason, 0) + 1
+                logger.debug("Unparsed line (%s): %r", reason, line)
+                continue
+            
+            parsed_ns = time.monotonic_ns()
+            if live:
+                latency.receipt_to_parse.record(parsed_ns - received_ns)
+            latency.on_frame(received_ns)
+            parsed_any = True
+            weight = self.filters(parsed.value) if self.filters else parsed.value
+            settled = self.stability_detector.update(received, weight)
+            
+            last = self.last_reading
+            if (
+                self._run_open
+                and last.raw == parsed.raw
+                and last.weight == weight
+                and last.settled == settled
+            ):
+                # Same frame again: extend the current run, nothing to publish
+                self.last_reading = last._replace(
+                    repeat=last.repeat + 1,
+                    last_ts=now,
+                    rx_ns=received_ns,
+                    pub_ns=time.monotonic_ns(),
+                )
+                self.history.extend_last(now)
+                continue
+            
+            # Update last reading
+            self.run_count += 1
+            self._run_open = self.coalesce
+            self.last_reading = Reading(
+                ts=now,
+                packet=self.packet_count,
+                stability=parsed.stability,
+                mode=parsed.mode,
+                stable=parsed.stable,
+                settled=settled,
+                weight=weight,
+                unit=parsed.unit,
+                raw=parsed.raw,
+                repeat=1,
+                last_ts=now,
+                rx_ns=received_ns,
+                pub_ns=time.monotonic_ns(),
+            )
+            self.history.append(now, self.packet_count, weight, parsed.stability, parsed.mode)
+            logger.debug("Reading: %s", self.last_reading)
+            self.hub.publish(self.last_reading)
+            latency.parse_to_publish.record(time.monotonic_ns() - parsed_ns)
+        
+        if parsed_any:
+            if self.enable_poll:
+                self.poll_scheduler.on_frame(received)
+            if live != self._rate_live or received < self._rate_mark:
+                # Switched between live and recorded clocks: restart the window
+                self._rate_live = live
+                self._rate_mark = received
+                self._rate_packets = packets_before
+            self._rate_last = received
+            if received - self._rate_mark >= 1.0:
+                self._raw_rate = (self.packet_count - self._rate_packets) / (received - self._rate_mark)
+                self._rate_mark = received
+                self._rate_packets = self.packet_count
+        
+        if self.packet_count != packets_before:
+            self._publish_status()
+        if self.on_chunk is not None:
+            self.on_chunk(self)
+    
+    def raw_rate(self) -> float:
+        """Raw frames per second, including frames folded into a run
+        
+        During replay "now" is the recorded time of the last frame, not
+        this process's monotonic clock.
+        """
+        now = time.monotonic() if self._rate_live else self._rate_last
+        elapsed = now - self._rate_mark
+        if elapsed >= 2.0:
+            # No frames rolled the window recently; decay towards zero
+            return (self.packet_count - self._rate_packets) / elapsed
+        return self._raw_rate
+    
     def _read_loop(self):
         """Read and parse serial data"""
+        self.rx_buffer.clear()
+        self.filters.reset()
+        self.stability_detector.reset()
+        self.latency.new_session()
+        self._run_open = False
         while self.ser and self.ser.is_open and not self.is_shutting_down:
             try:
-                chunk = self.ser.read(1024)
+                # Return as soon as data arrives so frame timing stays accurate
+                chunk = self.ser.read(self.ser.in_waiting or 1)
                 if not chunk:
+                    # Quiet port: refresh time-dependent fields (raw rate, poll mode)
+                    self._publish_status()
                     continue
                 
-                self.rx_buffer += self.normalize_serial_chunk(chunk)
-                parts = self.rx_buffer.splitlines(keepends=False)
-                
-                if not self.rx_buffer.endswith("\n"):
-                    self.rx_buffer = parts.pop() if parts else ""
-                
-                for line in parts:
-                    if not line.strip():
-                        continue
-                    
-                    self.packet_count += 1
-                    parsed = self.parse_scale_line(line)
-                    
-                    if not parsed:
-                        logger.debug(f"Unparsed line: {line.strip()}")
-                        continue
-                    
-                    # Update last reading
-                    self.last_reading = {
-                        "ts": datetime.utcnow().isoformat(),
-                        "type": "weight",
-                        "packet": self.packet_count,
-                        "stability": parsed["stability"],
-                        "mode": parsed["mode"],
-                        "stable": parsed["stable"],
-                        "weight": parsed["value"],
-                        "unit": parsed["unit"],
-                        "raw": parsed["raw"]
-                    }
-                    logger.debug(f"Reading: {self.last_reading}")
+                received_ns = time.monotonic_ns()
+                if self.capture:
+                    self.capture.write(chunk, received_ns)
+                self._process_chunk(chunk, received_ns)
             
             except Exception as e:
+                if self.is_shutting_down:
+                    # Port closed by stop() while blocked in read()
+                    break
                 logger.error(f"Read error: {e}")
                 self.is_connected = False
+                self._publish_status()
                 break
     
     def _connect_loop(self):
@@ -242,8 +585,13 @@ class ScaleConnection:
                 self._read_loop()
             
             if not self.is_shutting_down:
-                logger.info(f"Reconnect in {self.reconnect_ms}ms...")
-                time.sleep(self.reconnect_ms / 1000)
+                delay = self._reconnect_delay()
+                logger.info(f"Reconnect in {delay * 1000:.0f}ms...")
+                time.sleep(delay)
+        
+        # Closed here, on the thread that writes to it
+        if self.capture:
+            self.capture.close()
     
     def _shutdown(self, sig=None, frame=None):
         """Shutdown handler"""
@@ -252,6 +600,7 @@ class ScaleConnection:
         if self.ser and self.ser.is_open:
             self.ser.close()
         self.is_connected = False
+        self._publish_status()
     
     # =========================
     # Public Interface
@@ -260,6 +609,7 @@ class ScaleConnection:
     def start(self):
         """Start connection in background thread"""
         if self.connection_thread is None or not self.connection_thread.is_alive():
+            self.is_shutting_down = False
             self.connection_thread = threading.Thread(
                 target=self._connect_loop,
                 daemon=True
@@ -273,20 +623,109 @@ class ScaleConnection:
         if self.connection_thread:
             self.connection_thread.join(timeout=5)
     
-    def get_last_reading(self) -> Optional[Dict[str, Any]]:
+    def get_last_reading(self) -> Optional[Reading]:
         """Get last weight reading"""
         return self.last_reading
     
+    async def wait_for_reading(self, after: int, timeout: float) -> Optional[Reading]:
+        """Wait for a reading with packet number greater than ``after``
+        
+        Returns immediately if one is already available, otherwise blocks
+        on the reading hub until it arrives. Returns None on timeout.
+        """
+        reading = self.last_reading
+        if reading is not None and reading.packet > after:
+            return reading
+        
+        with self.hub.subscribe(policy="latest") as subscription:
+            # Re-check: a reading may have been published before subscribing
+            reading = self.last_reading
+            if reading is not None and reading.packet > after:
+                return reading
+            try:
+                while True:
+                    reading = await asyncio.wait_for(subscription.get(), timeout)
+                    if reading.packet > after:
+                        return reading
+            except asyncio.TimeoutError:
+                return None
+    
+    def _settled_now(self, reading: Optional[Reading]) -> bool:
+        """Settled reading from a connected port whose last frame is recent
+        
+        A settled flag older than the stability window says nothing about
+        the weight on the scale now (port quiet, cable pulled).
+        """
+        return (
+            reading is not None
+            and reading.settled
+            and self.is_connected
+            and time.monotonic_ns() - reading.rx_ns <= self.stability_detector.duration * 1e9
+        )
+    
+    async def wait_for_settled(self, timeout: float) -> Optional[Reading]:
+        """Wait for the first fresh reading the stability detector marks settled
+        
+        Returns the current reading right away if it is already settled,
+        the port is connected and its last frame arrived within the
+        stability window. Returns None on timeout.
+        """
+        reading = self.last_reading
+        if self._settled_now(reading):
+            return reading
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        with self.hub.subscribe() as subscription:
+            reading = self.last_reading
+            if self._settled_now(reading):
+                return reading
+            try:
+                while True:
+                    reading = await asyncio.wait_for(subscription.get(), deadline - loop.time())
+                    if self._settled_now(reading):
+                        return reading
+            except asyncio.TimeoutError:
+                return None
+    
+    def _publish_status(self):
+        """Build a new status snapshot and swap it in; readers never lock
+        
+        Called by the thread that changed the state (reader, event loop,
+        API thread on stop). The lock only orders concurrent writers so an
+        older snapshot cannot replace a newer one. It is reentrant because
+        the signal handler (``_shutdown``) may interrupt a publish on the
+        same thread; the interrupted publish then sees the version moved
+        on and rebuilds, so the shutdown state is not overwritten.
+        """
+        with self._status_lock:
+            while True:
+                self._status_version += 1
+                version = self._status_version
+                self.status_snapshot = StatusSnapshot(version, self._build_status())
+                if version == self._status_version:
+                    return
+    
     def get_status(self) -> Dict[str, Any]:
-        """Get connection status"""
-        return {
-            "connected": self.is_connected,
-            "port": self.base_config.get("port"),
-            "baudrate": self.base_config.get("baudrate"),
-            "active_config": self.active_config,
-            "packet_count": self.packet_count,
-            "last_reading": self.last_reading
-        }
+        """Get connection status (shared snapshot dict; do not modify)"""
+        return self.status_snapshot.status
+    
+    def _build_status(self) -> ScaleStatus:
+        """Current connection status values"""
+        return ScaleStatus(
+            self.scale_id,
+            self.is_connected,
+            self.base_config.get("port"),
+            self.base_config.get("baudrate"),
+            self.active_config,
+            self.config_verified,
+            self.reconnect_count,
+            self.packet_count,
+            self.run_count,
+            round(self.raw_rate(), 2),
+            self.poll_scheduler.get_status() if self.enable_poll else None,
+            self.last_reading,
+        )
     
     def get_available_ports(self) -> list:
         """List available serial ports"""
@@ -305,26 +744,24 @@ class ScaleConnection:
 
 
 # =========================
-# Global Instance
+# Factory
 # =========================
 
-_scale_connection: Optional[ScaleConnection] = None
+def create_scale_connection(transport: str = "thread", **kwargs) -> ScaleConnection:
+    """Create a scale connection for the given transport (thread | asyncio)"""
+    transport = transport.lower()
+    if transport == "asyncio":
+        if sys.platform == "win32":
+            logger.warning("Asyncio serial transport is not supported on Windows, using thread transport")
+        else:
+            from services.async_connect import AsyncScaleConnection
+            return AsyncScaleConnection(**kwargs)
+    elif transport != "thread":
+        raise ValueError(f"Unknown scale transport: {transport}")
+    return ScaleConnection(**kwargs)
 
 
 def get_scale_connection() -> ScaleConnection:
-    """Get or create global scale connection instance"""
-    global _scale_connection
-    if _scale_connection is None:
-        from config import settings
-        
-        _scale_connection = ScaleConnection(
-            port=getattr(settings, 'scale_port', 'COM3'),
-            baudrate=getattr(settings, 'scale_baudrate', 2400),
-            bytesize=getattr(settings, 'scale_bytesize', 8),
-            stopbits=getattr(settings, 'scale_stopbits', 1),
-            parity=getattr(settings, 'scale_parity', 'N'),
-            reconnect_ms=getattr(settings, 'scale_reconnect_ms', 3000),
-            poll_ms=getattr(settings, 'scale_poll_ms', 1000),
-            enable_poll=getattr(settings, 'scale_enable_poll', True),
-        )
-    return _scale_connection
+    """Get the default scale connection (first configured scale)"""
+    from services.scale_manager import get_scale_manager
+    return get_scale_manager().default
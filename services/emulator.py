@@ -0,0 +1,303 @@
+"""
+Emulator indikator timbangan di atas pseudo-terminal (pty)
+
+Emulator membuka pasangan pty dan berperilaku seperti indikator: sisi
+slave dibuka oleh ``ScaleConnection`` sebagai port serial biasa, sisi
+master ditulis frame oleh emulator. Mendukung output kontinu dengan laju
+tertentu, mode request/response (jawab perintah poll), noise berat,
+fragmentasi frame, sisipan byte sampah, pacing sesuai baudrate, dan
+putus koneksi berkala. Hanya Linux/macOS.
+
+Usage:
+    python -m services.emulator --rate 10 --link /tmp/vscale0
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+import tty
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# Frame Formats
+# =========================
+
+def format_sgw3015p(value: float, stable: bool, mode: str) -> bytes:
+    """Frame SGW-3015P, mis. ``ST,GS,1234.50kg`` (tanpa spasi, diterima dialect ketat)"""
+    return f"{'ST' if stable else 'US'},{mode},{value:.2f}kg\r\n".encode("ascii")
+
+
+def format_lenient(value: float, stable: bool, mode: str) -> bytes:
+    """Frame gaya indikator lain (hanya dikenali dialect lenient)"""
+    return f"{mode} {value:+010.1f} KG {'ST' if stable else 'US'}\r\n".encode("ascii")
+
+
+FORMATS = {
+    "sgw3015p": format_sgw3015p,
+    "lenient": format_lenient,
+}
+
+
+class ScaleEmulator:
+    """
+    Indikator timbangan virtual
+
+    Args:
+        rate_hz: Laju output kontinu (0 = hanya menjawab poll)
+        dialect: Format frame (``sgw3015p`` | ``lenient``)
+        weight: Berat dasar; bisa diubah saat berjalan
+        noise: Standar deviasi noise gaussian pada berat
+        respond_to: Perintah poll yang dijawab satu frame (None = abaikan poll)
+        fragment: Jika > 0, frame dipecah menjadi potongan 1..fragment byte
+        garbage: Peluang menyisipkan byte sampah sebelum frame
+        disconnect_every: Putuskan dan buat ulang pty setiap N detik (0 = tidak)
+        baudrate: Jika diisi, penulisan dijeda sesuai waktu transmisi serial
+        link: Path symlink stabil ke sisi slave (tetap sama setelah putus)
+        weight_fn: Fungsi ``seq -> berat`` pengganti ``weight``/``noise``
+        on_send: Callback ``(seq, frame, perf_counter)`` tepat sebelum frame ditulis
+    """
+
+    def __init__(
+        self,
+        rate_hz: float = 10.0,
+        dialect: str = "sgw3015p",
+        weight: float = 1000.0,
+        noise: float = 0.0,
+        mode: str = "GS",
+        respond_to: Optional[bytes] = None,
+        fragment: int = 0,
+        garbage: float = 0.0,
+        disconnect_every: float = 0.0,
+        baudrate: Optional[int] = None,
+        link: str = "",
+        seed: Optional[int] = None,
+        weight_fn: Optional[Callable[[int], float]] = None,
+        on_send: Optional[Callable[[int, bytes, float], None]] = None,
+    ):
+        if dialect not in FORMATS:
+            raise ValueError(f"Unknown emulator dialect: {dialect}")
+        self.rate_hz = rate_hz
+        self.format = FORMATS[dialect]
+        self.weight = weight
+        self.noise = noise
+        self.mode = mode
+        self.stable = True
+        self.respond_to = respond_to
+        self.fragment = fragment
+        self.garbage = garbage
+        self.disconnect_every = disconnect_every
+        self.byte_time = 10 / baudrate if baudrate else 0.0
+        self.link = link
+        self.weight_fn = weight_fn
+        self.on_send = on_send
+        self.rng = random.Random(seed)
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.polls_received = 0
+        self.disconnects = 0
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # =========================
+    # PTY Management
+    # =========================
+
+    def _open_pty(self):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        tty.setraw(slave)
+        self._master, self._slave = master, slave
+        if self.link:
+            tmp_link = f"{self.link}.tmp"
+            if os.path.lexists(tmp_link):
+                os.unlink(tmp_link)
+            os.symlink(os.ttyname(slave), tmp_link)
+            os.replace(tmp_link, self.link)
+
+    def _close_pty(self):
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    @property
+    def port(self) -> str:
+        """Path yang dibuka oleh ScaleConnection"""
+        return self.link or os.ttyname(self._slave)
+
+    def disconnect(self):
+        """Putuskan koneksi (reader mendapat EOF/EIO) lalu buat pty baru"""
+        with self._write_lock:
+            self._close_pty()
+            self.disconnects += 1
+            self._open_pty()
+        logger.info(f"Emulator reconnected as {self.port}")
+
+    # =========================
+    # Output
+    # =========================
+
+    def next_frame(self) -> bytes:
+        if self.weight_fn is not None:
+            value = self.weight_fn(self.frames_sent)
+        else:
+            value = self.weight + (self.rng.gauss(0.0, self.noise) if self.noise else 0.0)
+        return self.format(value, self.stable, self.mode)
+
+    def _write(self, data: bytes):
+        master = self._master
+        if master is None:
+            return
+        try:
+            os.write(master, data)
+        except OSError:
+            # Reader side gone (e.g. during disconnect); drop the data
+            return
+        self.bytes_sent += len(data)
+        if self.byte_time:
+            time.sleep(len(data) * self.byte_time)
+
+    def send_frame(self):
+        """Tulis satu frame (dengan sampah/fragmentasi sesuai konfigurasi)"""
+        with self._write_lock:
+            frame = self.next_frame()
+            seq = self.frames_sent
+            self.frames_sent += 1
+            if self.garbage and self.rng.random() < self.garbage:
+                self._write(bytes(self.rng.randrange(256) for _ in range(self.rng.randint(1, 16))))
+            if self.on_send is not None:
+                self.on_send(seq, frame, time.perf_counter())
+            if self.fragment > 0:
+                start = 0
+                while start < len(frame):
+                    end = start + self.rng.randint(1, self.fragment)
+                    self._write(frame[start:end])
+                    start = end
+            else:
+                self._write(frame)
+
+    # =========================
+    # Threads
+    # =========================
+
+    def _stream_loop(self):
+        interval = 1 / self.rate_hz
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            self.send_frame()
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Falling behind (e.g. baud pacing); don't burst to catch up
+                next_at = time.perf_counter()
+
+    def _poll_loop(self):
+        pending = b""
+        while not self._stop.is_set():
+            master = self._master
+            try:
+                data = os.read(master, 256) if master is not None else b""
+            except OSError:
+                data = b""
+            if not data:
+                self._stop.wait(0.01)
+                continue
+            pending += data
+            while self.respond_to in pending:
+                pending = pending.split(self.respond_to, 1)[1]
+                self.polls_received += 1
+                self.send_frame()
+            pending = pending[-len(self.respond_to):]
+
+    def _disconnect_loop(self):
+        while not self._stop.wait(self.disconnect_every):
+            self.disconnect()
+
+    def start(self) -> "ScaleEmulator":
+        self._stop.clear()
+        self._open_pty()
+        targets = []
+        if self.rate_hz > 0:
+            targets.append(self._stream_loop)
+        if self.respond_to:
+            targets.append(self._poll_loop)
+        if self.disconnect_every > 0:
+            targets.append(self._disconnect_loop)
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        with self._write_lock:
+            self._close_pty()
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+    def __enter__(self) -> "ScaleEmulator":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual scale indicator on a pty")
+    parser.add_argument("--rate", type=float, default=10.0, help="Continuous frames per second (0 = poll only)")
+    parser.add_argument("--dialect", choices=sorted(FORMATS), default="sgw3015p")
+    parser.add_argument("--weight", type=float, default=1000.0)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--respond-to", default="", help="Poll command to answer, e.g. 'SI\\r\\n'")
+    parser.add_argument("--fragment", type=int, default=0)
+    parser.add_argument("--garbage", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0)
+    parser.add_argument("--baudrate", type=int, default=None)
+    parser.add_argument("--link", default="", help="Stable symlink to the slave side")
+    args = parser.parse_args()
+
+    respond_to = args.respond_to.encode("ascii").decode("unicode_escape").encode("ascii") or None
+    emulator = ScaleEmulator(
+        rate_hz=args.rate,
+        dialect=args.dialect,
+        weight=args.weight,
+        noise=args.noise,
+        respond_to=respond_to,
+        fragment=args.fragment,
+        garbage=args.garbage,
+        disconnect_every=args.disconnect_every,
+        baudrate=args.baudrate,
+        link=args.link,
+    )
+    with emulator:
+        print(f"Emulating scale on {emulator.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(f"Sent {emulator.frames_sent} frames, {emulator.bytes_sent} bytes")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
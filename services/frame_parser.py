@@ -0,0 +1,305 @@
+"""
+Byte-level frame parser untuk indikator timbangan
+
+Parser bekerja langsung pada ``bytes`` tanpa regex di jalur utama. Format
+SGW-3015P (``ST,NT,1234.56kg``) dikenali state machine berbasis tabel
+transisi, sedangkan indikator lain bisa ditambahkan sebagai dialect.
+"""
+
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple, Type, Union
+
+
+class ParsedFrame(NamedTuple):
+    """Hasil parse satu frame timbangan"""
+    raw: str
+    stability: Optional[str]
+    mode: Optional[str]
+    value: float
+    unit: str
+    stable: bool
+
+
+# =========================
+# Lookup Tables
+# =========================
+
+_UNITS: Dict[bytes, str] = {
+    b"kg": "kg", b"Kg": "kg", b"KG": "kg",
+    b"g": "g", b"G": "g",
+    b"lb": "lb", b"LB": "lb",
+}
+_DIGITS = b"0123456789"
+
+# Bentuk frame: digit -> 0x00, byte di luar ASCII printable -> 0x01, sisanya
+# tetap. Frame dengan header, satuan dan susunan digit yang sama punya
+# bentuk yang sama, berapa pun nilainya.
+_SHAPE_DIGIT = 0x00
+_SHAPE = bytes(
+    _SHAPE_DIGIT if b in _DIGITS else (b if 0x20 <= b < 0x7F else 0x01)
+    for b in range(256)
+)
+
+# Kelas karakter bentuk untuk tabel transisi
+_UPPER, _DIGIT, _COMMA, _DOT, _SIGN, _OTHER = range(6)
+_CLASS = [_OTHER] * 256
+for _b in b"ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    _CLASS[_b] = _UPPER
+_CLASS[_SHAPE_DIGIT] = _DIGIT
+_CLASS[ord(",")] = _COMMA
+_CLASS[ord(".")] = _DOT
+_CLASS[ord("+")] = _CLASS[ord("-")] = _SIGN
+
+# State machine SGW-3015P: "XX,YY,[+-]digits[.digits][.]<unit>"
+# (sama dengan regex parse_scale_line lama). State >= _NUMBER boleh
+# diikuti satuan; _TRAILING_DOT berarti titik terakhir bukan bagian angka.
+_NUMBER, _NUMBER_DOT, _FRACTION, _TRAILING_DOT = 8, 9, 10, 11
+_TRANSITIONS: Dict[Tuple[int, int], int] = {
+    (0, _UPPER): 1, (1, _UPPER): 2, (2, _COMMA): 3,
+    (3, _UPPER): 4, (4, _UPPER): 5, (5, _COMMA): 6,
+    (6, _SIGN): 7, (6, _DIGIT): _NUMBER, (7, _DIGIT): _NUMBER,
+    (_NUMBER, _DIGIT): _NUMBER, (_NUMBER, _DOT): _NUMBER_DOT,
+    (_NUMBER_DOT, _DIGIT): _FRACTION,
+    (_FRACTION, _DIGIT): _FRACTION, (_FRACTION, _DOT): _TRAILING_DOT,
+}
+_UNIT_STATES = frozenset((_NUMBER, _NUMBER_DOT, _FRACTION, _TRAILING_DOT))
+# Header ada di posisi tetap "XX,YY,"
+_VALUE_START = 6
+
+# Batas jumlah bentuk yang diingat (frame sampah bisa membuat bentuk baru)
+SHAPE_CACHE_SIZE = 1024
+
+# Semua byte selain [A-Za-z0-9+.-] dibuang pada parsing lenient
+_LENIENT_KEEP = set(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+.-"
+)
+_LENIENT_DELETE = bytes(b for b in range(256) if b not in _LENIENT_KEEP)
+_NUMBER_RE = re.compile(rb"[+-]?\d+(?:\.\d+)?")
+_PRINTABLE = bytes(range(0x20, 0x7F))
+_NON_DIGITS = bytes(b for b in range(256) if b not in _DIGITS)
+
+
+# NamedTuple.__new__ berjalan di level Python; jalur utama memakai
+# tuple.__new__ langsung
+_new_frame = tuple.__new__
+
+# (akhir angka, stability, mode, unit, stable) dari satu bentuk frame
+FramePlan = Tuple[int, str, str, str, bool]
+
+
+# =========================
+# Dialects
+# =========================
+
+class Dialect:
+    """
+    Base class dialect indikator
+
+    Subclass mengimplementasikan ``parse`` yang menerima satu frame (tanpa
+    delimiter baris) dan mengembalikan ``ParsedFrame`` atau None.
+    """
+
+    name = ""
+    # False untuk dialect yang menerima hampir semua baris (tidak dipakai
+    # sebagai bukti konfigurasi serial benar saat probe)
+    strict = True
+
+    def parse(self, line: bytes) -> Optional[ParsedFrame]:
+        raise NotImplementedError
+
+
+def sgw3015p_plan(shape: bytes) -> Optional[FramePlan]:
+    """
+    Jalankan state machine SGW-3015P atas bentuk frame
+
+    Returns posisi akhir angka, flag header dan satuan, atau None jika
+    bentuk tidak cocok dengan format ketat.
+    """
+    state = 0
+    transitions = _TRANSITIONS
+    for index, byte in enumerate(shape):
+        if state in _UNIT_STATES:
+            unit = _UNITS.get(shape[index:])
+            if unit is not None:
+                end = index - 1 if state == _TRAILING_DOT else index
+                stability = shape[:2].decode("ascii")
+                return end, stability, shape[3:5].decode("ascii"), unit, stability == "ST"
+        state = transitions.get((state, _CLASS[byte]))
+        if state is None:
+            return None
+    return None
+
+
+class SGW3015PDialect(Dialect):
+    """
+    Format ketat SGW-3015P: ``ST,NT,1234.56kg``
+
+    Frame diterjemahkan ke bentuknya dengan satu ``bytes.translate``;
+    state machine (``sgw3015p_plan``) hanya dijalankan sekali per bentuk
+    baru. Indikator mengirim segelintir bentuk (kombinasi flag x jumlah
+    digit), jadi frame dengan nilai yang belum pernah terlihat pun cukup
+    satu lookup dict dan ``float()``.
+    """
+
+    name = "sgw3015p"
+
+    def __init__(self):
+        # Bentuk -> plan, atau False jika bentuk ditolak
+        self._plans: Dict[bytes, Union[FramePlan, bool]] = {}
+
+    def parse(self, line: bytes) -> Optional[ParsedFrame]:
+        shape = line.translate(_SHAPE)
+        plan = self._plans.get(shape)
+        if plan is None:
+            plans = self._plans
+            if len(plans) >= SHAPE_CACHE_SIZE:
+                plans.clear()
+            plan = plans[shape] = sgw3015p_plan(shape) or False
+        if not plan:
+            return None
+
+        end, stability, mode, unit, stable = plan
+        return _new_frame(ParsedFrame, (
+            line.decode("ascii"), stability, mode, float(line[_VALUE_START:end]), unit, stable,
+        ))
+
+
+class LenientDialect(Dialect):
+    """Fallback: ambil angka pertama dan tebak flag/satuan dari isi frame"""
+
+    name = "lenient"
+    strict = False
+
+    def parse(self, line: bytes) -> Optional[ParsedFrame]:
+        ascii_only = line.translate(None, _LENIENT_DELETE)
+        value_match = _NUMBER_RE.search(ascii_only)
+        if not value_match:
+            return None
+
+        upper = ascii_only.upper()
+        stability = "ST" if b"ST" in upper else ("US" if b"US" in upper else None)
+        mode = "NT" if b"NT" in upper else ("GS" if b"GS" in upper else None)
+
+        if b"KG" in upper:
+            unit = "kg"
+        elif b"LB" in upper:
+            unit = "lb"
+        elif b"G" in upper:
+            unit = "g"
+        else:
+            unit = "kg"
+
+        return _new_frame(ParsedFrame, (
+            line.decode("ascii", errors="ignore"),
+            stability,
+            mode,
+            float(value_match.group()),
+            unit,
+            stability == "ST",
+        ))
+
+
+DIALECTS: Dict[str, Type[Dialect]] = {}
+
+
+def register_dialect(dialect_cls: Type[Dialect]) -> Type[Dialect]:
+    """Daftarkan dialect baru (bisa dipakai sebagai decorator)"""
+    DIALECTS[dialect_cls.name] = dialect_cls
+    return dialect_cls
+
+
+register_dialect(SGW3015PDialect)
+register_dialect(LenientDialect)
+
+
+# =========================
+# Frame Parser
+# =========================
+
+_MISS = object()
+
+
+class FrameParser:
+    """
+    Parser frame dengan rantai dialect
+
+    Dialect dicoba berurutan; dialect pertama yang berhasil menang. Hasil
+    parse di-cache per frame mentah karena indikator yang diam mengirim
+    frame identik berulang-ulang; ``ParsedFrame`` immutable sehingga aman
+    dibagi.
+    """
+
+    def __init__(
+        self,
+        dialects: Iterable[Union[str, Dialect]] = ("sgw3015p", "lenient"),
+        cache_size: int = 4096,
+    ):
+        self.cache_size = cache_size
+        self._cache: Dict[bytes, Optional[ParsedFrame]] = {}
+        self.dialects = []
+        for dialect in dialects:
+            if isinstance(dialect, str):
+                name = dialect.strip().lower()
+                if name not in DIALECTS:
+                    raise ValueError(f"Unknown scale dialect: {dialect}")
+                dialect = DIALECTS[name]()
+            self.dialects.append(dialect)
+        self._parsers = tuple(d.parse for d in self.dialects)
+        self._strict_parsers = tuple(d.parse for d in self.dialects if d.strict)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FrameParser":
+        """Buat parser dari string config, mis. ``"sgw3015p,lenient"``"""
+        return cls([name for name in spec.split(",") if name.strip()])
+
+    def parse(self, frame: bytes) -> Optional[ParsedFrame]:
+        """Parse satu frame; whitespace di tepi diabaikan"""
+        parsed = self._cache.get(frame, _MISS)
+        if parsed is not _MISS:
+            return parsed
+
+        parsed = None
+        line = frame.strip()
+        if line:
+            for parse in self._parsers:
+                parsed = parse(line)
+                if parsed is not None:
+                    break
+
+        cache = self._cache
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[frame] = parsed
+        return parsed
+
+    def verifies(self, frame: bytes) -> bool:
+        """
+        Apakah frame membuktikan konfigurasi serial benar (skor probe)
+
+        Hanya dialect ketat yang dihitung: dialect lenient menerima baris
+        apa pun yang memuat angka, termasuk noise dari baudrate/parity yang
+        salah. Tanpa dialect ketat, frame lenient dihitung hanya jika tidak
+        ada byte kontrol.
+        """
+        line = frame.strip()
+        if not line:
+            return False
+        if self._strict_parsers:
+            return any(parse(line) is not None for parse in self._strict_parsers)
+        return self.parse(frame) is not None and not line.translate(None, _PRINTABLE)
+
+    @staticmethod
+    def failure_reason(frame: bytes) -> str:
+        """
+        Alasan frame gagal di-parse (untuk metrics; hanya dipanggil saat gagal)
+
+        ``garbage`` = ada byte kontrol (noise, baudrate/parity salah),
+        ``no_value`` = tidak ada angka, ``format`` = ada angka tapi tidak
+        cocok dengan dialect mana pun.
+        """
+        line = frame.strip()
+        if line.translate(None, _PRINTABLE):
+            return "garbage"
+        if not line.translate(None, _NON_DIGITS):
+            return "no_value"
+        return "format"
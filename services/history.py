@@ -0,0 +1,160 @@
+import threading
+from array import array
+from typing import Any, Dict, List, Optional
+
+
+class ReadingHistory:
+    """
+    Ring buffer riwayat pembacaan dengan kapasitas tetap
+
+    Setiap kolom disimpan dalam ``array`` bertipe (ts/last_ts float64,
+    packet int64, weight float64, repeat uint32, kode stability/mode
+    uint8) yang dialokasikan sekali di awal, sehingga memori tetap
+    konstan berapa pun lama streaming berjalan (~38 byte per sampel).
+    String stability/mode (``ST``, ``US``, ``GS``, ...) disimpan sebagai
+    kode ke tabel kecil. Frame identik berturut-turut disimpan sebagai
+    satu sampel dengan ``repeat`` dan ``last_ts`` (lihat ``extend_last``).
+    """
+
+    def __init__(self, capacity: int = 30000):
+        if capacity < 1:
+            raise ValueError("History capacity must be >= 1")
+        self.capacity = capacity
+        self.ts = array("d", bytes(8 * capacity))
+        self.last_ts = array("d", bytes(8 * capacity))
+        self.repeat = array("I", bytes(4 * capacity))
+        self.packet = array("q", bytes(8 * capacity))
+        self.weight = array("d", bytes(8 * capacity))
+        self.stability = array("B", bytes(capacity))
+        self.mode = array("B", bytes(capacity))
+        self._labels: List[Optional[str]] = [None]
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._head = 0   # next write position
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _code(self, label: Optional[str]) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            if len(self._labels) > 255:
+                # Indicator sent garbage flags; don't grow the table forever
+                return 0
+            code = len(self._labels)
+            self._labels.append(label)
+            self._codes[label] = code
+        return code
+
+    def append(self, ts: float, packet: int, weight: float, stability: Optional[str], mode: Optional[str]):
+        """Tambahkan satu sampel (menimpa sampel tertua jika penuh)"""
+        with self._lock:
+            i = self._head
+            self.ts[i] = ts
+            self.last_ts[i] = ts
+            self.repeat[i] = 1
+            self.packet[i] = packet
+            self.weight[i] = weight
+            self.stability[i] = self._code(stability)
+            self.mode[i] = self._code(mode)
+            self._head = (i + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+
+    def extend_last(self, ts: float):
+        """Frame identik dengan sampel terakhir: tambah repeat, perbarui last_ts"""
+        with self._lock:
+            if self._size:
+                i = (self._head - 1) % self.capacity
+                self.repeat[i] += 1
+                self.last_ts[i] = ts
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._size = 0
+
+    def _index(self, i: int) -> int:
+        """Physical position of the i-th oldest sample"""
+        return (self._head - self._size + i) % self.capacity
+
+    def _slice(self, column: array, lo: int, hi: int) -> array:
+        """Copy of samples lo..hi (oldest first) of a column; caller holds lock"""
+        if hi <= lo:
+            return column[0:0]
+        start = self._index(lo)
+        end = start + (hi - lo)
+        if end <= self.capacity:
+            return column[start:end]
+        return column[start:] + column[:end - self.capacity]
+
+    def _bisect_ts(self, ts: float) -> int:
+        """First logical index with timestamp >= ts; caller holds lock"""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ts[self._index(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(
+        self,
+        last: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ambil sampel sebagai kolom (ts, last_ts, packet, repeat, weight, stability, mode)
+
+        ``since``/``until`` membatasi jendela waktu (epoch detik), ``last``
+        mengambil N sampel terakhir dari hasilnya. Jika ``max_points``
+        diisi dan sampel lebih banyak, data di-downsample per bucket: berat
+        dirata-rata (dibobot repeat), repeat dijumlah, ts dari sampel
+        pertama bucket, kolom lain dari sampel terakhir bucket.
+        """
+        with self._lock:
+            lo = 0 if since is None else self._bisect_ts(since)
+            hi = self._size if until is None else self._bisect_ts(until)
+            if last is not None:
+                lo = max(lo, hi - last)
+            ts = self._slice(self.ts, lo, hi)
+            last_ts = self._slice(self.last_ts, lo, hi)
+            repeat = self._slice(self.repeat, lo, hi)
+            packet = self._slice(self.packet, lo, hi)
+            weight = self._slice(self.weight, lo, hi)
+            stability = self._slice(self.stability, lo, hi)
+            mode = self._slice(self.mode, lo, hi)
+            labels = list(self._labels)
+
+        samples = len(ts)
+        if max_points and samples > max_points:
+            bucket = -(-samples // max_points)
+            starts = range(0, samples, bucket)
+            tails = [min(start + bucket, samples) - 1 for start in starts]
+            # Frame-weighted mean: a long idle run counts as many frames
+            weight = [
+                sum(w * r for w, r in zip(weight[start:tail + 1], repeat[start:tail + 1])) / sum(repeat[start:tail + 1])
+                for start, tail in zip(starts, tails)
+            ]
+            ts = [ts[start] for start in starts]
+            last_ts = [last_ts[i] for i in tails]
+            repeat = [sum(repeat[start:tail + 1]) for start, tail in zip(starts, tails)]
+            packet = [packet[i] for i in tails]
+            stability = [stability[i] for i in tails]
+            mode = [mode[i] for i in tails]
+
+        return {
+            "count": len(ts),
+            "samples": samples,
+            "ts": ts.tolist() if isinstance(ts, array) else ts,
+            "last_ts": last_ts.tolist() if isinstance(last_ts, array) else last_ts,
+            "repeat": repeat.tolist() if isinstance(repeat, array) else repeat,
+            "packet": packet.tolist() if isinstance(packet, array) else packet,
+            "weight": weight.tolist() if isinstance(weight, array) else weight,
+            "stability": [labels[c] for c in stability],
+            "mode": [labels[c] for c in mode],
+        }
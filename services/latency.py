@@ -0,0 +1,137 @@
+"""
+Histogram latensi jalur akuisisi
+
+Setiap chunk serial diberi timestamp ``time.monotonic_ns()`` saat
+diterima, lalu dibawa lewat parse dan publish. Tahap yang diukur:
+
+    - receipt_to_parse    : chunk diterima -> frame selesai di-parse
+    - parse_to_publish    : frame di-parse -> pembacaan selesai dipublikasikan
+    - publish_to_response : pembacaan dipublikasikan -> response /reading dikirim
+    - publish_to_stream   : pembacaan dipublikasikan -> dikirim lewat SSE/WebSocket
+    - frame_interval      : jarak antar frame saat diterima (+ jitter RFC 3550)
+
+Histogram memakai bucket tetap sehingga ``record`` hanya bisect + tambah
+counter tanpa alokasi dan tanpa lock. Setiap histogram hanya ditulis
+oleh satu thread (reader atau event loop); snapshot yang dibaca dari
+thread lain bisa tertinggal satu sampel.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+# Batas atas bucket (mikrodetik); bucket terakhir = +Inf
+DEFAULT_BOUNDS_US = (
+    50, 100, 250, 500,
+    1_000, 2_500, 5_000, 10_000, 25_000, 50_000,
+    100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000,
+)
+
+
+class LatencyHistogram:
+    """Histogram latensi dengan bucket tetap (nilai dalam nanodetik)"""
+
+    def __init__(self, bounds_us: Sequence[int] = DEFAULT_BOUNDS_US):
+        self.bounds_us = tuple(bounds_us)
+        self._bounds_ns = [bound * 1000 for bound in self.bounds_us]
+        self.reset()
+
+    def reset(self):
+        self.counts: List[int] = [0] * (len(self._bounds_ns) + 1)
+        self.count = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        self.counts[bisect_left(self._bounds_ns, ns)] += 1
+        self.count += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Perkiraan kuantil (ms): batas atas bucket yang memuatnya"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if i == len(self.bounds_us):
+                    break
+                return round(min(self.bounds_us[i] / 1000, self.max_ns / 1e6), 4)
+        return round(self.max_ns / 1e6, 4)
+
+    def snapshot(self) -> Dict[str, Any]:
+        count = self.count
+        buckets = {f"{bound / 1000:g}": n for bound, n in zip(self.bounds_us, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": count,
+            "mean_ms": round(self.sum_ns / count / 1e6, 4) if count else None,
+            "max_ms": round(self.max_ns / 1e6, 4) if count else None,
+            "p50_ms": self.quantile(0.50),
+            "p90_ms": self.quantile(0.90),
+            "p99_ms": self.quantile(0.99),
+            "buckets_ms": buckets,
+        }
+
+
+class AcquisitionLatency:
+    """Kumpulan histogram latensi satu timbangan"""
+
+    STAGES = (
+        "receipt_to_parse",
+        "parse_to_publish",
+        "publish_to_response",
+        "publish_to_stream",
+        "frame_interval",
+    )
+
+    def __init__(self):
+        self.receipt_to_parse = LatencyHistogram()
+        self.parse_to_publish = LatencyHistogram()
+        self.publish_to_response = LatencyHistogram()
+        self.publish_to_stream = LatencyHistogram()
+        self.frame_interval = LatencyHistogram()
+        self.reset()
+
+    def reset(self):
+        for stage in self.STAGES:
+            getattr(self, stage).reset()
+        self.jitter_ns = 0.0
+        self.since = time.time()
+        self.new_session()
+
+    def new_session(self):
+        """Koneksi baru: jarak ke frame terakhir sesi sebelumnya tidak dihitung"""
+        self._last_rx_ns = 0
+        self._last_interval_ns = None
+
+    def on_frame(self, rx_ns: int):
+        """
+        Catat jarak antar frame dan jitter (estimator RFC 3550, gain 1/16)
+
+        Frame dari chunk yang sama berbagi waktu terima; hanya frame pertama
+        yang dihitung, karena jarak 0 ns antar frame dalam satu read bukan
+        jarak kirim indikator.
+        """
+        last = self._last_rx_ns
+        if rx_ns == last:
+            return
+        self._last_rx_ns = rx_ns
+        if not last:
+            return
+        interval = rx_ns - last
+        self.frame_interval.record(interval)
+        previous = self._last_interval_ns
+        self._last_interval_ns = interval
+        if previous is not None:
+            self.jitter_ns += (abs(interval - previous) - self.jitter_ns) / 16
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {stage: getattr(self, stage).snapshot() for stage in self.STAGES}
+        snapshot["jitter_ms"] = round(self.jitter_ns / 1e6, 4)
+        snapshot["since"] = self.since
+        return snapshot
@@ -0,0 +1,324 @@
+"""
+Registry metrics bawaan dengan format teks Prometheus
+
+Tidak memerlukan ``prometheus_client``. Ada dua cara mengisi metrics:
+
+    - Counter/Histogram yang dicatat langsung (middleware HTTP, pool DB).
+      Setiap child memakai lock sendiri yang hampir tidak pernah
+      diperebutkan, jadi satu ``observe`` hanya bisect + beberapa
+      penjumlahan.
+    - Collector yang dipanggil saat ``/metrics`` di-scrape dan membaca
+      counter yang sudah ada (``packet_count``, histogram latensi, ...).
+      Jalur per-frame tidak mencatat apa pun tambahan.
+
+Usage:
+    requests = REGISTRY.counter("app_requests_total", "Jumlah request", ["route"])  # nama counter diakhiri _total
+    requests.labels("/api/scale/reading").inc()
+    REGISTRY.register_collector(lambda: [...MetricFamily...])
+    body = REGISTRY.render()
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket default (detik) untuk latensi request/DB
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class MetricFamily(NamedTuple):
+    """Satu metric dengan semua sample-nya (hasil collector)"""
+    name: str
+    type: str
+    help: str
+    # (suffix nama, labels, nilai), mis. ("_bucket", {"le": "0.1"}, 3)
+    samples: List[Tuple[str, Dict[str, str], float]]
+
+
+def histogram_samples(
+    labels: Dict[str, str],
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> List[Tuple[str, Dict[str, str], float]]:
+    """Sample ``_bucket``/``_sum``/``_count`` dari counts per bucket (non-kumulatif, +Inf di akhir)"""
+    samples = []
+    cumulative = 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        samples.append(("_bucket", {**labels, "le": f"{bound:g}"}, cumulative))
+    cumulative += counts[len(bounds)]
+    samples.append(("_bucket", {**labels, "le": "+Inf"}, cumulative))
+    samples.append(("_sum", labels, total))
+    samples.append(("_count", labels, cumulative))
+    return samples
+
+
+# =========================
+# Metric Types
+# =========================
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        """Context manager yang mencatat durasi blok (detik)"""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Child untuk kombinasi label (dibuat sekali, setelah itu lookup dict)"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def collect(self) -> MetricFamily:
+        samples = [("", dict(zip(self.labelnames, key)), child.value) for key, child in list(self._children.items())]
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            samples.extend(histogram_samples(dict(zip(self.labelnames, key)), self.buckets, counts, total))
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+# =========================
+# Registry
+# =========================
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Kumpulan metric dan collector yang dirender ke format teks Prometheus"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """Daftarkan fungsi yang menghasilkan MetricFamily saat scrape"""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in list(self._metrics.values())]
+        for collector in list(self._collectors):
+            families.extend(collector())
+        return families
+
+    def render(self) -> bytes:
+        """Format teks exposition Prometheus 0.0.4"""
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape(family.help)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for suffix, labels, value in family.samples:
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{family.name}{suffix}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{family.name}{suffix} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+REGISTRY = MetricsRegistry()
+
+
+# =========================
+# HTTP Middleware
+# =========================
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Latensi request HTTP per route (sampai body response selesai dikirim)",
+    ["method", "route", "status"],
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI yang mencatat latensi request per route
+
+    Label ``route`` memakai template path (``/api/scale/{scale_id}/status``),
+    bukan path mentah, agar kardinalitas tetap kecil; request yang tidak
+    cocok dengan route mana pun dicatat sebagai ``<unmatched>``.
+    """
+
+    def __init__(self, app, histogram: Histogram = HTTP_REQUEST_DURATION):
+        self.app = app
+        self.histogram = histogram
+        self._templates: Optional[Dict[object, str]] = None
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        templates = self._templates
+        if templates is None or endpoint not in templates:
+            # Built lazily: routes are complete only once the app has started
+            app = scope.get("app")
+            templates = self._templates = {
+                getattr(route, "endpoint", None): route.path
+                for route in getattr(app, "routes", ())
+                if hasattr(route, "path")
+            }
+            templates.setdefault(endpoint, "<unmatched>")
+        return templates[endpoint]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.labels(scope["method"], self._route_template(scope), status).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,138 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+MODE_UNKNOWN = "unknown"
+MODE_CONTINUOUS = "continuous"
+MODE_REQUEST = "request"
+
+
+class PollScheduler:
+    """
+    Adaptive poll scheduler
+
+    Starts by listening without polling. If the indicator streams on its
+    own (frames arriving while no poll is outstanding) it switches to
+    ``continuous`` mode and stops polling. Otherwise it probes the poll
+    commands one at a time; the first command that gets a frame back
+    within the response timeout is learned and used exclusively
+    (``request`` mode), polled at roughly twice the observed response
+    latency, bounded by ``min_poll_ms`` and ``poll_ms``.
+
+    ``on_frame`` is called by the read path, ``next_poll`` by the poll
+    loop; both may run on different threads.
+    """
+
+    def __init__(
+        self,
+        commands: List[bytes],
+        poll_ms: int = 1000,
+        min_poll_ms: int = 100,
+        unsolicited_frames: int = 3,
+        max_misses: int = 3,
+    ):
+        self.commands = list(commands)
+        self.poll_interval = poll_ms / 1000
+        self.min_interval = min(min_poll_ms, poll_ms) / 1000
+        self.response_timeout = max(self.poll_interval, 0.2)
+        self.unsolicited_frames = unsolicited_frames
+        self.max_misses = max_misses
+        self._lock = threading.Lock()
+        self.reset(0.0)
+
+    def reset(self, now: float):
+        """Forget learned mode (new connection)"""
+        with self._lock:
+            self.mode = MODE_UNKNOWN
+            self.command: Optional[bytes] = None
+            self.latency: Optional[float] = None
+            self.polls_sent = 0
+            self._probe_index = 0
+            self._pending: Optional[Tuple[bytes, float]] = None
+            self._last_sent = float("-inf")
+            self._last_frame = now
+            self._unsolicited = 0
+            self._misses = 0
+            # Listen first: a streaming indicator needs no polling at all
+            self._listen_until = now + self.response_timeout
+
+    def on_frame(self, now: float):
+        """A frame was parsed at ``now`` (monotonic seconds)"""
+        with self._lock:
+            self._last_frame = now
+            pending = self._pending
+            if pending is not None and now - pending[1] <= self.response_timeout:
+                cmd, sent = pending
+                self._pending = None
+                self._misses = 0
+                self._unsolicited = 0
+                latency = now - sent
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                if self.mode != MODE_CONTINUOUS:
+                    self.mode = MODE_REQUEST
+                    self.command = cmd
+                return
+
+            if now - self._last_sent > self.response_timeout:
+                self._unsolicited += 1
+                if self._unsolicited >= self.unsolicited_frames:
+                    self.mode = MODE_CONTINUOUS
+                    self.command = None
+                    self._pending = None
+
+    def next_poll(self, now: float) -> Tuple[Optional[bytes], float]:
+        """Return (command to send now or None, seconds until next call)"""
+        with self._lock:
+            if self.mode == MODE_CONTINUOUS:
+                if now - self._last_frame > max(3 * self.response_timeout, 1.0):
+                    # Stream stopped; go back to discovering
+                    self.mode = MODE_UNKNOWN
+                    self._unsolicited = 0
+                    self._listen_until = now
+                else:
+                    return None, self.poll_interval
+
+            if self._pending is not None:
+                remaining = self._pending[1] + self.response_timeout - now
+                if remaining > 0:
+                    return None, remaining
+                # No answer to the outstanding poll
+                self._pending = None
+                self._misses += 1
+                if self.mode == MODE_REQUEST and self._misses >= self.max_misses:
+                    self.mode = MODE_UNKNOWN
+                    self.command = None
+
+            if self.mode == MODE_UNKNOWN:
+                if now < self._listen_until:
+                    return None, self._listen_until - now
+                cmd = self.commands[self._probe_index % len(self.commands)]
+                self._probe_index += 1
+                return self._send(cmd, now), self.response_timeout
+
+            interval = self.interval
+            due = self._last_sent + interval - now
+            if due > 0:
+                return None, due
+            return self._send(self.command, now), interval
+
+    def _send(self, cmd: bytes, now: float) -> bytes:
+        self._pending = (cmd, now)
+        self._last_sent = now
+        self.polls_sent += 1
+        return cmd
+
+    @property
+    def interval(self) -> float:
+        """Current poll interval in request mode (seconds)"""
+        if self.latency is None:
+            return self.poll_interval
+        return min(max(2 * self.latency, self.min_interval), self.poll_interval)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "command": self.command.decode("ascii").encode("unicode_escape").decode("ascii") if self.command else None,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "interval_ms": round(self.interval * 1000) if self.mode == MODE_REQUEST else None,
+            "polls_sent": self.polls_sent,
+        }
@@ -0,0 +1,52 @@
+import json
+import os
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields of a serial config that are worth remembering per port
+SERIAL_FIELDS = ("baudrate", "bytesize", "parity", "stopbits")
+
+_lock = threading.Lock()
+
+
+def load_port_config(path: str, port: str) -> Optional[Dict[str, Any]]:
+    """Load the last verified serial config for a port (None if unknown)"""
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f).get(port)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read scale state file {path}: {e}")
+        return None
+    if not saved or any(field not in saved for field in SERIAL_FIELDS):
+        return None
+    return {"port": port, **{field: saved[field] for field in SERIAL_FIELDS}}
+
+
+def save_port_config(path: str, cfg: Dict[str, Any]):
+    """Persist a verified serial config so the next (re)connect tries it first"""
+    if not path:
+        return
+    with _lock:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        entry = {field: cfg[field] for field in SERIAL_FIELDS}
+        if state.get(cfg["port"]) == entry:
+            return
+        state[cfg["port"]] = entry
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Cannot write scale state file {path}: {e}")
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import logging
+from collections import deque
+from typing import Dict, Set
+
+from services.reading import Reading
+
+logger = logging.getLogger(__name__)
+
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_LATEST = "latest"
+POLICIES = (POLICY_DROP_OLDEST, POLICY_LATEST)
+
+
+class Subscription:
+    """
+    Antrian pembacaan milik satu subscriber
+
+    Antrian dibatasi ``maxsize``. Policy ``drop_oldest`` membuang item
+    terlama saat penuh, ``latest`` hanya menyimpan pembacaan terbaru
+    (coalesce). Subscriber lambat tidak pernah menahan publisher.
+    """
+
+    def __init__(
+        self,
+        hub: "ReadingHub",
+        loop: asyncio.AbstractEventLoop,
+        maxsize: int = 32,
+        policy: str = POLICY_DROP_OLDEST,
+        stable_only: bool = False,
+        on_change: bool = False,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown subscription policy: {policy}")
+        self.hub = hub
+        self.loop = loop
+        self.policy = policy
+        self.stable_only = stable_only
+        self.on_change = on_change
+        self.dropped = 0
+        self._queue: deque = deque(maxlen=1 if policy == POLICY_LATEST else maxsize)
+        self._event = asyncio.Event()
+        self._last_key = None
+
+    def _offer(self, reading: Reading):
+        """Dipanggil di event loop subscriber oleh ReadingHub"""
+        if self.stable_only and not reading.stable:
+            return
+        if self.on_change:
+            key = (reading.weight, reading.stability, reading.mode, reading.unit, reading.settled)
+            if key == self._last_key:
+                return
+            self._last_key = key
+
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(reading)
+        self._event.set()
+
+    async def get(self) -> Reading:
+        """Tunggu dan ambil pembacaan berikutnya"""
+        while not self._queue:
+            self._event.clear()
+            await self._event.wait()
+        return self._queue.popleft()
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReadingHub:
+    """
+    Publish/subscribe pembacaan timbangan
+
+    ``publish`` boleh dipanggil dari thread mana pun (thread serial atau
+    event loop). Tanpa subscriber biayanya hanya satu pengecekan; dengan
+    subscriber, pembacaan dikirim ke setiap event loop sekali saja lalu
+    dibagikan ke antrian masing-masing subscriber di loop tersebut.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscription]] = {}
+        self._loop_threads: Dict[asyncio.AbstractEventLoop, int] = {}
+        self._encoded = (None, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, **kwargs) -> Subscription:
+        """Buat subscription baru di event loop yang sedang berjalan"""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(self, loop, **kwargs)
+        # Copy-on-write: publisher di thread lain hanya melihat snapshot
+        subscribers = dict(self._subscribers)
+        subscribers[loop] = subscribers.get(loop, frozenset()) | {subscription}
+        self._loop_threads[loop] = threading.get_ident()
+        self._subscribers = subscribers
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = dict(self._subscribers)
+        remaining = subscribers.get(subscription.loop, frozenset()) - {subscription}
+        if remaining:
+            subscribers[subscription.loop] = remaining
+        else:
+            subscribers.pop(subscription.loop, None)
+            self._loop_threads.pop(subscription.loop, None)
+        self._subscribers = subscribers
+
+    def publish(self, reading: Reading):
+        """Kirim pembacaan ke semua subscriber"""
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        current = threading.get_ident()
+        for loop, subs in subscribers.items():
+            if self._loop_threads.get(loop) == current:
+                self._dispatch(subs, reading)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._dispatch, subs, reading)
+            except RuntimeError:
+                # Event loop sudah ditutup
+                logger.debug("Dropping subscribers of closed event loop")
+
+    @staticmethod
+    def _dispatch(subs, reading: Reading):
+        for subscription in subs:
+            subscription._offer(reading)
+
+    def encode_bytes(self, reading: Reading) -> bytes:
+        """Serialisasi JSON pembacaan (bytes UTF-8), di-cache untuk pembacaan terakhir
+
+        Semua subscriber dan client menerima pembacaan yang sama, jadi
+        JSON cukup dibuat sekali per pembacaan, dan hanya jika diminta.
+        """
+        cached_reading, data = self._encoded
+        if cached_reading is not reading:
+            data = reading.to_json()
+            self._encoded = (reading, data)
+        return data
+
+    def encode(self, reading: Reading) -> str:
+        """Seperti ``encode_bytes`` tetapi dalam teks (untuk WebSocket)"""
+        return self.encode_bytes(reading).decode("utf-8")
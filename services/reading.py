@@ -0,0 +1,61 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class Reading(NamedTuple):
+    """
+    Satu pembacaan timbangan (immutable, tanpa __dict__)
+
+    Hanya menyimpan nilai mentah: timestamp epoch (float), nomor packet,
+    berat (float) dan flag. String stability/mode/unit adalah konstanta
+    yang dibagi bersama dari parser, jadi tidak ada alokasi string per
+    pembacaan. String ISO, dict dan JSON baru dibuat saat diminta (route,
+    stream, status).
+
+    Frame identik berturut-turut digabung menjadi satu pembacaan: ``ts``
+    dan ``packet`` milik frame pertama, ``repeat`` = jumlah frame dan
+    ``last_ts`` = waktu frame terakhir.
+
+    ``rx_ns`` dan ``pub_ns`` adalah ``time.monotonic_ns()`` saat chunk
+    frame (terakhir) diterima dan saat pembacaan tersedia; hanya untuk
+    pengukuran latensi, tidak ikut di dict/JSON.
+    """
+    ts: float
+    packet: int
+    stability: Optional[str]
+    mode: Optional[str]
+    stable: bool
+    settled: bool
+    weight: float
+    unit: str
+    raw: str
+    repeat: int = 1
+    last_ts: float = 0.0
+    rx_ns: int = 0
+    pub_ns: int = 0
+
+    @property
+    def iso_ts(self) -> str:
+        return datetime.utcfromtimestamp(self.ts).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict baru dengan bentuk yang sama seperti response /reading"""
+        return {
+            "ts": self.iso_ts,
+            "type": "weight",
+            "packet": self.packet,
+            "stability": self.stability,
+            "mode": self.mode,
+            "stable": self.stable,
+            "settled": self.settled,
+            "weight": self.weight,
+            "unit": self.unit,
+            "raw": self.raw,
+            "repeat": self.repeat,
+            "last_ts": datetime.utcfromtimestamp(self.last_ts or self.ts).isoformat(),
+        }
+
+    def to_json(self) -> bytes:
+        """JSON UTF-8 (tanpa cache; pakai ReadingHub.encode_bytes untuk cache)"""
+        return json.dumps(self.to_dict()).encode("utf-8")
@@ -0,0 +1,66 @@
+"""
+Receive buffer untuk data serial timbangan
+
+Chunk serial dinormalisasi dengan satu ``bytes.translate`` (mask 7-bit dan
+semua pemisah baris menjadi ``\\n``), lalu ditampung di ``bytearray``.
+Hanya byte baru yang dipindai untuk delimiter, sehingga frame yang datang
+terpotong-potong atau noise panjang tidak membuat biaya kuadratik.
+"""
+
+from typing import List
+
+# Mask 7-bit murni (clear bit paritas/non-ASCII)
+SEVEN_BIT_MASK = bytes(b & 0x7F for b in range(256))
+
+# Mask 7-bit + \r, \v, \f, \x1c-\x1e (pemisah baris versi str.splitlines)
+# disatukan menjadi \n
+_LINE_BREAKS = b"\r\x0b\x0c\x1c\x1d\x1e"
+SEVEN_BIT_TABLE = bytes(
+    0x0A if (b & 0x7F) in _LINE_BREAKS else (b & 0x7F) for b in range(256)
+)
+
+# Whitespace versi str.isspace() untuk ASCII
+_BLANK = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+class RxBuffer:
+    """
+    Buffer penerimaan serial dengan scanning delimiter inkremental
+
+    ``feed`` mengembalikan frame lengkap (bytes, tanpa delimiter, baris
+    kosong dibuang). Sisa frame yang belum lengkap tetap di buffer; jika
+    melebihi ``max_frame`` tanpa delimiter, isinya dianggap noise dan dibuang.
+    """
+
+    def __init__(self, max_frame: int = 4096):
+        self.max_frame = max_frame
+        self.overflow_count = 0
+        self._buf = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def clear(self):
+        """Kosongkan buffer (mis. setelah reconnect)"""
+        self._buf.clear()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Tambahkan chunk mentah dan kembalikan frame yang sudah lengkap"""
+        buf = self._buf
+        scan_from = len(buf)
+        buf += chunk.translate(SEVEN_BIT_TABLE)
+
+        end = buf.rfind(b"\n", scan_from)
+        if end < 0:
+            if len(buf) > self.max_frame:
+                self.overflow_count += 1
+                buf.clear()
+            return []
+
+        view = memoryview(buf)
+        block = view[:end].tobytes()
+        view.release()
+        # bytearray menghapus prefix dengan menggeser offset, bukan memmove
+        del buf[:end + 1]
+
+        return [line for line in block.split(b"\n") if line.strip(_BLANK)]
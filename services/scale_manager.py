@@ -0,0 +1,180 @@
+from typing import Any, Dict, List, Optional
+import logging
+
+from services.connect import ScaleConnection, create_scale_connection
+from services.metrics import MetricFamily, histogram_samples
+from services.shared_state import SharedScaleConnection, segment_name
+
+logger = logging.getLogger(__name__)
+
+
+class ScaleManager:
+    """
+    Registry beberapa timbangan dalam satu proses
+
+    Setiap timbangan diidentifikasi dengan ``scale_id``. Timbangan pertama
+    yang didaftarkan menjadi default (dipakai route lama tanpa scale_id).
+    Untuk puluhan port gunakan transport asyncio agar semua koneksi
+    berjalan di satu event loop, bukan dua thread per port.
+    """
+
+    def __init__(self):
+        self.scales: Dict[str, ScaleConnection] = {}
+        self.default_id: Optional[str] = None
+
+    def add(self, connection: ScaleConnection) -> ScaleConnection:
+        """Daftarkan koneksi timbangan"""
+        if connection.scale_id in self.scales:
+            raise ValueError(f"Duplicate scale id: {connection.scale_id}")
+        self.scales[connection.scale_id] = connection
+        if self.default_id is None:
+            self.default_id = connection.scale_id
+        return connection
+
+    def get(self, scale_id: str) -> Optional[ScaleConnection]:
+        """Ambil koneksi berdasarkan scale_id (None jika tidak ada)"""
+        return self.scales.get(scale_id)
+
+    @property
+    def default(self) -> ScaleConnection:
+        return self.scales[self.default_id]
+
+    def ids(self) -> List[str]:
+        return list(self.scales)
+
+    def start_all(self):
+        for connection in self.scales.values():
+            connection.start()
+
+    def stop_all(self):
+        for connection in self.scales.values():
+            connection.stop()
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Status semua timbangan, dikelompokkan per scale_id"""
+        return {scale_id: conn.get_status() for scale_id, conn in self.scales.items()}
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """
+        Metrics semua timbangan untuk /metrics
+
+        Dibaca dari counter yang sudah ada di ScaleConnection saat scrape,
+        jadi jalur per-frame tidak mencatat apa pun tambahan.
+        """
+        frames, readings, rate, connected, reconnects = [], [], [], [], []
+        failures, connect_time, latency, jitter = [], [], [], []
+        for scale_id, conn in self.scales.items():
+            labels = {"scale_id": scale_id}
+            frames.append(("", labels, conn.packet_count))
+            readings.append(("", labels, conn.run_count))
+            rate.append(("", labels, round(conn.raw_rate(), 3)))
+            connected.append(("", labels, int(conn.is_connected)))
+            reconnects.append(("", labels, conn.reconnect_count))
+            counts = dict(conn.parse_failures)
+            counts["overflow"] = conn.rx_buffer.overflow_count
+            for reason, count in sorted(counts.items()):
+                failures.append(("", {**labels, "reason": reason}, count))
+            for result, hist in conn.connect_time.items():
+                connect_time.extend(histogram_samples(
+                    {**labels, "result": result},
+                    [bound / 1e6 for bound in hist.bounds_us],
+                    list(hist.counts),
+                    hist.sum_ns / 1e9,
+                ))
+            for stage in conn.latency.STAGES:
+                hist = getattr(conn.latency, stage)
+                latency.extend(histogram_samples(
+                    {**labels, "stage": stage},
+                    [bound / 1e6 for bound in hist.bounds_us],
+                    list(hist.counts),
+                    hist.sum_ns / 1e9,
+                ))
+            jitter.append(("", labels, conn.latency.jitter_ns / 1e9))
+
+        return [
+            MetricFamily("scale_frames_total", "counter", "Frame serial yang diterima (termasuk yang gagal di-parse)", frames),
+            MetricFamily("scale_readings_total", "counter", "Pembacaan yang dipublikasikan (setelah coalescing)", readings),
+            MetricFamily("scale_frame_rate_hz", "gauge", "Laju frame mentah per detik", rate),
+            MetricFamily("scale_parse_failures_total", "counter", "Frame yang gagal di-parse per alasan", failures),
+            MetricFamily("scale_connected", "gauge", "1 jika port serial terhubung", connected),
+            MetricFamily("scale_reconnects_total", "counter", "Percobaan koneksi ulang", reconnects),
+            MetricFamily("scale_connect_duration_seconds", "histogram", "Durasi _try_connect (probe + open)", connect_time),
+            MetricFamily("scale_latency_seconds", "histogram", "Latensi jalur akuisisi per tahap", latency),
+            MetricFamily("scale_jitter_seconds", "gauge", "Jitter antar frame (estimator RFC 3550)", jitter),
+        ]
+
+
+def build_scale_manager(settings, acquisition: Optional[str] = None) -> ScaleManager:
+    """
+    Buat ScaleManager dari Settings (SCALES atau SCALE_* tunggal)
+
+    ``acquisition`` (default SCALE_ACQUISITION): ``inprocess`` membuka port
+    serial di proses ini, ``shared`` membaca state dari proses akuisisi.
+    """
+    acquisition = (acquisition or settings.scale_acquisition).lower()
+    if acquisition not in ("inprocess", "shared"):
+        raise ValueError(f"Unknown scale acquisition mode: {acquisition}")
+    defaults = {
+        "port": settings.scale_port,
+        "baudrate": settings.scale_baudrate,
+        "bytesize": settings.scale_bytesize,
+        "stopbits": settings.scale_stopbits,
+        "parity": settings.scale_parity,
+        "poll_ms": settings.scale_poll_ms,
+        "enable_poll": settings.scale_enable_poll,
+        "dialects": settings.scale_dialects,
+        "stable_tolerance": settings.scale_stable_tolerance,
+        "stable_duration_ms": settings.scale_stable_duration_ms,
+        "stable_max_std": settings.scale_stable_max_std,
+        "filters": settings.scale_filters,
+        "capture_dir": settings.scale_capture_dir,
+        "coalesce": settings.scale_coalesce,
+    }
+    definitions = [
+        {"scale_id": cfg.id, **defaults, **cfg.model_dump(exclude={"id"}, exclude_none=True)}
+        for cfg in settings.scales
+    ] or [{"scale_id": "default", **defaults}]
+
+    manager = ScaleManager()
+    for definition in definitions:
+        if acquisition == "shared":
+            manager.add(SharedScaleConnection(
+                segment_name=segment_name(settings.scale_shm_prefix, definition["scale_id"]),
+                watch_ms=settings.scale_shm_watch_ms,
+                watch_max_ms=settings.scale_shm_watch_max_ms,
+                **definition,
+            ))
+            continue
+        manager.add(create_scale_connection(
+            transport=settings.scale_transport,
+            reconnect_ms=settings.scale_reconnect_ms,
+            reconnect_max_ms=settings.scale_reconnect_max_ms,
+            probe_ms=settings.scale_probe_ms,
+            poll_min_ms=settings.scale_poll_min_ms,
+            history_size=settings.scale_history_size,
+            capture_rotate_s=settings.scale_capture_rotate_s,
+            capture_max_mb=settings.scale_capture_max_mb,
+            capture_keep=settings.scale_capture_keep,
+            state_file=settings.scale_state_file,
+            # Shutdown ditangani lifespan aplikasi, bukan signal per koneksi
+            handle_signals=False,
+            **definition,
+        ))
+    logger.info(f"Scale manager: {len(manager.scales)} scale(s) configured ({', '.join(manager.ids())})")
+    return manager
+
+
+# =========================
+# Global Instance
+# =========================
+
+_scale_manager: Optional[ScaleManager] = None
+
+
+def get_scale_manager() -> ScaleManager:
+    """Get or create global scale manager instance"""
+    global _scale_manager
+    if _scale_manager is None:
+        from config import settings
+        _scale_manager = build_scale_manager(settings)
+    return _scale_manager
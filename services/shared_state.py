@@ -0,0 +1,570 @@
+"""
+State timbangan di shared memory (seqlock) untuk uvicorn multi-worker
+
+Satu proses akuisisi (``python -m services.acquisition``) memegang port
+serial dan menulis status, pembacaan terakhir, dan ring buffer riwayat
+setiap timbangan ke segmen ``multiprocessing.shared_memory``. Worker
+uvicorn hanya membaca segmen tersebut, tanpa IPC round trip.
+
+Setiap segmen dilindungi seqlock: writer menaikkan ``seq`` menjadi ganjil,
+menulis, lalu menaikkan lagi menjadi genap. Reader membaca ``seq``,
+menyalin data, lalu membaca ``seq`` lagi; jika ganjil atau berubah,
+salinan diulang. Reader tidak pernah menahan writer.
+
+Layout segmen (little endian, offset rata 8 byte)::
+
+    header  : magic "SCALESHM" | version u16 | reserved u16 | capacity u32
+    seq     : u64
+    meta    : writer_pid u64 | instance_tag 64s
+    status  : connected | verified | packet_count | run_count | reconnect_count
+              | raw_rate | baudrate | bytesize | parity | stopbits
+    reading : slot pembacaan terakhir (lihat READING)
+    history : head i64 | size i64 | 256 label 8s | kolom ReadingHistory
+"""
+
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional
+
+from services.connect import ScaleConnection
+from services.history import ReadingHistory
+from services.reading import Reading
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SCALESHM"
+VERSION = 1
+HEADER = struct.Struct("<8sHHI")
+SEQ = struct.Struct("<Q")
+META = struct.Struct("<Q64s")
+STATUS = struct.Struct("<??qqqdIBcB")
+READING = struct.Struct("<?dq4s4s??d4sH128sIdqq")
+HISTORY_STATE = struct.Struct("<qq")
+LABEL = struct.Struct("<8s")
+MAX_LABELS = 256
+# Kolom ReadingHistory: (nama, typecode, byte per sampel)
+COLUMNS = (
+    ("ts", "d", 8),
+    ("last_ts", "d", 8),
+    ("packet", "q", 8),
+    ("weight", "d", 8),
+    ("repeat", "I", 4),
+    ("stability", "B", 1),
+    ("mode", "B", 1),
+)
+
+# Serialises the resource tracker workaround in ScaleSegment.attach
+_TRACKER_LOCK = threading.Lock()
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def segment_name(prefix: str, scale_id: str) -> str:
+    """Nama segmen shared memory yang aman untuk scale_id apa pun"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{prefix}-{scale_id}")
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # Windows frees a segment with its last handle; if it exists, it is in use
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _text(value: bytes) -> Optional[str]:
+    value = value.rstrip(b"\0")
+    return value.decode("ascii", errors="replace") if value else None
+
+
+class ScaleSegment:
+    """
+    Satu segmen shared memory per timbangan
+
+    Dibuat oleh proses akuisisi (``create``) dan dibuka oleh worker
+    (``attach``). Writer boleh dipakai dari beberapa thread (reader serial
+    dan sinkronisasi status); lock lokal menjamin hanya satu yang menulis.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.buf = shm.buf
+        magic, version, _, self.capacity = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a scale shared memory segment: {shm.name}")
+        self._layout(self.capacity)
+        self._write_lock = threading.Lock()
+
+    def _layout(self, capacity: int) -> int:
+        offset = HEADER.size
+        self.seq_offset = offset
+        offset += SEQ.size
+        self.meta_offset = offset
+        offset = _align(offset + META.size)
+        self.status_offset = offset
+        offset = _align(offset + STATUS.size)
+        self.reading_offset = offset
+        offset = _align(offset + READING.size)
+        self.history_offset = offset
+        offset += HISTORY_STATE.size
+        self.labels_offset = offset
+        offset += LABEL.size * MAX_LABELS
+        self.column_offsets = {}
+        for name, _, width in COLUMNS:
+            offset = _align(offset)
+            self.column_offsets[name] = offset
+            offset += width * capacity
+        return offset
+
+    @classmethod
+    def size_for(cls, capacity: int) -> int:
+        probe = cls.__new__(cls)
+        return probe._layout(capacity)
+
+    @classmethod
+    def create(cls, name: str, capacity: int, instance_tag: str) -> "ScaleSegment":
+        """
+        Buat segmen baru (menimpa sisa segmen dari proses yang crash)
+
+        FileExistsError jika segmen masih dipegang writer yang hidup.
+        """
+        size = cls.size_for(capacity)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            pid = cls._existing_writer_pid(name)
+            if pid and pid != os.getpid() and _pid_alive(pid):
+                raise FileExistsError(
+                    f"Shared memory segment {name} is in use by writer pid {pid}"
+                ) from None
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, 0, capacity)
+        segment = cls(shm, owner=True)
+        META.pack_into(segment.buf, segment.meta_offset, os.getpid(), instance_tag.encode("ascii")[:64])
+        return segment
+
+    @classmethod
+    def _existing_writer_pid(cls, name: str) -> int:
+        """writer_pid segmen yang sudah ada (0 jika sudah ditutup atau bukan segmen timbangan)"""
+        try:
+            segment = cls.attach(name)
+        except (FileNotFoundError, ValueError, struct.error):
+            return 0
+        try:
+            return segment.writer_pid
+        finally:
+            segment.close()
+
+    @classmethod
+    def attach(cls, name: str) -> "ScaleSegment":
+        """Buka segmen yang sudah ada (FileNotFoundError jika belum dibuat)"""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Python < 3.13 registers attached segments with the resource
+            # tracker, which would unlink them when this worker exits. The
+            # tracker is shared by all uvicorn workers, so skip registering
+            # instead of unregistering afterwards.
+            with _TRACKER_LOCK:
+                register = shared_memory.resource_tracker.register
+                shared_memory.resource_tracker.register = lambda name, rtype: None
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                finally:
+                    shared_memory.resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    def close(self):
+        if self.owner:
+            with self.write():
+                META.pack_into(self.buf, self.meta_offset, 0, self.instance_tag.encode("ascii"))
+        self.buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A reader still holds a view (e.g. history column); leave it to GC
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+    # =========================
+    # Seqlock
+    # =========================
+
+    @property
+    def seq(self) -> int:
+        return SEQ.unpack_from(self.buf, self.seq_offset)[0]
+
+    @contextmanager
+    def write(self):
+        """Bracket penulisan: seq ganjil selama data sedang diubah"""
+        with self._write_lock:
+            seq = self.seq
+            SEQ.pack_into(self.buf, self.seq_offset, seq + 1)
+            try:
+                yield
+            finally:
+                SEQ.pack_into(self.buf, self.seq_offset, seq + 2)
+
+    def read(self, fn, retries: int = 1000):
+        """Jalankan ``fn`` sampai hasilnya konsisten (seq genap dan tidak berubah)"""
+        for attempt in range(retries):
+            before = self.seq
+            if not before & 1:
+                try:
+                    result = fn()
+                except Exception:
+                    # A torn copy can fail to decode; only a stable one is a real error
+                    if self.seq == before:
+                        raise
+                else:
+                    if self.seq == before:
+                        return result
+            if attempt > 10:
+                time.sleep(0.0001)
+        raise RuntimeError(f"Shared memory segment {self.name} kept changing while reading")
+
+    # =========================
+    # Fields
+    # =========================
+
+    @property
+    def writer_pid(self) -> int:
+        return META.unpack_from(self.buf, self.meta_offset)[0]
+
+    @property
+    def instance_tag(self) -> str:
+        return _text(META.unpack_from(self.buf, self.meta_offset)[1]) or ""
+
+    def publish(self, connection: ScaleConnection):
+        """Tulis status dan pembacaan terakhir koneksi (dipanggil writer)"""
+        cfg = connection.active_config
+        reading = connection.last_reading
+        with self.write():
+            STATUS.pack_into(
+                self.buf,
+                self.status_offset,
+                connection.is_connected,
+                connection.config_verified,
+                connection.packet_count,
+                connection.run_count,
+                connection.reconnect_count,
+                connection.raw_rate(),
+                cfg["baudrate"] if cfg else 0,
+                cfg["bytesize"] if cfg else 0,
+                cfg["parity"].encode("ascii") if cfg else b"N",
+                cfg["stopbits"] if cfg else 0,
+            )
+            if reading is not None:
+                raw = reading.raw.encode("ascii", errors="replace")[:128]
+                READING.pack_into(
+                    self.buf,
+                    self.reading_offset,
+                    True,
+                    reading.ts,
+                    reading.packet,
+                    (reading.stability or "").encode("ascii"),
+                    (reading.mode or "").encode("ascii"),
+                    reading.stable,
+                    reading.settled,
+                    reading.weight,
+                    reading.unit.encode("ascii"),
+                    len(raw),
+                    raw,
+                    reading.repeat,
+                    reading.last_ts,
+                    reading.rx_ns,
+                    reading.pub_ns,
+                )
+
+    def snapshot(self):
+        """(status, reading) konsisten dari segmen; reading None jika belum ada"""
+        buf = self.buf
+
+        def copy():
+            return (
+                STATUS.unpack_from(buf, self.status_offset),
+                READING.unpack_from(buf, self.reading_offset),
+            )
+
+        status, fields = self.read(copy)
+        (present, ts, packet, stability, mode, stable, settled, weight,
+         unit, raw_len, raw, repeat, last_ts, rx_ns, pub_ns) = fields
+        reading = None
+        if present:
+            reading = Reading(
+                ts=ts,
+                packet=packet,
+                stability=_text(stability),
+                mode=_text(mode),
+                stable=stable,
+                settled=settled,
+                weight=weight,
+                unit=_text(unit) or "kg",
+                raw=raw[:raw_len].decode("ascii", errors="replace"),
+                repeat=repeat,
+                last_ts=last_ts,
+                rx_ns=rx_ns,
+                pub_ns=pub_ns,
+            )
+        return status, reading
+
+
+class SharedReadingHistory(ReadingHistory):
+    """
+    ReadingHistory yang kolomnya berada di shared memory
+
+    Writer memakai ``append``/``extend_last`` seperti biasa; setiap
+    penulisan di-bracket seqlock segmen. Reader memakai ``query``, yang
+    menyalin kolom dan mengulang salinan jika writer menulis di tengahnya.
+    """
+
+    def __init__(self, segment: ScaleSegment):
+        self.segment = segment
+        self.capacity = segment.capacity
+        buf = segment.buf
+        for name, typecode, width in COLUMNS:
+            offset = segment.column_offsets[name]
+            setattr(self, name, buf[offset:offset + width * self.capacity].cast(typecode))
+        self._typecodes = {name: typecode for name, typecode, _ in COLUMNS}
+        self._state = buf[segment.history_offset:segment.history_offset + HISTORY_STATE.size].cast("q")
+        self._labels = [None]
+        self._codes = {None: 0}
+        self._lock = threading.Lock()
+
+    @property
+    def _head(self) -> int:
+        return self._state[0]
+
+    @_head.setter
+    def _head(self, value: int):
+        self._state[0] = value
+
+    @property
+    def _size(self) -> int:
+        return self._state[1]
+
+    @_size.setter
+    def _size(self, value: int):
+        self._state[1] = value
+
+    def release(self):
+        """Lepas view ke shared memory sebelum segmen ditutup"""
+        for name, _, _ in COLUMNS:
+            getattr(self, name).release()
+        self._state.release()
+
+    def _code(self, label: Optional[str]) -> int:
+        known = len(self._labels)
+        code = super()._code(label)
+        if len(self._labels) > known:
+            LABEL.pack_into(
+                self.segment.buf,
+                self.segment.labels_offset + LABEL.size * code,
+                label.encode("ascii", errors="replace")[:8],
+            )
+        return code
+
+    def _load_labels(self):
+        """Reader: tabel label dari writer"""
+        buf = self.segment.buf
+        labels = [None]
+        for code in range(1, MAX_LABELS):
+            label = _text(LABEL.unpack_from(buf, self.segment.labels_offset + LABEL.size * code)[0])
+            if label is None:
+                break
+            labels.append(label)
+        self._labels = labels
+
+    def append(self, ts: float, packet: int, weight: float, stability: Optional[str], mode: Optional[str]):
+        with self.segment.write():
+            super().append(ts, packet, weight, stability, mode)
+
+    def extend_last(self, ts: float):
+        with self.segment.write():
+            super().extend_last(ts)
+
+    def clear(self):
+        with self.segment.write():
+            super().clear()
+
+    def _slice(self, column, lo: int, hi: int) -> array:
+        """Salin sampel lo..hi ke array lokal (view shared memory bisa berubah)"""
+        copy = array(column.format)
+        if hi <= lo:
+            return copy
+        start = self._index(lo)
+        end = start + (hi - lo)
+        if end <= self.capacity:
+            copy.frombytes(column[start:end].cast("B"))
+        else:
+            copy.frombytes(column[start:].cast("B"))
+            copy.frombytes(column[:end - self.capacity].cast("B"))
+        return copy
+
+    def query(self, *args, **kwargs) -> Dict[str, Any]:
+        def copy():
+            self._load_labels()
+            return super(SharedReadingHistory, self).query(*args, **kwargs)
+
+        return self.segment.read(copy)
+
+
+class SharedScaleConnection(ScaleConnection):
+    """
+    Pandangan worker terhadap timbangan yang dipegang proses akuisisi
+
+    Tidak membuka port serial. Thread watcher memeriksa ``seq`` segmen
+    setiap ``watch_ms``; selama ``seq`` tidak berubah interval dilipatgandakan
+    sampai ``watch_max_ms`` (kira-kira jarak antar frame), dan kembali ke
+    ``watch_ms`` begitu ada perubahan. Jika berubah, status dan pembacaan
+    terakhir disalin, dan pembacaan baru dipublikasikan ke hub lokal sehingga
+    long-poll, SSE, WebSocket dan capture-stable bekerja seperti biasa.
+    Riwayat dibaca langsung dari shared memory. Jika beberapa pembacaan
+    baru terjadi dalam satu interval watch, hub worker hanya menerima yang
+    terakhir (riwayat tetap lengkap).
+
+    Histogram latensi tahap serial (receipt/parse/publish) hanya ada di
+    proses akuisisi; worker mencatat tahap publish -> response/stream,
+    diukur dari ``pub_ns`` writer (CLOCK_MONOTONIC sama untuk semua proses).
+    """
+
+    def __init__(self, *args, segment_name: str = "", watch_ms: int = 2, watch_max_ms: int = 50, **kwargs):
+        kwargs.update(handle_signals=False, enable_poll=False, history_size=1, capture_dir="")
+        super().__init__(*args, **kwargs)
+        self.segment_name = segment_name or self.scale_id
+        self.watch_interval = watch_ms / 1000
+        self.watch_max_interval = max(watch_ms, watch_max_ms) / 1000
+        self.segment: Optional[ScaleSegment] = None
+        self._seq = -1
+
+    def _attach(self) -> bool:
+        try:
+            segment = ScaleSegment.attach(self.segment_name)
+        except (FileNotFoundError, ValueError):
+            return False
+        if not segment.writer_pid:
+            segment.close()
+            return False
+        self._detach()
+        self.segment = segment
+        self.history = SharedReadingHistory(segment)
+        self.instance_tag = segment.instance_tag
+        self._seq = -1
+        logger.info(f"Attached to shared scale state {self.segment_name} (writer pid {segment.writer_pid})")
+        return True
+
+    def _detach(self):
+        if self.segment is not None:
+            history = self.history
+            self.history = ReadingHistory(1)
+            if isinstance(history, SharedReadingHistory):
+                history.release()
+            self.segment.close()
+            self.segment = None
+            self.is_connected = False
+            self._publish_status()
+
+    def _sync(self):
+        """Salin status dan pembacaan terakhir dari segmen"""
+        status, reading = self.segment.snapshot()
+        (connected, verified, packets, runs, reconnects, rate,
+         baudrate, bytesize, parity, stopbits) = status
+        self.is_connected = connected
+        self.config_verified = verified
+        self.packet_count = packets
+        self.run_count = runs
+        self.reconnect_count = reconnects
+        self._raw_rate = rate
+        self.active_config = {
+            "port": self.base_config["port"],
+            "baudrate": baudrate,
+            "bytesize": bytesize,
+            "parity": parity.decode("ascii"),
+            "stopbits": stopbits,
+        } if baudrate else None
+
+        last = self.last_reading
+        if reading is not None and reading != last:
+            self.last_reading = reading
+        self._publish_status()
+        if reading is not None and (last is None or reading.packet != last.packet):
+            self.hub.publish(reading)
+
+    def _watch_loop(self):
+        """Poll seq segmen; attach ulang jika proses akuisisi restart"""
+        idle_since = time.monotonic()
+        delay = self.watch_interval
+        while not self.is_shutting_down:
+            if self.segment is None:
+                if not self._attach():
+                    time.sleep(1.0)
+                    continue
+            seq = self.segment.seq
+            if seq != self._seq and not seq & 1:
+                try:
+                    self._sync()
+                    self._seq = seq
+                except RuntimeError as e:
+                    logger.warning(str(e))
+                idle_since = time.monotonic()
+                delay = self.watch_interval
+            elif time.monotonic() - idle_since > 1.0:
+                # Quiet for a while: writer may have exited or been replaced
+                idle_since = time.monotonic()
+                if not self.segment.writer_pid or self._replaced():
+                    logger.warning(f"Shared scale state {self.segment_name} went away, re-attaching")
+                    self._detach()
+                    continue
+            time.sleep(delay)
+            # Nothing new yet: back off towards the frame interval
+            delay = min(delay * 2, self.watch_max_interval)
+        self._detach()
+
+    def _replaced(self) -> bool:
+        try:
+            current = ScaleSegment.attach(self.segment_name)
+        except (FileNotFoundError, ValueError):
+            return True
+        try:
+            return current.instance_tag != self.segment.instance_tag
+        finally:
+            current.close()
+
+    def raw_rate(self) -> float:
+        return self._raw_rate
+
+    def start(self):
+        """Start watching the shared memory segment"""
+        if self.connection_thread is None or not self.connection_thread.is_alive():
+            self.is_shutting_down = False
+            self.connection_thread = threading.Thread(target=self._watch_loop, daemon=True)
+            self.connection_thread.start()
+            logger.info(f"Watching shared scale state {self.segment_name}")
+
+    def stop(self):
+        """Stop watching"""
+        self.is_shutting_down = True
+        if self.connection_thread:
+            self.connection_thread.join(timeout=5)
@@ -0,0 +1,122 @@
+"""
+Snapshot status koneksi timbangan (immutable, ditukar secara atomik)
+
+Thread pembaca (atau event loop / watcher shared memory) membuat
+``StatusSnapshot`` baru setiap kali status berubah dan menukar referensi
+``connection.status_snapshot`` dalam satu assignment. Route cukup membaca
+referensi tersebut: semua field berasal dari momen yang sama (packet_count
+selalu cocok dengan last_reading), tanpa lock di sisi pembaca.
+
+Membuat snapshot hanya mengisi satu tuple (``ScaleStatus``), karena
+status berubah setiap frame dan kebanyakan tidak pernah diminta. Dict,
+JSON, ETag dan ringkasan health dibuat saat pertama kali diminta lalu
+disimpan di snapshot, sehingga request berikutnya untuk status yang sama
+hanya mengembalikan bytes yang sudah ada.
+
+Dict ``status``/``health`` dibagi bersama oleh semua pembaca; jangan
+diubah.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+from services.reading import Reading
+
+
+class ScaleStatus(NamedTuple):
+    """Nilai status satu koneksi pada satu momen"""
+    scale_id: str
+    connected: bool
+    port: str
+    baudrate: int
+    # Dict konfigurasi tidak pernah diubah setelah dipasang di koneksi
+    active_config: Optional[Dict[str, Any]]
+    config_verified: bool
+    reconnect_count: int
+    packet_count: int
+    run_count: int
+    raw_rate_hz: float
+    poll: Optional[Dict[str, Any]]
+    last_reading: Optional[Reading]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict baru dengan bentuk yang sama seperti ConnectionStatusResponse"""
+        status = self._asdict()
+        if self.last_reading is not None:
+            status["last_reading"] = self.last_reading.to_dict()
+        return status
+
+
+def encode_json(value: Any) -> bytes:
+    """JSON ringkas UTF-8, sama dengan ``model_dump_json`` pydantic"""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def body_etag(body: bytes) -> str:
+    """ETag kuat dari isi body (sama di semua worker untuk body yang sama)"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+class StatusSnapshot:
+    """
+    ScaleStatus beserta bentuk serialnya
+
+    ``status``, ``body``, ``etag``, ``health`` dan ``health_body`` dibuat
+    sekali per snapshot. Dua pembaca yang pertama kali meminta bersamaan
+    bisa sama-sama membuatnya; hasilnya identik dan assignment atomik.
+    """
+
+    __slots__ = ("version", "values", "_status", "_body", "_etag", "_health", "_health_body")
+
+    def __init__(self, version: int, values: ScaleStatus):
+        self.version = version
+        self.values = values
+        self._status = self._body = self._etag = self._health = self._health_body = None
+
+    @property
+    def status(self) -> Dict[str, Any]:
+        status = self._status
+        if status is None:
+            status = self._status = self.values.to_dict()
+        return status
+
+    @property
+    def body(self) -> bytes:
+        body = self._body
+        if body is None:
+            body = self._body = encode_json(self.status)
+        return body
+
+    @property
+    def etag(self) -> str:
+        etag = self._etag
+        if etag is None:
+            etag = self._etag = body_etag(self.body)
+        return etag
+
+    @property
+    def health(self) -> Dict[str, Any]:
+        health = self._health
+        if health is None:
+            values = self.values
+            health = self._health = {
+                "healthy": values.connected,
+                "connected": values.connected,
+                "port": values.port,
+                "packet_count": values.packet_count,
+                "last_reading_available": values.last_reading is not None,
+            }
+        return health
+
+    @property
+    def health_body(self) -> bytes:
+        body = self._health_body
+        if body is None:
+            body = self._health_body = encode_json(self.health)
+        return body
+
+
+def same_snapshots(a: Sequence[StatusSnapshot], b: Sequence[StatusSnapshot]) -> bool:
+    """True jika kedua urutan berisi objek snapshot yang persis sama (cek identitas)"""
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
@@ -0,0 +1,584 @@
+"""
+Operasi database tiket timbangan (async)
+
+Semua fungsi menerima ``AsyncSession`` dari ``database.get_async_db`` dan
+tidak melakukan I/O sinkron, sehingga aman dipanggil dari route
+``async def``: selama query menunggu database, event loop tetap melayani
+/api/scale/reading, SSE dan WebSocket.
+"""
+
+import base64
+import json
+import logging
+import uuid as uuid_lib
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Date, cast, delete, func, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import NO_URUT_SEQUENCE, Timbangan, TimbanganHarian, TimbanganNoUrut
+from schemas import TimbanganCreate, TimbanganUpdate, to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+# Percobaan ulang jika no_urut sudah terpakai (counter tertinggal dari data)
+NO_URUT_RETRIES = 3
+
+# Field Numeric: float dari schema disimpan sebagai Decimal tanpa galat biner
+DECIMAL_FIELDS = ("gross", "nett", "rate")
+
+# Bulk: di bawah jumlah ini multi-row INSERT sama cepatnya dengan COPY
+COPY_MIN_ROWS = 1000
+BULK_COLUMNS = (
+    "uuid", "no_urut", "nopol", "sopir", "gross", "rate", "nett",
+    "tanggalwaktu", "petugas", "created_at", "updated_at", "catatan",
+)
+
+_BULK_ROWS = TypeAdapter(List[TimbanganCreate])
+
+
+def _to_columns(values: dict) -> dict:
+    return {
+        key: Decimal(str(value)) if key in DECIMAL_FIELDS and value is not None else value
+        for key, value in values.items()
+    }
+
+
+# =========================
+# Rollup harian
+# =========================
+
+RollupKey = Tuple[date, str, str]
+
+
+def _rollup_key(values) -> RollupKey:
+    """(tanggal, nopol, petugas) dari dict kolom atau objek Timbangan"""
+    get = values.get if isinstance(values, dict) else lambda key: getattr(values, key)
+    # Same default and UTC normalisation as create_timbangan
+    tanggalwaktu = to_naive_utc(get("tanggalwaktu")) or datetime.utcnow()
+    return tanggalwaktu.date(), get("nopol"), get("petugas")
+
+
+def _add_delta(deltas: Dict[RollupKey, list], values, sign: int = 1):
+    """Tambahkan (sign=1) atau kurangkan (sign=-1) satu tiket ke deltas"""
+    get = values.get if isinstance(values, dict) else lambda key: getattr(values, key)
+    delta = deltas.setdefault(_rollup_key(values), [0, Decimal(0), Decimal(0)])
+    delta[0] += sign
+    delta[1] += sign * (get("gross") or 0)
+    delta[2] += sign * (get("nett") or 0)
+
+
+_ROLLUP_UPSERTS = {}
+
+
+def _rollup_upsert(dialect: str):
+    """INSERT ... ON CONFLICT (tanggal, nopol, petugas) DO UPDATE yang menjumlahkan delta"""
+    statement = _ROLLUP_UPSERTS.get(dialect)
+    if statement is None:
+        table = TimbanganHarian.__table__
+        upsert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        statement = _ROLLUP_UPSERTS[dialect] = upsert.on_conflict_do_update(
+            index_elements=[table.c.tanggal, table.c.nopol, table.c.petugas],
+            set_={
+                "jumlah": table.c.jumlah + upsert.excluded.jumlah,
+                "total_gross": table.c.total_gross + upsert.excluded.total_gross,
+                "total_nett": table.c.total_nett + upsert.excluded.total_nett,
+            },
+        )
+    return statement
+
+
+async def _apply_rollup(db: AsyncSession, deltas: Dict[RollupKey, list]):
+    """Tulis delta rollup di transaksi session (belum commit)"""
+    rows = [
+        {"tanggal": key[0], "nopol": key[1], "petugas": key[2],
+         "jumlah": count, "total_gross": gross, "total_nett": nett}
+        # Sorted so concurrent transactions lock rollup rows in the same order
+        for key, (count, gross, nett) in sorted(deltas.items())
+        if count or gross or nett
+    ]
+    if rows:
+        await db.execute(_rollup_upsert(db.bind.dialect.name), rows)
+
+
+async def rebuild_rollup(db: AsyncSession):
+    """
+    Hitung ulang seluruh timbangan_harian dari tabel timbangan dan commit
+
+    Untuk data yang dimasukkan tanpa lewat service ini (import SQL, seed).
+    """
+    table = TimbanganHarian.__table__
+    day = cast(Timbangan.tanggalwaktu, Date) if db.bind.dialect.name == "postgresql" else func.date(Timbangan.tanggalwaktu)
+    await db.execute(delete(table))
+    await db.execute(insert(table).from_select(
+        ["tanggal", "nopol", "petugas", "jumlah", "total_gross", "total_nett"],
+        select(day, Timbangan.nopol, Timbangan.petugas, func.count(), func.sum(Timbangan.gross), func.sum(Timbangan.nett))
+        .group_by(day, Timbangan.nopol, Timbangan.petugas),
+    ))
+    await db.commit()
+
+
+
+async def summarize_timbangan(
+    db: AsyncSession,
+    date_from: datetime,
+    date_to: datetime,
+    nopol: Optional[str] = None,
+    petugas: Optional[str] = None,
+) -> Tuple[int, Decimal, Decimal]:
+    """
+    (jumlah tiket, total gross, total nett) untuk date_from <= tanggalwaktu < date_to
+
+    Hari yang tercakup penuh dibaca dari timbangan_harian; hanya sisa di
+    awal dan akhir rentang (masing-masing < 1 hari) yang dijumlahkan dari
+    tabel timbangan lewat ix_timbangan_tanggalwaktu. Biayanya bergantung
+    pada jumlah hari dan volume satu hari, bukan ukuran tabel.
+    """
+    date_from, date_to = to_naive_utc(date_from), to_naive_utc(date_to)
+    first_day = date_from.date() if date_from.time() == datetime.min.time() else date_from.date() + timedelta(days=1)
+    end_day = date_to.date()
+    if first_day >= end_day:
+        # No whole day inside the range
+        return await _sum_tickets(db, date_from, date_to, nopol, petugas)
+
+    rollup = TimbanganHarian.__table__
+    query = select(
+        func.coalesce(func.sum(rollup.c.jumlah), 0),
+        func.coalesce(func.sum(rollup.c.total_gross), 0),
+        func.coalesce(func.sum(rollup.c.total_nett), 0),
+    ).where(rollup.c.tanggal >= first_day, rollup.c.tanggal < end_day)
+    if nopol:
+        query = query.where(rollup.c.nopol == nopol)
+    if petugas:
+        query = query.where(rollup.c.petugas == petugas)
+    count, gross, nett = (await db.execute(query)).one()
+
+    for start, end in (
+        (date_from, datetime.combine(first_day, datetime.min.time())),
+        (datetime.combine(end_day, datetime.min.time()), date_to),
+    ):
+        if start < end:
+            edge_count, edge_gross, edge_nett = await _sum_tickets(db, start, end, nopol, petugas)
+            count += edge_count
+            gross += edge_gross
+            nett += edge_nett
+    return count, Decimal(gross), Decimal(nett)
+
+
+async def _sum_tickets(
+    db: AsyncSession,
+    date_from: datetime,
+    date_to: datetime,
+    nopol: Optional[str],
+    petugas: Optional[str],
+) -> Tuple[int, Decimal, Decimal]:
+    query = _filter(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Timbangan.gross), 0),
+            func.coalesce(func.sum(Timbangan.nett), 0),
+        ),
+        nopol, date_from, date_to,
+    )
+    if petugas:
+        query = query.where(Timbangan.petugas == petugas)
+    count, gross, nett = (await db.execute(query)).one()
+    return count, Decimal(gross), Decimal(nett)
+
+
+# =========================
+# no_urut
+# =========================
+
+class NoUrutAllocator:
+    """
+    no_urut dari sequence PostgreSQL, dengan cache blok per proses
+
+    ``nextval()`` tidak ikut rollback dan tidak mengunci tabel, sehingga
+    nomor yang sudah diambil aman disimpan di proses ini. Dengan
+    ``block_size`` > 1 satu round trip mencadangkan satu blok nomor untuk
+    request berikutnya. Nomor sisa hilang saat proses berhenti (gap) dan
+    tiket dari worker berbeda tidak lagi urut waktu.
+    """
+
+    def __init__(self, block_size: int = 1):
+        self.block_size = max(1, block_size)
+        self._cache = deque()
+
+    async def take(self, db: AsyncSession, count: int) -> List[int]:
+        cache = self._cache
+        numbers = [cache.popleft() for _ in range(min(count, len(cache)))]
+        missing = count - len(numbers)
+        if missing:
+            fetched = list(await db.scalars(
+                text(f"SELECT nextval('{NO_URUT_SEQUENCE}') FROM generate_series(1, :n)"),
+                {"n": max(missing, self.block_size)},
+            ))
+            numbers += fetched[:missing]
+            cache.extend(fetched[missing:])
+        return numbers
+
+    def clear(self):
+        self._cache.clear()
+
+
+no_urut_allocator = NoUrutAllocator(settings.no_urut_block_size)
+
+
+def _current_no_urut():
+    return select(func.coalesce(func.max(Timbangan.no_urut), 0)).scalar_subquery()
+
+
+async def _take_counter(db: AsyncSession, count: int) -> List[int]:
+    """Naikkan counter TimbanganNoUrut di transaksi session (SQLite)"""
+    counter = TimbanganNoUrut.__table__
+    # A single write statement: an UPDATE that found no row would leave a read
+    # lock in the transaction, and two such transactions deadlock on upgrade
+    last = await db.scalar(
+        sqlite_insert(counter)
+        .values(id=1, value=_current_no_urut() + count)
+        .on_conflict_do_update(index_elements=["id"], set_={"value": counter.c.value + count})
+        .returning(counter.c.value)
+    )
+    return list(range(last - count + 1, last + 1))
+
+
+async def allocate_no_urut(db: AsyncSession, count: int = 1) -> List[int]:
+    """
+    ``count`` no_urut baru, naik sesuai urutan
+
+    PostgreSQL: sequence (tanpa lock, nomor yang batal menjadi gap).
+    SQLite: counter satu baris yang ikut transaksi; SQLite memang hanya
+    mengizinkan satu penulis, jadi tidak menambah antrian.
+    """
+    if db.bind.dialect.supports_sequences:
+        return await no_urut_allocator.take(db, count)
+    return await _take_counter(db, count)
+
+
+async def resync_no_urut(db: AsyncSession):
+    """
+    Majukan sequence/counter ke MAX(no_urut)
+
+    Diperlukan setelah baris dimasukkan dengan no_urut eksplisit (import,
+    seed); dipanggil otomatis saat insert bentrok di unique index.
+    """
+    if db.bind.dialect.supports_sequences:
+        no_urut_allocator.clear()
+        # Never moves backwards: other processes may hold uncommitted numbers above MAX
+        await db.execute(text(
+            f"SELECT setval('{NO_URUT_SEQUENCE}', GREATEST("
+            f"(SELECT COALESCE(MAX(no_urut), 0) FROM {Timbangan.__tablename__}), "
+            f"(SELECT last_value FROM {NO_URUT_SEQUENCE})))"
+        ))
+    else:
+        counter = TimbanganNoUrut.__table__
+        await db.execute(
+            sqlite_insert(counter)
+            .values(id=1, value=_current_no_urut())
+            .on_conflict_do_update(
+                index_elements=["id"],
+                set_={"value": func.max(counter.c.value, _current_no_urut())},
+            )
+        )
+
+
+async def create_timbangan(db: AsyncSession, data: TimbanganCreate) -> Timbangan:
+    """Simpan tiket baru dan commit"""
+    values = _to_columns(data.model_dump(exclude_none=True))
+    values["tanggalwaktu"] = to_naive_utc(values.get("tanggalwaktu")) or datetime.utcnow()
+    deltas = {}
+    _add_delta(deltas, values)
+    for attempt in range(NO_URUT_RETRIES):
+        [no_urut] = await allocate_no_urut(db)
+        await _apply_rollup(db, deltas)
+        ticket = Timbangan(no_urut=no_urut, **values)
+        db.add(ticket)
+        try:
+            await db.commit()
+            return ticket
+        except IntegrityError:
+            await db.rollback()
+            if attempt == NO_URUT_RETRIES - 1:
+                raise
+            logger.warning("no_urut %s already taken, resyncing counter", no_urut)
+            await resync_no_urut(db)
+            await db.commit()
+
+
+async def get_timbangan(db: AsyncSession, uuid: UUID) -> Optional[Timbangan]:
+    return await db.get(Timbangan, uuid)
+
+
+async def update_timbangan(db: AsyncSession, ticket: Timbangan, data: TimbanganUpdate) -> Timbangan:
+    """Ubah field yang dikirim saja (partial update) dan commit"""
+    # Row lock on PostgreSQL: the rollup delta is computed from the current values
+    await db.refresh(ticket, with_for_update=True)
+    deltas = {}
+    _add_delta(deltas, ticket, -1)
+    for key, value in _to_columns(data.model_dump(exclude_unset=True)).items():
+        setattr(ticket, key, value)
+    _add_delta(deltas, ticket)
+    await _apply_rollup(db, deltas)
+    await db.commit()
+    return ticket
+
+
+async def delete_timbangan(db: AsyncSession, ticket: Timbangan):
+    await db.refresh(ticket, with_for_update=True)
+    deltas = {}
+    _add_delta(deltas, ticket, -1)
+    await _apply_rollup(db, deltas)
+    await db.delete(ticket)
+    await db.commit()
+
+
+def _filter(query, nopol: Optional[str], date_from: Optional[datetime], date_to: Optional[datetime]):
+    if nopol:
+        query = query.where(Timbangan.nopol == nopol)
+    # tanggalwaktu is naive UTC; aware bounds are converted, not compared as wall time
+    if date_from is not None:
+        query = query.where(Timbangan.tanggalwaktu >= to_naive_utc(date_from))
+    if date_to is not None:
+        query = query.where(Timbangan.tanggalwaktu < to_naive_utc(date_to))
+    return query
+
+
+async def list_timbangan(
+    db: AsyncSession,
+    page: int = 1,
+    page_size: int = 50,
+    nopol: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> Tuple[int, List[Timbangan]]:
+    """(total, tiket di halaman ``page``), terbaru dulu"""
+    query = _filter(select(Timbangan), nopol, date_from, date_to)
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    rows = await db.scalars(
+        query.order_by(Timbangan.tanggalwaktu.desc(), Timbangan.no_urut.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    return total, list(rows)
+
+
+# =========================
+# Keyset (cursor) pagination
+# =========================
+
+class InvalidCursor(ValueError):
+    """Cursor bukan hasil encode_cursor"""
+
+
+def encode_cursor(direction: str, ticket: Timbangan) -> str:
+    """Cursor opaque: arah ("next"/"prev") + posisi (tanggalwaktu, uuid)"""
+    raw = f"{direction}|{ticket.tanggalwaktu.isoformat()}|{ticket.uuid.hex}"
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        direction, tanggalwaktu, uuid = raw.split("|")
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(tanggalwaktu), UUID(hex=uuid)
+    except ValueError as exc:  # binascii.Error and UnicodeDecodeError included
+        raise InvalidCursor(cursor) from exc
+
+
+async def list_timbangan_cursor(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    nopol: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> Tuple[List[Timbangan], Optional[str], Optional[str]]:
+    """
+    Satu halaman tiket, terbaru dulu, urut (tanggalwaktu, uuid)
+
+    Halaman dimulai tepat setelah posisi di cursor (``WHERE tanggalwaktu
+    <= :t AND (tanggalwaktu < :t OR uuid < :u) ... LIMIT``), sehingga
+    database cukup menelusuri ix_timbangan_tanggalwaktu dari posisi itu:
+    halaman ke-10.000 sama murahnya dengan halaman pertama. Filter harus
+    sama dengan request yang menghasilkan cursor.
+
+    Returns (tiket, next_cursor, prev_cursor); cursor None jika tidak ada
+    halaman ke arah tersebut. Raise InvalidCursor jika cursor rusak.
+    """
+    query = _filter(select(Timbangan), nopol, date_from, date_to)
+    direction = "next"
+    if cursor is not None:
+        direction, tanggalwaktu, uuid = decode_cursor(cursor)
+        if direction == "next":
+            query = query.where(
+                Timbangan.tanggalwaktu <= tanggalwaktu,
+                or_(Timbangan.tanggalwaktu < tanggalwaktu, Timbangan.uuid < uuid),
+            )
+        else:
+            query = query.where(
+                Timbangan.tanggalwaktu >= tanggalwaktu,
+                or_(Timbangan.tanggalwaktu > tanggalwaktu, Timbangan.uuid > uuid),
+            )
+
+    if direction == "next":
+        query = query.order_by(Timbangan.tanggalwaktu.desc(), Timbangan.uuid.desc())
+    else:
+        query = query.order_by(Timbangan.tanggalwaktu.asc(), Timbangan.uuid.asc())
+    # One extra row tells whether another page exists in this direction
+    rows = list(await db.scalars(query.limit(limit + 1)))
+    more = len(rows) > limit
+    rows = rows[:limit]
+
+    if direction == "prev":
+        if not more:
+            # Reached the newest rows: serve a full first page instead of a short one
+            return await list_timbangan_cursor(db, limit, None, nopol, date_from, date_to)
+        rows.reverse()
+        has_next, has_prev = True, True
+    else:
+        has_next, has_prev = more, cursor is not None
+
+    next_cursor = encode_cursor("next", rows[-1]) if has_next and rows else None
+    prev_cursor = encode_cursor("prev", rows[0]) if has_prev and rows else None
+    return rows, next_cursor, prev_cursor
+
+
+async def estimate_timbangan_count(
+    db: AsyncSession,
+    nopol: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> Optional[int]:
+    """
+    Perkiraan jumlah tiket tanpa COUNT(*)
+
+    PostgreSQL: jumlah baris yang diperkirakan planner (``EXPLAIN``, dari
+    statistik ANALYZE / autovacuum), termasuk filter. SQLite: ``MAX(rowid)``
+    tanpa filter (tidak berkurang oleh DELETE). Selain itu None.
+    """
+    dialect = db.bind.dialect
+    if dialect.name == "postgresql":
+        query = _filter(select(Timbangan.uuid), nopol, date_from, date_to)
+        # Filter values stay bound parameters, passed straight to the driver
+        compiled = query.compile(dialect=dialect)
+        params = compiled.params
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        connection = await db.connection()
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    if dialect.name == "sqlite" and not (nopol or date_from or date_to):
+        return await db.scalar(text(f"SELECT coalesce(max(rowid), 0) FROM {Timbangan.__tablename__}"))
+    return None
+
+
+# =========================
+# Bulk
+# =========================
+
+def validate_bulk(rows: Sequence[Any]) -> Tuple[List[Tuple[int, TimbanganCreate]], List[Dict[str, Any]]]:
+    """
+    Validasi semua baris dalam satu pass pydantic-core
+
+    Returns (baris valid sebagai (index, TimbanganCreate), error per baris).
+    Hanya jika ada baris yang gagal, baris sisanya divalidasi sekali lagi.
+    """
+    try:
+        return list(enumerate(_BULK_ROWS.validate_python(rows))), []
+    except ValidationError as exc:
+        by_row = defaultdict(list)
+        for error in exc.errors(include_url=False, include_context=False):
+            index, *loc = error["loc"]
+            by_row[index].append({"loc": loc, "msg": error["msg"], "type": error["type"]})
+    valid = [index for index in range(len(rows)) if index not in by_row]
+    tickets = _BULK_ROWS.validate_python([rows[index] for index in valid])
+    errors = [{"index": index, "errors": by_row[index]} for index in sorted(by_row)]
+    return list(zip(valid, tickets)), errors
+
+
+def _is_unique_violation(exc: Exception) -> bool:
+    # COPY goes through the raw asyncpg connection, which is not wrapped by SQLAlchemy
+    return isinstance(exc, IntegrityError) or getattr(exc, "sqlstate", None) == "23505"
+
+
+async def _copy_records(db: AsyncSession, records: List[Dict[str, Any]]):
+    """PostgreSQL COPY lewat koneksi asyncpg milik transaksi session"""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        Timbangan.__tablename__,
+        records=[tuple(record[column] for column in BULK_COLUMNS) for record in records],
+        columns=BULK_COLUMNS,
+    )
+
+
+async def bulk_create_timbangan(
+    db: AsyncSession,
+    tickets: Sequence[TimbanganCreate],
+) -> Tuple[str, List[Tuple[UUID, int]]]:
+    """
+    Simpan banyak tiket dalam satu transaksi
+
+    PostgreSQL (asyncpg) dengan >= COPY_MIN_ROWS baris memakai COPY;
+    selain itu multi-row ``INSERT ... RETURNING`` yang dipecah per batch
+    oleh SQLAlchemy (insertmanyvalues). no_urut dialokasikan sekaligus
+    (naik sesuai urutan request) lewat allocate_no_urut.
+
+    Returns (method, [(uuid, no_urut) sesuai urutan tickets]).
+    """
+    if not tickets:
+        return "insert", []
+    use_copy = db.bind.dialect.driver == "asyncpg" and len(tickets) >= COPY_MIN_ROWS
+    for attempt in range(NO_URUT_RETRIES):
+        numbers = await allocate_no_urut(db, len(tickets))
+        now = datetime.utcnow()
+        records = []
+        for no_urut, ticket in zip(numbers, tickets):
+            record = _to_columns(ticket.model_dump())
+            record.update(
+                uuid=uuid_lib.uuid4(),
+                no_urut=no_urut,
+                tanggalwaktu=to_naive_utc(record["tanggalwaktu"]) or now,
+                created_at=now,
+                updated_at=now,
+            )
+            records.append(record)
+        deltas = {}
+        for record in records:
+            _add_delta(deltas, record)
+        try:
+            await _apply_rollup(db, deltas)
+            if use_copy:
+                await _copy_records(db, records)
+                keys = [(record["uuid"], record["no_urut"]) for record in records]
+            else:
+                result = await db.execute(
+                    insert(Timbangan).returning(
+                        Timbangan.uuid, Timbangan.no_urut, sort_by_parameter_order=True
+                    ),
+                    records,
+                )
+                keys = [tuple(row) for row in result]
+            await db.commit()
+            return ("copy" if use_copy else "insert"), keys
+        except Exception as exc:
+            await db.rollback()
+            if not _is_unique_violation(exc) or attempt == NO_URUT_RETRIES - 1:
+                raise
+            logger.warning("no_urut block from %s already taken, resyncing counter", numbers[0])
+            await resync_no_urut(db)
+            await db.commit()
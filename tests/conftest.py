@@ -0,0 +1,60 @@
+"""
+Fixture pytest: database SQLite sementara dan app dengan router timbangan
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SCALE_AUTO_START"] = "false"
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["DATABASE_ASYNC_URL"] = ""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    import models  # noqa: F401
+    from database import async_engine, init_db
+    from routes import timbangan
+
+    init_db()
+    app = FastAPI()
+    app.include_router(timbangan.router)
+    with TestClient(app) as test_client:
+        yield test_client
+        # aiosqlite connections run in non-daemon threads
+        test_client.portal.call(async_engine.dispose)
+
+
+@pytest.fixture
+def ticket():
+    return {"nopol": "B 1234 CD", "sopir": "Budi", "gross": 24000.5, "nett": 16000.25, "petugas": "Ani"}
+
+
+@pytest.fixture
+def scale_manager(monkeypatch):
+    """ScaleManager berisi satu timbangan tanpa port serial (diisi lewat _process_chunk)"""
+    from routes import scale as scale_routes
+    from services import scale_manager as manager_module
+    from services.connect import ScaleConnection
+
+    manager = manager_module.ScaleManager()
+    manager.add(ScaleConnection(scale_id="default", handle_signals=False, enable_poll=False, history_size=64))
+    monkeypatch.setattr(manager_module, "_scale_manager", manager)
+    monkeypatch.setattr(scale_routes, "_snapshot_cache", {})
+    return manager
+
+
+@pytest.fixture
+def scale_client(scale_manager):
+    from routes import scale as scale_routes
+
+    app = FastAPI()
+    app.include_router(scale_routes.router)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,94 @@
+"""
+Test transport asyncio (AsyncScaleConnection) dengan pseudo-terminal
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from services.connect import ScaleConnection, create_scale_connection
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="transport asyncio hanya POSIX")
+
+FRAME = b"ST,GS,12.50kg\r\n"
+
+
+def open_pty():
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+    os.close(slave)
+    return master, name
+
+
+def pty_connection(port: str):
+    return create_scale_connection(
+        transport="asyncio", port=port, probe_ms=0, enable_poll=False,
+        handle_signals=False, history_size=16, reconnect_ms=50, reconnect_max_ms=100,
+    )
+
+
+def test_transport_selection():
+    from services.async_connect import AsyncScaleConnection
+
+    assert isinstance(create_scale_connection(transport="asyncio", handle_signals=False), AsyncScaleConnection)
+    assert type(create_scale_connection(transport="thread", handle_signals=False)) is ScaleConnection
+    with pytest.raises(ValueError):
+        create_scale_connection(transport="udp", handle_signals=False)
+
+
+def test_frames_are_read_on_the_event_loop():
+    master, port = open_pty()
+    scale = pty_connection(port)
+
+    async def run():
+        scale.start()
+        try:
+            for _ in range(100):
+                if scale.is_connected:
+                    break
+                await asyncio.sleep(0.01)
+            # Split across writes: the rx buffer joins the halves
+            os.write(master, FRAME[:6])
+            await asyncio.sleep(0.02)
+            os.write(master, FRAME[6:] + b"ST,GS,13.00kg\r\n")
+            return await scale.wait_for_reading(1, 2.0)
+        finally:
+            scale.stop()
+            await asyncio.gather(scale.connection_task, return_exceptions=True)
+
+    try:
+        reading = asyncio.run(run())
+    finally:
+        os.close(master)
+    assert reading is not None
+    assert (reading.packet, reading.weight) == (2, 13.0)
+    assert scale.get_status()["active_config"]["port"] == port
+    assert not scale.is_connected
+
+
+def test_closed_port_is_detected_and_reconnect_backs_off():
+    master, port = open_pty()
+    scale = pty_connection(port)
+
+    async def run():
+        scale.start()
+        try:
+            for _ in range(100):
+                if scale.is_connected:
+                    break
+                await asyncio.sleep(0.01)
+            assert scale.is_connected
+            os.close(master)
+            for _ in range(200):
+                if scale.reconnect_count:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            scale.stop()
+            await asyncio.gather(scale.connection_task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert scale.reconnect_count >= 1
+    assert not scale.is_connected
@@ -0,0 +1,43 @@
+"""
+Test capture serial mentah dan replay
+"""
+
+from services.capture import CaptureWriter, replay
+from services.connect import ScaleConnection
+
+
+def test_replay_uses_recorded_receive_time(tmp_path):
+    writer = CaptureWriter(str(tmp_path), rotate_s=0, max_bytes=0)
+    start_ns = 1_000_000_000_000
+    for i in range(3):
+        writer.write(b"ST,GS,100.00kg\r\n", start_ns + i * 600_000_000)
+    writer.close()
+
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    readings = []
+    stats = replay([writer.path], connection, on_reading=readings.append)
+
+    assert stats["frames"] == 3
+    # Replayed in microseconds, but the capture spans 1.2 s: long enough
+    # for the 1 s stability window
+    assert [reading.settled for reading in readings] == [False, True]
+    last = connection.last_reading
+    assert last.rx_ns == start_ns + 1_200_000_000
+    assert round(last.last_ts - readings[0].ts, 3) == 1.2
+
+
+def test_replay_rate_follows_recorded_clock(tmp_path):
+    writer = CaptureWriter(str(tmp_path), rotate_s=0, max_bytes=0)
+    # Recorded on another boot, shortly after it started: the recorded
+    # clock is behind this process's monotonic clock
+    start_ns = 1_000_000_000
+    for i in range(31):
+        writer.write(b"ST,GS,%d.00kg\r\n" % i, start_ns + i * 100_000_000)
+    writer.close()
+
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    replay([writer.path], connection)
+
+    # 10 frames/s in the capture, although the replay took milliseconds
+    assert round(connection.raw_rate(), 1) == 10.0
+    assert connection.get_status()["raw_rate_hz"] == 10.0
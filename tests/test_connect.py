@@ -0,0 +1,120 @@
+"""
+Test ScaleConnection: probe konfigurasi serial, deteksi stabil dan capture-stable
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+from services.connect import ScaleConnection, StabilityDetector
+
+FRAME = b"ST,GS,100.00kg\r\n"
+
+
+def settled_connection(age_s: float) -> ScaleConnection:
+    """Koneksi dengan pembacaan settled yang frame terakhirnya berumur age_s"""
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    last_ns = time.monotonic_ns() - int(age_s * 1e9)
+    for i in range(3):
+        connection._process_chunk(FRAME, last_ns - (2 - i) * 600_000_000)
+    assert connection.last_reading.settled
+    return connection
+
+
+def test_wait_for_settled_returns_fresh_reading():
+    connection = settled_connection(0)
+    connection.is_connected = True
+    assert asyncio.run(connection.wait_for_settled(0.05)) is connection.last_reading
+
+
+def test_wait_for_settled_ignores_disconnected_port():
+    connection = settled_connection(0)
+    connection.is_connected = False
+    assert asyncio.run(connection.wait_for_settled(0.05)) is None
+
+
+def test_wait_for_settled_ignores_stale_reading():
+    connection = settled_connection(5)
+    connection.is_connected = True
+    assert asyncio.run(connection.wait_for_settled(0.05)) is None
+
+
+class FakeSerial:
+    """Port serial palsu: setiap read() mengembalikan chunk dari ``source``"""
+
+    def __init__(self, source):
+        self.source = source
+        self.reads = 0
+
+    def read(self, size):
+        self.reads += 1
+        time.sleep(0.001)
+        return self.source(size)
+
+    def write(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+def probe(source, probe_ms=200):
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, probe_ms=probe_ms, history_size=16)
+    port = FakeSerial(source)
+    connection._open_serial = lambda cfg, timeout=None: port
+    start = time.monotonic()
+    score = connection._probe(connection.base_config)
+    return score, time.monotonic() - start, connection
+
+
+def test_probe_does_not_accept_line_noise():
+    rng = random.Random(8)
+    chunks = []
+
+    def noise(size):
+        chunk = rng.randbytes(size)
+        chunks.append(chunk)
+        return chunk
+
+    score, elapsed, connection = probe(noise)
+
+    assert score == 0.0
+    # No early "all frames parsed" exit: the whole window was spent listening
+    assert elapsed >= 0.2
+    # The lenient fallback alone would have accepted part of this noise
+    lines = connection.rx_buffer.feed(b"".join(chunks))
+    assert any(connection.frame_parser.parse(line) for line in lines)
+
+
+def test_probe_accepts_clean_frames_early():
+    score, elapsed, _ = probe(lambda size: FRAME, probe_ms=2000)
+    assert score == 1.0
+    assert elapsed < 1.0
+
+
+def test_stability_detector_std_matches_window():
+    rng = random.Random(3)
+    detector = StabilityDetector(tolerance=1000, duration_ms=1000)
+    for i in range(2000):
+        detector.update(i * 0.02, 1000 + rng.uniform(-3, 3))
+    window = [x for _, x in detector._window]
+    assert abs(detector.stddev - statistics.pstdev(window)) < 1e-9
+    assert abs(detector.mean - statistics.fmean(window)) < 1e-9
+
+
+def test_stability_detector_rejects_noise_within_tolerance():
+    # Alternating +-4: every sample within the 5.0 tolerance, std 4.0
+    noisy = StabilityDetector(tolerance=5.0, duration_ms=1000, max_std=2.5)
+    unbounded = StabilityDetector(tolerance=5.0, duration_ms=1000, max_std=0)
+    for i in range(100):
+        x = 1000 + (4 if i % 2 else -4)
+        noisy.update(i * 0.02, x)
+        unbounded.update(i * 0.02, x)
+    assert not noisy.settled
+    assert unbounded.settled
+
+    quiet = StabilityDetector(tolerance=5.0, duration_ms=1000, max_std=2.5)
+    for i in range(100):
+        quiet.update(i * 0.02, 1000 + (1 if i % 2 else -1))
+    assert quiet.settled
@@ -0,0 +1,22 @@
+"""
+Test emulator indikator: frame harus diterima dialect yang dituju
+"""
+
+import pytest
+
+from services.emulator import format_lenient, format_sgw3015p
+from services.frame_parser import FrameParser
+
+
+@pytest.mark.parametrize("value", [0.0, 0.5, 1234.5, 99999.99, -12.25])
+@pytest.mark.parametrize("stable", [True, False])
+def test_sgw3015p_frames_parse_with_strict_dialect(value, stable):
+    parsed = FrameParser(["sgw3015p"]).parse(format_sgw3015p(value, stable, "GS"))
+    assert parsed is not None
+    assert (parsed.value, parsed.stable, parsed.mode, parsed.unit) == (value, stable, "GS", "kg")
+
+
+def test_lenient_frames_need_lenient_dialect():
+    frame = format_lenient(1234.5, True, "NT")
+    assert FrameParser(["sgw3015p"]).parse(frame) is None
+    assert FrameParser(["lenient"]).parse(frame).value == 1234.5
@@ -0,0 +1,59 @@
+"""
+Test ETag / If-None-Match (304) pada /reading dan /status
+"""
+
+import time
+
+FRAME = b"ST,GS,12.50kg\r\n"
+
+
+def test_reading_304_until_a_new_packet_arrives(scale_client, scale_manager):
+    scale = scale_manager.default
+    scale._process_chunk(FRAME, time.monotonic_ns())
+    first = scale_client.get("/api/scale/reading")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+
+    cached = scale_client.get("/api/scale/reading", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # Identical frame only grows the run: still the same reading
+    scale._process_chunk(FRAME, time.monotonic_ns())
+    assert scale_client.get("/api/scale/reading", headers={"If-None-Match": etag}).status_code == 304
+
+    scale._process_chunk(b"ST,GS,13.00kg\r\n", time.monotonic_ns())
+    changed = scale_client.get("/api/scale/reading", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["weight"] == 13.0
+
+
+def test_if_none_match_list_and_wildcard(scale_client, scale_manager):
+    scale_manager.default._process_chunk(FRAME, time.monotonic_ns())
+    etag = scale_client.get("/api/scale/reading").headers["etag"]
+    strong = etag.removeprefix("W/")
+    for header in (f'"other", {strong}', "*"):
+        assert scale_client.get("/api/scale/reading", headers={"If-None-Match": header}).status_code == 304
+    assert scale_client.get("/api/scale/reading", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_status_304_until_status_changes(scale_client, scale_manager):
+    first = scale_client.get("/api/scale/status")
+    etag = first.headers["etag"]
+    assert first.json()["scales"]["default"]["packet_count"] == 0
+    assert scale_client.get("/api/scale/status", headers={"If-None-Match": etag}).status_code == 304
+
+    scale_manager.default._process_chunk(FRAME, time.monotonic_ns())
+    changed = scale_client.get("/api/scale/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["packet_count"] == 1
+
+    per_scale = scale_client.get("/api/scale/default/status")
+    assert per_scale.json()["last_reading"]["weight"] == 12.5
+    assert scale_client.get(
+        "/api/scale/default/status", headers={"If-None-Match": per_scale.headers["etag"]}
+    ).status_code == 304
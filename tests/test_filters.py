@@ -0,0 +1,40 @@
+"""
+Test stage filter berat dan pipeline dari string config
+"""
+
+import random
+import statistics
+
+import pytest
+
+from services.filters import FilterPipeline, MedianFilter
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 15])
+def test_median_matches_reference_over_sliding_window(window):
+    rng = random.Random(window)
+    # Repeated values: removal must drop exactly one copy
+    values = [rng.choice((999.5, 1000.0, 1000.5, 1001.0)) + rng.choice((0.0, 0.0, 40.0)) for _ in range(500)]
+    median = MedianFilter(window)
+    for i, value in enumerate(values):
+        expected = statistics.median_low(values[max(0, i - window + 1):i + 1])
+        assert median.process(value) == expected
+
+
+def test_median_drops_single_spike_and_resets():
+    median = MedianFilter(5)
+    outputs = [median.process(v) for v in (100.0, 100.0, 100.0, 900.0, 100.0, 100.0)]
+    assert outputs[3:] == [100.0, 100.0, 100.0]
+    median.reset()
+    assert median.process(50.0) == 50.0
+
+
+def test_pipeline_from_spec():
+    pipeline = FilterPipeline.from_spec("median:3, moving_average:2")
+    assert [type(stage).__name__ for stage in pipeline.stages] == ["MedianFilter", "MovingAverageFilter"]
+    assert [pipeline(v) for v in (10.0, 20.0, 30.0)] == [10.0, 10.0, 15.0]
+    assert not FilterPipeline.from_spec("")
+    with pytest.raises(ValueError):
+        FilterPipeline.from_spec("butterworth:4")
+    with pytest.raises(ValueError):
+        MedianFilter(0)
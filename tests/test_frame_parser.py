@@ -0,0 +1,52 @@
+"""
+Test FrameParser: hasil harus sama dengan parse_scale_line regex lama
+"""
+
+import pytest
+
+from services.frame_parser import FrameParser
+
+
+@pytest.mark.parametrize("frame, expected", [
+    (b"ST,NT,1234.56kg", ("ST", "NT", 1234.56, "kg", True)),
+    (b"  US,GS,-12.50KG\r", ("US", "GS", -12.5, "kg", False)),
+    (b"ST,GS,+7G", ("ST", "GS", 7.0, "g", True)),
+    (b"ST,NT,12.kg", ("ST", "NT", 12.0, "kg", True)),
+    (b"ST,NT,12.5.lb", ("ST", "NT", 12.5, "lb", True)),
+    # No digit before the dot: not strict, so the lenient dialect takes
+    # the first number ("5"), as the regex parser did
+    (b"ST,NT,+.5kg", ("ST", "NT", 5.0, "kg", True)),
+    (b"ST,NT,1kG", ("ST", "NT", 1.0, "kg", True)),
+    (b"\x02US NT +40.5 KG", ("US", "NT", 40.5, "kg", False)),
+])
+def test_parse_matches_regex_parser(frame, expected):
+    parsed = FrameParser(cache_size=0).parse(frame)
+    assert (parsed.stability, parsed.mode, parsed.value, parsed.unit, parsed.stable) == expected
+
+
+@pytest.mark.parametrize("frame", [b"", b"   ", b"ST,NT,kg", b"\x00\xff"])
+def test_parse_rejects_frames_without_value(frame):
+    assert FrameParser().parse(frame) is None
+
+
+def test_unique_values_share_one_shape():
+    parser = FrameParser(cache_size=0)
+    values = [parser.parse(f"ST,GS,{i / 100:.2f}kg".encode()).value for i in range(1000, 2000)]
+    assert values == [i / 100 for i in range(1000, 2000)]
+    assert len(parser.dialects[0]._plans) == 1
+
+
+@pytest.mark.parametrize("frame, reason", [
+    (b"\x00\x13ST,GS,1kg", "garbage"),
+    (b"ERR,OVERLOAD", "no_value"),
+    (b"ST,GS,1.2.3.4", "format"),
+])
+def test_failure_reason(frame, reason):
+    assert FrameParser.failure_reason(frame) == reason
+
+
+def test_dialect_chain_from_spec():
+    parser = FrameParser.from_spec(" sgw3015p , LENIENT ")
+    assert [dialect.name for dialect in parser.dialects] == ["sgw3015p", "lenient"]
+    with pytest.raises(ValueError):
+        FrameParser.from_spec("sgw3015p,unknown")
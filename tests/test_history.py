@@ -0,0 +1,83 @@
+"""
+Test ring buffer ReadingHistory: wraparound, jendela waktu, downsampling
+"""
+
+import pytest
+
+from services.history import ReadingHistory
+
+
+def filled(capacity: int, count: int) -> ReadingHistory:
+    history = ReadingHistory(capacity)
+    for i in range(count):
+        history.append(1000.0 + i, i + 1, float(i), "ST" if i % 2 else "US", "GS")
+    return history
+
+
+def test_wraparound_keeps_newest_samples_in_order():
+    history = filled(4, 10)
+    result = history.query()
+    assert len(history) == 4
+    assert result["samples"] == 4
+    assert result["packet"] == [7, 8, 9, 10]
+    assert result["ts"] == [1006.0, 1007.0, 1008.0, 1009.0]
+    assert result["stability"] == ["US", "ST", "US", "ST"]
+
+
+def test_window_and_last_across_the_wrap_point():
+    history = filled(5, 8)
+    assert history.query(since=1004.0, until=1007.0)["packet"] == [5, 6, 7]
+    assert history.query(since=1004.0, last=2)["packet"] == [7, 8]
+    assert history.query(since=2000.0)["count"] == 0
+
+
+def test_extend_last_counts_repeats_on_the_newest_sample():
+    history = filled(3, 4)
+    history.extend_last(1010.0)
+    history.extend_last(1011.0)
+    result = history.query()
+    assert result["repeat"] == [1, 1, 3]
+    assert result["last_ts"][-1] == 1011.0
+    assert result["ts"][-1] == 1003.0
+
+
+def test_downsampling_weights_by_repeat():
+    history = ReadingHistory(16)
+    history.append(1.0, 1, 10.0, "US", "GS")
+    for ts in (1.5, 2.0, 2.5):
+        history.extend_last(ts)
+    history.append(3.0, 2, 20.0, "ST", "GS")
+    history.append(4.0, 3, 30.0, "ST", "NT")
+    history.append(5.0, 4, 40.0, "ST", "NT")
+
+    result = history.query(max_points=2)
+    assert result["samples"] == 4
+    assert result["count"] == 2
+    # Bucket 1: 10 kg x 4 frames + 20 kg x 1 frame
+    assert result["weight"][0] == pytest.approx(12.0)
+    assert result["weight"][1] == pytest.approx(35.0)
+    assert result["repeat"] == [5, 2]
+    assert result["ts"] == [1.0, 4.0]
+    assert result["last_ts"] == [3.0, 5.0]
+    assert result["packet"] == [2, 4]
+    assert result["mode"] == ["GS", "NT"]
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        ReadingHistory(0)
+
+
+def test_history_route_returns_columns(scale_client, scale_manager):
+    scale = scale_manager.default
+    for i, chunk in enumerate((b"US,GS,10.00kg\r\n", b"ST,GS,12.00kg\r\n", b"ST,GS,14.00kg\r\n")):
+        scale._process_chunk(chunk, (i + 1) * 100_000_000, 1000.0 + i)
+
+    body = scale_client.get("/api/scale/readings/history", params={"last": 2}).json()
+    assert body["scale_id"] == "default"
+    assert body["weight"] == [12.0, 14.0]
+    assert body["stability"] == ["ST", "ST"]
+
+    body = scale_client.get("/api/scale/readings/history", params={"max_points": 1}).json()
+    assert body["samples"] == 3
+    assert body["weight"] == [pytest.approx(12.0)]
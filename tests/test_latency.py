@@ -0,0 +1,38 @@
+"""
+Test histogram latensi dan jarak antar frame
+"""
+
+from services.connect import ScaleConnection
+from services.latency import AcquisitionLatency, LatencyHistogram
+
+MS = 1_000_000
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram((1_000, 10_000))
+    for ms in (0.5, 0.5, 5, 50):
+        histogram.record(int(ms * MS))
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["buckets_ms"] == {"1": 2, "10": 1, "+Inf": 1}
+    assert snapshot["p50_ms"] == 1
+    assert snapshot["max_ms"] == 50
+
+
+def test_frames_in_one_chunk_count_as_one_interval():
+    latency = AcquisitionLatency()
+    for rx_ns in (100 * MS, 100 * MS, 100 * MS, 120 * MS, 120 * MS, 140 * MS):
+        latency.on_frame(rx_ns)
+    assert latency.frame_interval.count == 2
+    assert latency.frame_interval.max_ns == 20 * MS
+    assert latency.jitter_ns == 0
+
+
+def test_process_chunk_batched_frames_do_not_record_zero_intervals():
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    frames = b"ST,GS,10.00kg\r\nST,GS,10.50kg\r\nST,GS,11.00kg\r\n"
+    connection._process_chunk(frames, 1_000 * MS)
+    connection._process_chunk(frames, 1_060 * MS)
+    interval = connection.latency.frame_interval
+    assert interval.count == 1
+    assert interval.sum_ns == 60 * MS
@@ -0,0 +1,48 @@
+"""
+Test long-poll /api/scale/reading?after= dan wait_for_reading
+"""
+
+import asyncio
+import threading
+import time
+
+FRAME = b"ST,GS,12.50kg\r\n"
+
+
+def test_long_poll_times_out_with_204(scale_client):
+    started = time.monotonic()
+    response = scale_client.get("/api/scale/reading", params={"after": 0, "timeout": 50})
+    assert response.status_code == 204
+    assert response.content == b""
+    assert time.monotonic() - started >= 0.05
+
+
+def test_long_poll_returns_existing_newer_reading(scale_client, scale_manager):
+    scale_manager.default._process_chunk(FRAME, time.monotonic_ns())
+    response = scale_client.get("/api/scale/reading", params={"after": 0, "timeout": 5000})
+    assert response.status_code == 200
+    assert response.json()["weight"] == 12.5
+    # The client already has packet 1: nothing newer arrives
+    response = scale_client.get("/api/scale/reading", params={"after": 1, "timeout": 50})
+    assert response.status_code == 204
+
+
+def test_plain_get_without_reading_is_404(scale_client):
+    assert scale_client.get("/api/scale/reading").status_code == 404
+
+
+def test_wait_for_reading_wakes_on_publish_from_reader_thread(scale_manager):
+    scale = scale_manager.default
+
+    async def wait():
+        timer = threading.Timer(0.05, lambda: scale._process_chunk(FRAME, time.monotonic_ns()))
+        timer.start()
+        try:
+            return await scale.wait_for_reading(0, 5.0)
+        finally:
+            timer.join()
+
+    started = time.monotonic()
+    reading = asyncio.run(wait())
+    assert reading is not None and reading.packet == 1
+    assert time.monotonic() - started < 2.0
@@ -0,0 +1,96 @@
+"""
+Test registry metrics, middleware HTTP dan route /metrics
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.metrics import CONTENT_TYPE, MetricFamily, MetricsMiddleware, MetricsRegistry
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Jumlah request", ["route"])
+    requests.labels("/a").inc()
+    requests.labels("/a").inc(2)
+    requests.labels('say "hi"').inc()
+    latency = registry.histogram("app_latency_seconds", "Latensi", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    lines = registry.render().decode("utf-8").splitlines()
+    assert "# TYPE app_requests_total counter" in lines
+    assert 'app_requests_total{route="/a"} 3' in lines
+    assert 'app_requests_total{route="say \\"hi\\""} 1' in lines
+    assert "# TYPE app_latency_seconds histogram" in lines
+    # Buckets are cumulative, le is inclusive
+    assert 'app_latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'app_latency_seconds_bucket{le="1"} 3' in lines
+    assert 'app_latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "app_latency_seconds_count 4" in lines
+    assert "app_latency_seconds_sum 3.65" in lines
+
+
+def test_registry_returns_existing_metric_and_rejects_type_conflict():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ["kind"])
+    assert registry.counter("jobs_total", "Jobs", ["kind"]) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("jobs_total", "Jobs")
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_collectors_are_called_on_every_scrape():
+    registry = MetricsRegistry()
+    calls = []
+
+    def collector():
+        calls.append(1)
+        return [MetricFamily("queue_depth", "gauge", "Isi antrian", [("", {}, len(calls))])]
+
+    registry.register_collector(collector)
+    registry.register_collector(collector)
+    assert b"queue_depth 1\n" in registry.render()
+    assert b"queue_depth 2\n" in registry.render()
+
+
+def test_middleware_labels_requests_by_route_template():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("http_request_duration_seconds", "Latensi", ["method", "route", "status"])
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, histogram=histogram)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+    body = registry.render().decode("utf-8")
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="<unmatched>",status="404"} 1' in body
+
+
+def test_metrics_route_reports_scale_counters(scale_manager):
+    from routes import metrics
+
+    scale = scale_manager.default
+    scale._process_chunk(b"ST,GS,10.00kg\r\nST,GS,10.00kg\r\nXX\r\n", time.monotonic_ns())
+    app = FastAPI()
+    app.include_router(metrics.router)
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"] == CONTENT_TYPE
+    lines = response.text.splitlines()
+    assert 'scale_frames_total{scale_id="default"} 3' in lines
+    assert 'scale_readings_total{scale_id="default"} 1' in lines
+    assert 'scale_connected{scale_id="default"} 0' in lines
+    assert any(line.startswith('scale_parse_failures_total{scale_id="default",reason=') for line in lines)
@@ -0,0 +1,74 @@
+"""
+Test alokasi no_urut: create bersamaan dan resync setelah insert manual
+"""
+
+import asyncio
+import uuid as uuid_lib
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+
+CLIENTS = 16
+TICKETS_PER_CLIENT = 10
+
+
+def test_concurrent_creates_get_unique_no_urut(client, ticket):
+    from database import AsyncSessionLocal
+    from models import Timbangan
+    from schemas import TimbanganCreate
+    from services.timbangan import create_timbangan
+
+    data = TimbanganCreate(**{**ticket, "nopol": "B 24 CON"})
+
+    async def gate():
+        numbers = []
+        for _ in range(TICKETS_PER_CLIENT):
+            async with AsyncSessionLocal() as db:
+                numbers.append((await create_timbangan(db, data)).no_urut)
+        return numbers
+
+    async def run():
+        results = await asyncio.gather(*(gate() for _ in range(CLIENTS)))
+        async with AsyncSessionLocal() as db:
+            stored = list(await db.scalars(select(Timbangan.no_urut).where(Timbangan.nopol == "B 24 CON")))
+        return [number for numbers in results for number in numbers], stored
+
+    returned, stored = client.portal.call(run)
+    assert len(returned) == len(set(returned)) == CLIENTS * TICKETS_PER_CLIENT
+    assert sorted(stored) == sorted(returned)
+
+
+def test_create_resyncs_after_manual_insert(client, ticket):
+    from database import AsyncSessionLocal
+    from models import Timbangan
+    from schemas import TimbanganCreate
+    from services.timbangan import allocate_no_urut, create_timbangan, resync_no_urut
+
+    def manual_row(no_urut):
+        now = datetime.utcnow()
+        return {
+            **ticket, "nopol": "B 24 MAN", "uuid": uuid_lib.uuid4(), "no_urut": no_urut,
+            "tanggalwaktu": now, "created_at": now, "updated_at": now,
+        }
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            top = await db.scalar(select(func.coalesce(func.max(Timbangan.no_urut), 0)))
+            # Import with explicit numbers, bypassing the counter
+            await db.execute(insert(Timbangan), [manual_row(top + 1), manual_row(top + 2)])
+            await db.commit()
+
+            # The counter still points below the imported rows: the insert
+            # collides, resyncs and retries
+            created = (await create_timbangan(db, TimbanganCreate(**ticket))).no_urut
+
+            await db.execute(insert(Timbangan), [manual_row(created + 5)])
+            await db.commit()
+            await resync_no_urut(db)
+            [after_resync] = await allocate_no_urut(db)
+            await db.rollback()
+            return top, created, after_resync
+
+    top, created, after_resync = client.portal.call(run)
+    assert created == top + 3
+    assert after_resync == created + 6
@@ -0,0 +1,73 @@
+"""
+Test perpindahan mode PollScheduler
+"""
+
+import pytest
+
+from services.poll_scheduler import MODE_CONTINUOUS, MODE_REQUEST, MODE_UNKNOWN, PollScheduler
+
+COMMANDS = [b"R\r\n", b"P\r\n"]
+
+
+def learn_request_mode(scheduler: PollScheduler) -> float:
+    """Perintah pertama tidak dijawab, perintah kedua dijawab setelah 50 ms"""
+    scheduler.reset(0.0)
+    assert scheduler.next_poll(0.5) == (None, 0.5)
+    assert scheduler.next_poll(1.0) == (COMMANDS[0], 1.0)
+    assert scheduler.next_poll(2.0) == (COMMANDS[1], 1.0)
+    scheduler.on_frame(2.05)
+    return 2.05
+
+
+def test_streaming_indicator_switches_to_continuous_without_polling():
+    scheduler = PollScheduler(COMMANDS, poll_ms=1000)
+    scheduler.reset(0.0)
+    for now in (0.1, 0.2, 0.3):
+        scheduler.on_frame(now)
+    assert scheduler.mode == MODE_CONTINUOUS
+    assert scheduler.next_poll(1.5) == (None, 1.0)
+    assert scheduler.polls_sent == 0
+
+
+def test_continuous_returns_to_discovery_when_stream_stops():
+    scheduler = PollScheduler(COMMANDS, poll_ms=1000)
+    scheduler.reset(0.0)
+    for now in (0.1, 0.2, 0.3):
+        scheduler.on_frame(now)
+    cmd, _ = scheduler.next_poll(5.0)
+    assert scheduler.mode == MODE_UNKNOWN
+    assert cmd == COMMANDS[0]
+
+
+def test_answered_probe_learns_request_mode_and_interval():
+    scheduler = PollScheduler(COMMANDS, poll_ms=1000, min_poll_ms=100)
+    now = learn_request_mode(scheduler)
+    assert scheduler.mode == MODE_REQUEST
+    assert scheduler.command == COMMANDS[1]
+    assert abs(scheduler.latency - 0.05) < 1e-9
+    # 2 x latency, bounded below by min_poll_ms
+    assert scheduler.interval == pytest.approx(0.1)
+    cmd, wait = scheduler.next_poll(now)
+    assert cmd is None
+    assert wait == pytest.approx(0.05)
+    cmd, wait = scheduler.next_poll(2.1)
+    assert cmd == COMMANDS[1]
+    assert wait == pytest.approx(0.1)
+    status = scheduler.get_status()
+    assert status["mode"] == MODE_REQUEST
+    assert status["command"] == "P\\r\\n"
+    assert status["interval_ms"] == 100
+    assert status["polls_sent"] == 3
+
+
+def test_request_mode_forgets_command_after_max_misses():
+    scheduler = PollScheduler(COMMANDS, poll_ms=1000, min_poll_ms=100, max_misses=2)
+    learn_request_mode(scheduler)
+    assert scheduler.next_poll(2.1)[0] == COMMANDS[1]
+    # First miss: still in request mode, the learned command is polled again
+    assert scheduler.next_poll(3.2)[0] == COMMANDS[1]
+    assert scheduler.mode == MODE_REQUEST
+    # Second miss: back to probing every command
+    assert scheduler.next_poll(4.3)[0] == COMMANDS[0]
+    assert scheduler.mode == MODE_UNKNOWN
+    assert scheduler.command is None
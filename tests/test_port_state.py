@@ -0,0 +1,78 @@
+"""
+Test penyimpanan konfigurasi port terverifikasi dan backoff reconnect
+"""
+
+import json
+import time
+
+from services.connect import ScaleConnection
+from services.port_state import SERIAL_FIELDS, load_port_config, save_port_config
+
+CFG = {"port": "/dev/ttyUSB0", "baudrate": 9600, "bytesize": 7, "parity": "E", "stopbits": 1}
+
+
+def key(cfg):
+    return tuple(cfg[field] for field in SERIAL_FIELDS)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "scale_state.json")
+    assert load_port_config(path, CFG["port"]) is None
+    save_port_config(path, {**CFG, "timeout": 1})
+    save_port_config(path, {**CFG, "port": "/dev/ttyUSB1", "baudrate": 2400})
+
+    assert load_port_config(path, CFG["port"]) == CFG
+    assert load_port_config(path, "/dev/ttyUSB1")["baudrate"] == 2400
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["scale_state.json"]
+
+
+def test_disabled_corrupt_or_incomplete_state_is_ignored(tmp_path):
+    assert load_port_config("", CFG["port"]) is None
+    save_port_config("", CFG)
+
+    path = tmp_path / "scale_state.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert load_port_config(str(path), CFG["port"]) is None
+    path.write_text(json.dumps({CFG["port"]: {"baudrate": 9600}}), encoding="utf-8")
+    assert load_port_config(str(path), CFG["port"]) is None
+    # A corrupt file is replaced on the next save
+    save_port_config(str(path), CFG)
+    assert load_port_config(str(path), CFG["port"]) == CFG
+
+
+def test_saved_config_is_tried_first_without_duplicate(tmp_path):
+    path = str(tmp_path / "scale_state.json")
+    connection = ScaleConnection(port=CFG["port"], handle_signals=False, state_file=path, history_size=16)
+    default = connection._ordered_candidates()
+    save_port_config(path, default[-1])
+
+    ordered = connection._ordered_candidates()
+    assert key(ordered[0]) == key(default[-1])
+    assert len(ordered) == len(default)
+    assert [key(c) for c in ordered].count(key(default[-1])) == 1
+
+    # A config outside the built-in candidates is still tried first
+    save_port_config(path, CFG)
+    assert connection._ordered_candidates()[0] == CFG
+
+
+def test_probe_winner_is_persisted(tmp_path):
+    path = str(tmp_path / "scale_state.json")
+    connection = ScaleConnection(port=CFG["port"], handle_signals=False, state_file=path, history_size=16)
+    candidates = connection._ordered_candidates()
+    winner = candidates[2]
+    connection._probe = lambda cfg: 1.0 if cfg is winner else 0.0
+
+    assert connection._select_config(candidates) is winner
+    assert connection.config_verified
+    assert load_port_config(path, CFG["port"]) == {field: winner[field] for field in ("port", *SERIAL_FIELDS)}
+
+
+def test_reconnect_delay_backs_off_and_resets_after_frames():
+    connection = ScaleConnection(handle_signals=False, reconnect_ms=100, reconnect_max_ms=500, history_size=16)
+    assert [connection._reconnect_delay() for _ in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+    assert connection.reconnect_count == 5
+
+    connection._process_chunk(b"ST,GS,10.00kg\r\n", time.monotonic_ns())
+    assert connection._reconnect_delay() == 0.1
+    assert connection._reconnect_delay() == 0.2
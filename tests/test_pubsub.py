@@ -0,0 +1,118 @@
+"""
+Test ReadingHub: policy antrian drop_oldest/latest dan filter subscription
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from services.pubsub import POLICY_DROP_OLDEST, POLICY_LATEST, ReadingHub
+from services.reading import Reading
+
+
+def reading(packet: int, weight: float = 10.0, stable: bool = True) -> Reading:
+    return Reading(
+        ts=1000.0 + packet, packet=packet, stability="ST" if stable else "US", mode="GS",
+        stable=stable, settled=False, weight=weight, unit="kg", raw="",
+    )
+
+
+async def drain(subscription) -> list:
+    packets = []
+    while subscription._queue:
+        packets.append((await subscription.get()).packet)
+    return packets
+
+
+def test_drop_oldest_keeps_newest_items_and_counts_drops():
+    async def run():
+        hub = ReadingHub()
+        with hub.subscribe(maxsize=3, policy=POLICY_DROP_OLDEST) as subscription:
+            for packet in range(1, 6):
+                hub.publish(reading(packet, weight=packet))
+            return await drain(subscription), subscription.dropped
+
+    assert asyncio.run(run()) == ([3, 4, 5], 2)
+
+
+def test_latest_keeps_only_the_newest_reading():
+    async def run():
+        hub = ReadingHub()
+        with hub.subscribe(maxsize=32, policy=POLICY_LATEST) as subscription:
+            for packet in range(1, 6):
+                hub.publish(reading(packet, weight=packet))
+            return await drain(subscription), subscription.dropped
+
+    assert asyncio.run(run()) == ([5], 4)
+
+
+def test_stable_only_and_on_change_filters():
+    async def run():
+        hub = ReadingHub()
+        with hub.subscribe(stable_only=True, on_change=True) as subscription:
+            hub.publish(reading(1, 10.0, stable=False))
+            hub.publish(reading(2, 10.0))
+            hub.publish(reading(3, 10.0))
+            hub.publish(reading(4, 11.0))
+            return await drain(subscription)
+
+    assert asyncio.run(run()) == [2, 4]
+
+
+def test_publish_from_another_thread_wakes_subscriber():
+    async def run():
+        hub = ReadingHub()
+        with hub.subscribe() as subscription:
+            thread = threading.Thread(target=hub.publish, args=(reading(7),))
+            thread.start()
+            result = await asyncio.wait_for(subscription.get(), 2.0)
+            thread.join()
+        return result.packet, hub.subscriber_count
+
+    assert asyncio.run(run()) == (7, 0)
+
+
+def test_unknown_policy_is_rejected():
+    async def run():
+        ReadingHub().subscribe(policy="newest")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def wait_until(condition, timeout=2.0) -> bool:
+    """WebSocket handler berjalan di thread portal TestClient"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_websocket_streams_readings_and_unsubscribes(scale_client, scale_manager):
+    scale = scale_manager.default
+    with scale_client.websocket_connect("/api/scale/readings/ws") as websocket:
+        assert wait_until(lambda: scale.hub.subscriber_count == 1)
+        scale._process_chunk(b"ST,GS,12.50kg\r\n", time.monotonic_ns())
+        assert json.loads(websocket.receive_text())["weight"] == 12.5
+    assert wait_until(lambda: scale.hub.subscriber_count == 0)
+
+
+def test_websocket_send_error_is_logged_on_disconnect(scale_client, scale_manager, caplog):
+    scale = scale_manager.default
+
+    def broken_encode(reading):
+        raise RuntimeError("encoder broke")
+
+    scale.hub.encode = broken_encode
+    with scale_client.websocket_connect("/api/scale/readings/ws"):
+        assert wait_until(lambda: scale.hub.subscriber_count == 1)
+        scale._process_chunk(b"ST,GS,12.50kg\r\n", time.monotonic_ns())
+        # Let the sender task fail before the client disconnects
+        time.sleep(0.2)
+    assert wait_until(lambda: scale.hub.subscriber_count == 0)
+    assert "WebSocket send error: encoder broke" in caplog.text
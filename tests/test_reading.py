@@ -0,0 +1,52 @@
+"""
+Test serialisasi Reading, cache JSON hub dan penggabungan frame identik
+"""
+
+import json
+import time
+
+from routes.scale import ScaleReadingResponse
+from services.connect import ScaleConnection
+from services.pubsub import ReadingHub
+from services.reading import Reading
+
+
+def test_to_dict_matches_response_model():
+    reading = Reading(
+        ts=1700000000.25, packet=3, stability="ST", mode="GS", stable=True,
+        settled=True, weight=12.5, unit="kg", raw="ST,GS,12.50kg", repeat=2, last_ts=1700000001.5,
+    )
+    data = json.loads(reading.to_json())
+    assert data == reading.to_dict()
+    assert data["ts"] == "2023-11-14T22:13:20.250000"
+    assert data["last_ts"] == "2023-11-14T22:13:21.500000"
+    assert ScaleReadingResponse(**data).model_dump() == data
+
+
+def test_last_ts_defaults_to_ts():
+    reading = Reading(1700000000.0, 1, None, None, False, False, 0.0, "kg", "")
+    assert reading.to_dict()["last_ts"] == reading.to_dict()["ts"]
+
+
+def test_hub_encodes_each_reading_once():
+    hub = ReadingHub()
+    first = Reading(1.0, 1, "ST", "GS", True, False, 1.0, "kg", "")
+    encoded = hub.encode_bytes(first)
+    assert hub.encode_bytes(first) is encoded
+    assert hub.encode(first) == encoded.decode("utf-8")
+    assert hub.encode_bytes(first._replace(packet=2)) is not encoded
+
+
+def test_identical_frames_coalesce_into_one_reading():
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    connection._process_chunk(b"ST,GS,10.00kg\r\nST,GS,10.00kg\r\n", time.monotonic_ns())
+    connection._process_chunk(b"ST,GS,10.00kg\r\n", time.monotonic_ns())
+    reading = connection.get_last_reading()
+    assert (reading.packet, reading.repeat) == (1, 3)
+    assert connection.packet_count == 3
+    assert connection.run_count == 1
+
+    connection._process_chunk(b"ST,GS,10.50kg\r\n", time.monotonic_ns())
+    reading = connection.get_last_reading()
+    assert (reading.packet, reading.repeat, reading.weight) == (4, 1, 10.5)
+    assert connection.run_count == 2
@@ -0,0 +1,66 @@
+"""
+Test RxBuffer: frame terpotong, noise, translasi 7-bit dan overflow
+"""
+
+from services.frame_parser import FrameParser
+from services.rx_buffer import RxBuffer
+
+
+def test_frame_split_across_chunks():
+    rx = RxBuffer()
+    assert rx.feed(b"ST,GS,12") == []
+    assert rx.feed(b"34.50") == []
+    assert rx.feed(b"kg\r\nST,GS,1") == [b"ST,GS,1234.50kg"]
+    assert len(rx) == len(b"ST,GS,1")
+    assert rx.feed(b".00kg\r\n") == [b"ST,GS,1.00kg"]
+    assert len(rx) == 0
+
+
+def test_one_byte_chunks():
+    rx = RxBuffer()
+    frames = []
+    for byte in b"ST,NT,5.00kg\r\nUS,NT,6.00kg\n":
+        frames += rx.feed(bytes([byte]))
+    assert frames == [b"ST,NT,5.00kg", b"US,NT,6.00kg"]
+
+
+def test_blank_lines_and_all_line_breaks_split_frames():
+    rx = RxBuffer()
+    chunk = b"\r\n\r\nA\rB\x0bC\x0cD\x1cE\x1dF\x1eG\n  \t \n"
+    assert rx.feed(chunk) == [b"A", b"B", b"C", b"D", b"E", b"F", b"G"]
+
+
+def test_garbage_between_frames_does_not_corrupt_neighbours():
+    rx = RxBuffer()
+    parser = FrameParser(["sgw3015p"])
+    chunk = b"ST,GS,10.00kg\r\n\x00\x13\x7f\x02junk\r\nST,GS,11.00kg\r\n"
+    frames = rx.feed(chunk)
+    assert frames[0] == b"ST,GS,10.00kg"
+    assert frames[-1] == b"ST,GS,11.00kg"
+    assert [parser.parse(frame) is not None for frame in frames] == [True, False, True]
+
+
+def test_seven_bit_translation_clears_parity_bit():
+    rx = RxBuffer()
+    # Mark/space parity read as 8N1 sets bit 7 on every byte
+    chunk = bytes(b | 0x80 for b in b"ST,GS,12.50kg\r\n")
+    assert rx.feed(chunk) == [b"ST,GS,12.50kg"]
+    # 0x8D is a carriage return with the parity bit set
+    assert rx.feed(b"US,GS,1.00kg\x8d") == [b"US,GS,1.00kg"]
+
+
+def test_overflow_discards_noise_without_delimiter():
+    rx = RxBuffer(max_frame=16)
+    assert rx.feed(b"x" * 10) == []
+    assert rx.feed(b"x" * 10) == []
+    assert rx.overflow_count == 1
+    assert len(rx) == 0
+    # The next complete frame is unaffected
+    assert rx.feed(b"ST,GS,1.00kg\r\n") == [b"ST,GS,1.00kg"]
+
+
+def test_clear_drops_partial_frame():
+    rx = RxBuffer()
+    rx.feed(b"ST,GS,99")
+    rx.clear()
+    assert rx.feed(b".00kg\r\nST,GS,1.00kg\r\n") == [b".00kg", b"ST,GS,1.00kg"]
@@ -0,0 +1,66 @@
+"""
+Test registrasi ScaleManager dan route per scale_id
+"""
+
+import time
+
+import pytest
+
+from config import ScalePortConfig, settings
+from services.connect import ScaleConnection
+from services.scale_manager import ScaleManager, build_scale_manager
+
+
+def configured(**update):
+    return settings.model_copy(update={"scale_state_file": "", "scale_capture_dir": "", **update})
+
+
+def test_first_scale_is_default_and_duplicates_are_rejected():
+    manager = ScaleManager()
+    first = manager.add(ScaleConnection(scale_id="a", handle_signals=False, history_size=16))
+    manager.add(ScaleConnection(scale_id="b", handle_signals=False, history_size=16))
+    assert manager.default is first
+    assert manager.ids() == ["a", "b"]
+    assert manager.get("c") is None
+    with pytest.raises(ValueError):
+        manager.add(ScaleConnection(scale_id="a", handle_signals=False, history_size=16))
+    assert set(manager.get_status()) == {"a", "b"}
+
+
+def test_build_from_scales_uses_global_values_for_missing_fields():
+    manager = build_scale_manager(configured(
+        scale_baudrate=9600,
+        scale_transport="thread",
+        scales=[
+            ScalePortConfig(id="in", port="/dev/ttyUSB0"),
+            ScalePortConfig(id="out", port="/dev/ttyUSB1", baudrate=2400, enable_poll=False),
+        ],
+    ), acquisition="inprocess")
+
+    assert manager.ids() == ["in", "out"]
+    assert manager.default_id == "in"
+    inbound, outbound = manager.get("in"), manager.get("out")
+    assert (inbound.base_config["port"], inbound.base_config["baudrate"]) == ("/dev/ttyUSB0", 9600)
+    assert (outbound.base_config["port"], outbound.base_config["baudrate"]) == ("/dev/ttyUSB1", 2400)
+    assert not outbound.enable_poll
+
+
+def test_build_without_scales_registers_single_default():
+    manager = build_scale_manager(configured(scales=[], scale_port="/dev/ttyS9"), acquisition="inprocess")
+    assert manager.ids() == ["default"]
+    assert manager.default.base_config["port"] == "/dev/ttyS9"
+    with pytest.raises(ValueError):
+        build_scale_manager(configured(), acquisition="remote")
+
+
+def test_per_scale_routes(scale_client, scale_manager):
+    second = scale_manager.add(ScaleConnection(scale_id="b", handle_signals=False, history_size=16))
+    second._process_chunk(b"ST,GS,7.00kg\r\n", time.monotonic_ns())
+
+    assert scale_client.get("/api/scale/b/reading").json()["weight"] == 7.0
+    assert scale_client.get("/api/scale/default/reading").status_code == 404
+    assert scale_client.get("/api/scale/c/reading").status_code == 404
+    status = scale_client.get("/api/scale/status").json()
+    assert status["scale_id"] == "default"
+    assert set(status["scales"]) == {"default", "b"}
+    assert status["scales"]["b"]["packet_count"] == 1
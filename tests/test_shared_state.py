@@ -0,0 +1,99 @@
+"""
+Test segmen shared memory (seqlock dan pembuatan segmen)
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from services import shared_state
+from services.shared_state import META, SEQ, ScaleSegment, SharedScaleConnection
+
+
+@pytest.fixture
+def name():
+    return f"test-scale-{os.getpid()}"
+
+
+def _set_writer_pid(segment, pid):
+    META.pack_into(segment.buf, segment.meta_offset, pid, b"tag")
+
+
+def test_read_retries_when_fn_fails_on_torn_copy(name):
+    segment = ScaleSegment.create(name, 8, "tag")
+    try:
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                # Writer finished a write while we were copying
+                SEQ.pack_into(segment.buf, segment.seq_offset, segment.seq + 2)
+                raise UnicodeDecodeError("ascii", b"\xff", 0, 1, "torn")
+            return "ok"
+
+        assert segment.read(fn) == "ok"
+        assert len(calls) == 2
+    finally:
+        segment.close()
+
+
+def test_read_raises_when_fn_fails_on_stable_copy(name):
+    segment = ScaleSegment.create(name, 8, "tag")
+    try:
+        with pytest.raises(KeyError):
+            segment.read(lambda: {}["missing"])
+    finally:
+        segment.close()
+
+
+def test_create_replaces_segment_of_dead_writer(name):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    crashed = ScaleSegment.create(name, 8, "old")
+    _set_writer_pid(crashed, dead.pid)
+    # Crash: the segment is left behind without unlink
+    crashed.buf = None
+    crashed.shm.close()
+
+    segment = ScaleSegment.create(name, 8, "new")
+    try:
+        assert segment.writer_pid == os.getpid()
+        assert segment.instance_tag == "new"
+    finally:
+        segment.close()
+
+
+def test_create_refuses_segment_of_live_writer(name):
+    live = ScaleSegment.create(name, 8, "live")
+    try:
+        _set_writer_pid(live, os.getppid())
+        with pytest.raises(FileExistsError, match=str(os.getppid())):
+            ScaleSegment.create(name, 8, "second")
+        assert live.instance_tag == "tag"
+    finally:
+        live.close()
+
+
+def test_watcher_backs_off_while_seq_is_unchanged(name, monkeypatch):
+    segment = ScaleSegment.create(name, 8, "tag")
+    connection = SharedScaleConnection(segment_name=name, watch_ms=1, watch_max_ms=8)
+    delays = []
+
+    def sleep(seconds):
+        delays.append(seconds)
+        if len(delays) == 5:
+            # Writer publishes while the watcher is backed off
+            with segment.write():
+                pass
+        if len(delays) == 8:
+            connection.is_shutting_down = True
+
+    monkeypatch.setattr(shared_state.time, "sleep", sleep)
+    try:
+        connection._watch_loop()
+    finally:
+        segment.close()
+    assert delays == [0.001, 0.002, 0.004, 0.008, 0.008, 0.001, 0.002, 0.004]
@@ -0,0 +1,77 @@
+"""
+Test StatusSnapshot: cache body/ETag, bentuk response dan /health
+"""
+
+import json
+import signal
+import threading
+import time
+
+from routes.scale import ConnectionStatusResponse
+from services.connect import ScaleConnection
+from services.status import same_snapshots
+
+
+def test_snapshot_is_built_once_and_replaced_on_change():
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    before = connection.status_snapshot
+    body = before.body
+    assert before.body is body
+    assert before.etag == before.etag
+    assert before.status is before.status
+
+    connection._process_chunk(b"ST,GS,10.00kg\r\n", time.monotonic_ns())
+    after = connection.status_snapshot
+    assert after is not before
+    assert after.version > before.version
+    # The old snapshot still describes the old moment
+    assert before.body is body
+    assert json.loads(before.body)["packet_count"] == 0
+    assert json.loads(after.body)["packet_count"] == 1
+    assert after.etag != before.etag
+    assert same_snapshots((before,), (before,))
+    assert not same_snapshots((before,), (after,))
+
+
+def test_body_matches_response_model():
+    connection = ScaleConnection(handle_signals=False, enable_poll=True, history_size=16)
+    connection._process_chunk(b"US,GS,10.00kg\r\n", time.monotonic_ns())
+    data = json.loads(connection.status_snapshot.body)
+    assert ConnectionStatusResponse(**data).model_dump() == data
+    assert data["last_reading"]["weight"] == 10.0
+    assert data["poll"]["mode"] == "unknown"
+
+
+def test_health_route_serves_snapshot(scale_client, scale_manager):
+    scale_manager.default._process_chunk(b"ST,GS,10.00kg\r\n", time.monotonic_ns())
+    health = scale_client.get("/api/scale/health").json()
+    assert health == {
+        "healthy": False,
+        "connected": False,
+        "port": scale_manager.default.base_config["port"],
+        "packet_count": 1,
+        "last_reading_available": True,
+    }
+
+
+def test_signal_during_publish_does_not_deadlock_or_lose_shutdown():
+    connection = ScaleConnection(handle_signals=False, enable_poll=False, history_size=16)
+    connection.is_connected = True
+    build_status = connection._build_status
+    interrupted = []
+
+    def build_interrupted_by_signal():
+        values = build_status()
+        if not interrupted:
+            # SIGTERM arrives on this thread while the lock is held
+            interrupted.append(True)
+            connection._shutdown(signal.SIGTERM, None)
+        return values
+
+    connection._build_status = build_interrupted_by_signal
+    worker = threading.Thread(target=connection._publish_status, daemon=True)
+    worker.start()
+    worker.join(timeout=2)
+    assert not worker.is_alive()
+    assert connection.status_snapshot.values.connected is False
+    assert json.loads(connection.status_snapshot.body)["connected"] is False
@@ -0,0 +1,99 @@
+"""
+Test route /api/timbangan
+"""
+
+import pytest
+
+
+def test_create_stores_aware_tanggalwaktu_as_naive_utc(client, ticket):
+    response = client.post("/api/timbangan", json={**ticket, "tanggalwaktu": "2026-01-01T07:30:00+07:00"})
+    assert response.status_code == 201
+    assert response.json()["tanggalwaktu"] == "2026-01-01T00:30:00"
+
+    stored = client.get(f"/api/timbangan/{response.json()['uuid']}").json()
+    assert stored["tanggalwaktu"] == "2026-01-01T00:30:00"
+
+
+@pytest.mark.parametrize("field", ["nopol", "sopir", "gross", "nett", "petugas"])
+def test_update_rejects_null_on_required_field(client, ticket, field):
+    uuid = client.post("/api/timbangan", json=ticket).json()["uuid"]
+
+    response = client.put(f"/api/timbangan/{uuid}", json={field: None})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", field]
+    assert client.get(f"/api/timbangan/{uuid}").json()[field] == ticket[field]
+
+
+def test_update_allows_null_on_nullable_field(client, ticket):
+    uuid = client.post("/api/timbangan", json={**ticket, "rate": 150.0, "catatan": "x"}).json()["uuid"]
+
+    response = client.put(f"/api/timbangan/{uuid}", json={"rate": None, "catatan": None})
+    assert response.status_code == 200
+    assert response.json()["rate"] is None
+    assert response.json()["catatan"] is None
+
+
+def test_summary_accepts_aware_bounds(client, ticket):
+    # 2026-03-01 23:30 UTC: the rollup day is the UTC date, not the +07:00 one
+    client.post("/api/timbangan", json={**ticket, "nopol": "B 25 SUM", "tanggalwaktu": "2026-03-02T06:30:00+07:00"})
+
+    response = client.get("/api/timbangan/summary", params={"date_from": "2026-03-01T00:00:00Z", "nopol": "B 25 SUM"})
+    assert response.status_code == 200
+    assert response.json()["total_records"] == 1
+    assert response.json()["date_from"] == "2026-03-01T00:00:00"
+
+    response = client.get("/api/timbangan/summary", params={
+        "date_from": "2026-03-02T00:00:00+07:00",
+        "date_to": "2026-03-02T07:00:00+07:00",
+        "nopol": "B 25 SUM",
+    })
+    assert response.status_code == 200
+    assert response.json()["total_records"] == 1
+    assert response.json()["total_gross"] == ticket["gross"]
+
+
+def test_bulk_normalises_tanggalwaktu_per_row(client, ticket):
+    rows = [
+        {**ticket, "tanggalwaktu": "2026-01-01T07:30:00+07:00"},
+        # Valid ISO datetime that overflows once shifted to UTC
+        {**ticket, "tanggalwaktu": "9999-12-31T23:59:59-01:00"},
+    ]
+    response = client.post("/api/timbangan/bulk", json=rows)
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["inserted"], body["failed"]) == (1, 1)
+    assert body["errors"][0]["index"] == 1
+    assert body["errors"][0]["errors"][0]["loc"] == ["tanggalwaktu"]
+
+    stored = client.get(f"/api/timbangan/{body['data'][0]['uuid']}").json()
+    assert stored["tanggalwaktu"] == "2026-01-01T00:30:00"
+
+
+def test_list_filters_by_aware_bounds(client, ticket):
+    # Stored as 2024-01-01 03:00 naive UTC
+    client.post("/api/timbangan", json={**ticket, "nopol": "B 21 LST", "tanggalwaktu": "2024-01-01T10:00:00+07:00"})
+
+    response = client.get("/api/timbangan", params={
+        "nopol": "B 21 LST",
+        "date_from": "2024-01-01T09:30:00+07:00",
+        "date_to": "2024-01-01T10:30:00+07:00",
+    })
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+def test_cursor_filters_by_aware_bounds(client, ticket):
+    client.post("/api/timbangan", json={**ticket, "nopol": "B 23 CUR", "tanggalwaktu": "2024-01-01T10:00:00+07:00"})
+    params = {"nopol": "B 23 CUR", "date_from": "2024-01-01T09:30:00+07:00", "date_to": "2024-01-01T10:30:00+07:00"}
+
+    response = client.get("/api/timbangan/cursor", params={**params, "estimate": "true"})
+    assert response.status_code == 200
+    assert [row["tanggalwaktu"] for row in response.json()["data"]] == ["2024-01-01T03:00:00"]
+
+    summary = client.get("/api/timbangan/summary", params=params).json()
+    assert summary["total_records"] == 1
+
+
+def test_cursor_rejects_bound_out_of_range(client):
+    response = client.get("/api/timbangan/cursor", params={"date_from": "9999-12-31T23:59:59-01:00"})
+    assert response.status_code == 400